@@ -0,0 +1,58 @@
+import os
+
+import yamio
+
+from .common import (
+    SIZES,
+    ELEM_TYPES,
+    get_mesh,
+    TmpDirBenchmark,
+)
+
+
+try:
+    from yamio.dolfin import write as write_dolfin
+    has_h5py = True
+except ImportError:
+    has_h5py = False
+
+
+class DolfinWrite(TmpDirBenchmark):
+    params = (SIZES, ELEM_TYPES)
+    param_names = ['n_cells', 'elem_type']
+
+    def setup(self, n_cells, elem_type):
+        if not has_h5py:
+            raise NotImplementedError('h5py is required')
+
+        super().setup()
+        self.mesh = get_mesh(n_cells, elem_type)
+        self.filename = os.path.join(self.tmp_dir, 'mesh.xdmf')
+
+    def time_write(self, n_cells, elem_type):
+        write_dolfin(self.filename, self.mesh)
+
+    def peakmem_write(self, n_cells, elem_type):
+        write_dolfin(self.filename, self.mesh)
+
+
+class DolfinRead(TmpDirBenchmark):
+    params = (SIZES, ELEM_TYPES)
+    param_names = ['n_cells', 'elem_type']
+
+    def setup(self, n_cells, elem_type):
+        if not has_h5py:
+            raise NotImplementedError('h5py is required')
+
+        super().setup()
+        self.filename = os.path.join(self.tmp_dir, 'mesh.xdmf')
+        write_dolfin(self.filename, get_mesh(n_cells, elem_type))
+
+    def time_read(self, n_cells, elem_type):
+        yamio.read(self.filename)
+
+    def peakmem_read(self, n_cells, elem_type):
+        yamio.read(self.filename)
+
+    def time_read_info(self, n_cells, elem_type):
+        yamio.info(self.filename)
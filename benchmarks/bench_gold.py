@@ -0,0 +1,49 @@
+import os
+
+from yamio.ensight.gold import (
+    GeoReader,
+    GeoWriter,
+)
+
+from .common import (
+    SIZES,
+    ELEM_TYPES,
+    get_mesh,
+    TmpDirBenchmark,
+)
+
+
+class GeoWrite(TmpDirBenchmark):
+    params = (SIZES, ELEM_TYPES)
+    param_names = ['n_cells', 'elem_type']
+
+    def setup(self, n_cells, elem_type):
+        super().setup()
+        self.mesh = get_mesh(n_cells, elem_type)
+        self.filename = os.path.join(self.tmp_dir, 'mesh.geo')
+
+    def time_write(self, n_cells, elem_type):
+        GeoWriter().write(self.filename, self.mesh, part_description='box')
+
+    def peakmem_write(self, n_cells, elem_type):
+        GeoWriter().write(self.filename, self.mesh, part_description='box')
+
+
+class GeoRead(TmpDirBenchmark):
+    params = (SIZES, ELEM_TYPES)
+    param_names = ['n_cells', 'elem_type']
+
+    def setup(self, n_cells, elem_type):
+        super().setup()
+        self.filename = os.path.join(self.tmp_dir, 'mesh.geo')
+        GeoWriter().write(self.filename, get_mesh(n_cells, elem_type),
+                          part_description='box')
+
+    def time_read(self, n_cells, elem_type):
+        GeoReader().read(self.filename)
+
+    def peakmem_read(self, n_cells, elem_type):
+        GeoReader().read(self.filename)
+
+    def time_read_info(self, n_cells, elem_type):
+        GeoReader().read_info(self.filename)
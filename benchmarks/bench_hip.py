@@ -0,0 +1,97 @@
+"""Benchmarks the h5 part of hip I/O (i.e. pyhip is not called).
+"""
+
+import os
+
+import numpy as np
+
+from .common import (
+    SIZES,
+    ELEM_TYPES,
+    get_mesh,
+    TmpDirBenchmark,
+)
+
+
+try:
+    import h5py
+    from yamio.hip import (
+        HipReader,
+        HipWriter,
+        meshio_to_hip_type,
+    )
+    has_hip = True
+except ImportError:
+    has_hip = False
+
+
+def write_h5(filename, mesh):
+    """Writes the h5 file `HipWriter` hands to pyhip.
+    """
+    writer = HipWriter()
+    with h5py.File(filename, 'w') as h5_file:
+        writer._write_conns(h5_file, mesh)
+        writer._write_coords(h5_file, mesh)
+        writer._write_bnd_patches(h5_file, mesh.bnd_patches)
+
+
+def write_hip_h5(filename, mesh):
+    """Writes a hip-like h5 file (with boundary faces, as pyhip does).
+    """
+    writer = HipWriter()
+    with h5py.File(filename, 'w') as h5_file:
+        writer._write_conns(h5_file, mesh)
+        writer._write_coords(h5_file, mesh)
+
+        elem_type = list(mesh.bnd_patches.values())[0].type
+        hip_elem_type = meshio_to_hip_type[elem_type]
+        conns = np.concatenate([patch.data for patch in mesh.bnd_patches.values()])
+        lidx = np.cumsum([len(patch) for patch in mesh.bnd_patches.values()])
+
+        h5_file.create_dataset('Boundary/PatchLabels',
+                               data=list(mesh.bnd_patches.keys()), dtype='S24')
+        h5_file.create_dataset(f'Boundary/bnd_{hip_elem_type}->node',
+                               data=conns.ravel() + 1)
+        h5_file.create_dataset(f'Boundary/bnd_{hip_elem_type}_lidx', data=lidx)
+
+
+class HipWriteH5(TmpDirBenchmark):
+    params = (SIZES, ELEM_TYPES)
+    param_names = ['n_cells', 'elem_type']
+
+    def setup(self, n_cells, elem_type):
+        if not has_hip:
+            raise NotImplementedError('pyhip and h5py are required')
+
+        super().setup()
+        self.mesh = get_mesh(n_cells, elem_type)
+        self.filename = os.path.join(self.tmp_dir, 'mesh_tmp.mesh.h5')
+
+    def time_write(self, n_cells, elem_type):
+        write_h5(self.filename, self.mesh)
+
+    def peakmem_write(self, n_cells, elem_type):
+        write_h5(self.filename, self.mesh)
+
+
+class HipRead(TmpDirBenchmark):
+    params = (SIZES, ELEM_TYPES)
+    param_names = ['n_cells', 'elem_type']
+
+    def setup(self, n_cells, elem_type):
+        if not has_hip:
+            raise NotImplementedError('pyhip and h5py are required')
+
+        super().setup()
+        self.filename = os.path.join(self.tmp_dir, 'mesh.mesh.xmf')
+        write_hip_h5(os.path.join(self.tmp_dir, 'mesh.mesh.h5'),
+                     get_mesh(n_cells, elem_type))
+
+    def time_read(self, n_cells, elem_type):
+        HipReader().read(self.filename)
+
+    def peakmem_read(self, n_cells, elem_type):
+        HipReader().read(self.filename)
+
+    def time_read_info(self, n_cells, elem_type):
+        HipReader().read_info(self.filename)
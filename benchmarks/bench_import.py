@@ -0,0 +1,10 @@
+class Import:
+    """Import time in a fresh interpreter.
+    """
+
+    def timeraw_import_yamio(self):
+        return "import yamio"
+
+    def timeraw_import_meshio(self):
+        # baseline: yamio cannot be faster than meshio
+        return "import meshio"
@@ -0,0 +1,31 @@
+import copy
+
+from .common import (
+    SIZES,
+    ELEM_TYPES,
+    get_mesh,
+)
+
+
+class MeshEq:
+    params = (SIZES, ELEM_TYPES)
+    param_names = ['n_cells', 'elem_type']
+    timeout = 600
+
+    def setup(self, n_cells, elem_type):
+        self.mesh = get_mesh(n_cells, elem_type)
+        self.other_mesh = copy.deepcopy(self.mesh)
+
+    def time_eq(self, n_cells, elem_type):
+        # fingerprints are cached (repeats would only time lookups)
+        self.mesh.clear_fingerprints()
+        self.other_mesh.clear_fingerprints()
+        self.mesh == self.other_mesh
+
+    def time_eq_cached(self, n_cells, elem_type):
+        self.mesh == self.other_mesh
+
+    def peakmem_eq(self, n_cells, elem_type):
+        self.mesh.clear_fingerprints()
+        self.other_mesh.clear_fingerprints()
+        self.mesh == self.other_mesh
@@ -0,0 +1,43 @@
+from yamio.mesh_utils import (
+    get_brep,
+    get_local_points_and_cells,
+)
+
+from .common import (
+    SIZES,
+    SMALL_SIZES,
+    get_mesh,
+)
+
+
+class GetBrep:
+    # tetra is not supported
+    params = (SMALL_SIZES, ['triangle', 'quad', 'hexahedron'])
+    param_names = ['n_cells', 'elem_type']
+    timeout = 600
+
+    def setup(self, n_cells, elem_type):
+        self.mesh = get_mesh(n_cells, elem_type)
+
+    def time_get_brep(self, n_cells, elem_type):
+        get_brep(self.mesh.points, self.mesh.cells)
+
+    def peakmem_get_brep(self, n_cells, elem_type):
+        get_brep(self.mesh.points, self.mesh.cells)
+
+
+class GetLocalPointsAndCells:
+    params = (SIZES, ['triangle', 'quad', 'tetra', 'hexahedron'])
+    param_names = ['n_cells', 'elem_type']
+    timeout = 600
+
+    def setup(self, n_cells, elem_type):
+        mesh = get_mesh(n_cells, elem_type)
+        self.points = mesh.points
+        self.patch_cells = list(mesh.bnd_patches.values())[:1]
+
+    def time_get_local_points_and_cells(self, n_cells, elem_type):
+        get_local_points_and_cells(self.points, self.patch_cells)
+
+    def peakmem_get_local_points_and_cells(self, n_cells, elem_type):
+        get_local_points_and_cells(self.points, self.patch_cells)
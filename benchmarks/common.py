@@ -0,0 +1,31 @@
+import functools
+import shutil
+import tempfile
+
+from yamio.mesh_generators import get_box_mesh
+
+
+# target number of cells
+SIZES = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+# for algorithms that do not scale (yet)
+SMALL_SIZES = [10**2, 10**3]
+
+ELEM_TYPES = ['triangle', 'quad', 'tetra', 'hexahedron']
+
+
+@functools.lru_cache(maxsize=4)
+def get_mesh(n_cells, elem_type):
+    return get_box_mesh(n_cells, elem_type=elem_type)
+
+
+class TmpDirBenchmark:
+    """Creates a temporary directory at setup and removes it at teardown.
+    """
+    timeout = 600
+
+    def setup(self, *params):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def teardown(self, *params):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
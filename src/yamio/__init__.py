@@ -6,9 +6,24 @@ from yamio.mesh import Mesh
 from yamio._helpers import (
     read,
     write,
+    info,
 )
 
 
+# loaded at first access (avoids importing asyncio with yamio)
+_LAZY_ATTRS = {'aread': 'yamio.aio',
+               'awrite': 'yamio.aio',
+               'AsyncExecutor': 'yamio.aio'}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        from importlib import import_module
+        return getattr(import_module(_LAZY_ATTRS[name]), name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
 # TODO: h5cross and other formats
 # TODO: yamio xdmf? extend meshio in order to have bdn info
 # TODO: from meshio to yamio (get bounds option... how?)
\ No newline at end of file
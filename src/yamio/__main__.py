@@ -0,0 +1,6 @@
+import sys
+
+from yamio.cli import main
+
+
+sys.exit(main())
@@ -1,55 +1,128 @@
 
 from pathlib import Path
+from importlib import import_module
+from importlib.util import find_spec
 
 import meshio
 from meshio import (
     register_format,
-    write,
     extension_to_filetypes,
 )
 
-from yamio.ensight.gold import (
-    GeoReader,
-    GeoWriter,
-)
+from yamio.info import MeshInfo
+from yamio.profiling import stage
+
+
+def _has_module(name):
+    # avoids importing heavy backends just to check availability
+    return find_spec(name) is not None
+
+
+has_pyhip = _has_module('pyhip')
+has_h5py = _has_module('h5py')
+
+
+class _LazyCallable:
+    """Imports its backend only at first call.
 
+    Args:
+        module_name (str)
+        name (str): Function or class name.
+        method_name (str): If given, `name` is instantiated (without
+            arguments) and the method is used.
+    """
 
-try:
-    import pyhip
-    has_pyhip = True
-except ImportError:
-    has_pyhip = False
+    def __init__(self, module_name, name, method_name=None):
+        self.module_name = module_name
+        self.name = name
+        self.method_name = method_name
+        self._func = None
 
-try:
-    import h5py
-    has_h5py = True
-except ImportError:
-    has_h5py = False
+    def __call__(self, *args, **kwargs):
+        if self._func is None:
+            self._func = self._load()
+
+        return self._func(*args, **kwargs)
+
+    def _load(self):
+        obj = getattr(import_module(self.module_name), self.name)
+        if self.method_name is not None:
+            obj = getattr(obj(), self.method_name)
+
+        return obj
+
+    def __repr__(self):
+        method_str = f'().{self.method_name}' if self.method_name else ''
+        return f'<lazy {self.module_name}.{self.name}{method_str}>'
 
 
 # TODO: writer for hip is not following the right flow...
 
 
-register_format('geo', ['.geo'], GeoReader().read, {'geo': GeoWriter().write})
+# header-only readers (formats not here fallback to a full read)
+info_map = {}
 
 
-if has_pyhip and has_h5py:
-    from yamio.hip import (
-        HipReader,
-        HipWriter,
-    )
+register_format('geo', ['.geo'],
+                _LazyCallable('yamio.ensight.gold', 'GeoReader', 'read'),
+                {'geo': _LazyCallable('yamio.ensight.gold', 'GeoWriter', 'write')})
+info_map['geo'] = _LazyCallable('yamio.ensight.gold', 'GeoReader', 'read_info')
 
-    register_format('hip', ['.mesh.h5', '.mesh.xmf'], HipReader().read,
-                    {'hip': HipWriter().write})
+
+if has_pyhip and has_h5py:
+    register_format('hip', ['.mesh.h5', '.mesh.xmf'],
+                    _LazyCallable('yamio.hip', 'HipReader', 'read'),
+                    {'hip': _LazyCallable('yamio.hip', 'HipWriter', 'write')})
+    info_map['hip'] = _LazyCallable('yamio.hip', 'HipReader', 'read_info')
 
 
 if has_h5py:
-    from yamio.dolfin import write as write_dolfin
+    register_format('dolfin-yamio', [], None,
+                    {'dolfin-yamio': _LazyCallable('yamio.dolfin', 'write')})
+    info_map['xdmf'] = _LazyCallable('yamio.dolfin', 'read_info')
+    info_map['dolfin-yamio'] = info_map['xdmf']
+
+
+def read(filename, file_format=None, cache=None):
+    """
+    Args:
+        cache (yamio.cache.ReadCache): Opt-in on-disk cache of parsed meshes.
+    """
+    file_format = _get_file_format(filename, file_format)
+    if cache is not None:
+        return cache.read(filename, file_format=file_format)
+
+    with stage('yamio.read'):
+        return meshio.read(filename, file_format=file_format)
+
+
+def write(filename, mesh, file_format=None, **kwargs):
+    with stage('yamio.write'):
+        return meshio.write(filename, mesh, file_format=file_format, **kwargs)
+
+
+def info(filename, file_format=None, compute_bbox=False):
+    """Gets mesh info without loading the mesh arrays.
+
+    Args:
+        compute_bbox (bool): If `True`, coordinates are scanned to get the
+            bounding box (when not available in metadata).
+
+    Returns:
+        MeshInfo or dict: dict of infos if several parts (as in `read`).
+
+    Notes:
+        Formats without a header-only reader are fully read.
+    """
+    file_format = _get_file_format(filename, file_format)
+
+    if file_format in info_map:
+        return info_map[file_format](str(filename), compute_bbox=compute_bbox)
 
-    register_format('dolfin-yamio', [], None, {'dolfin-yamio': write_dolfin})
+    return MeshInfo.from_mesh(read(filename, file_format=file_format))
 
 
-def read(filename, file_format=None):
+def _get_file_format(filename, file_format=None):
     # because meshio _filetypes_from_path does a bad job
     if file_format is None:
         file_formats = extension_to_filetypes.get(''.join(Path(filename).suffixes), [])
@@ -57,6 +130,6 @@ def read(filename, file_format=None):
         if len(file_formats) == 1:
             file_format = file_formats[0]
 
-    return meshio.read(filename, file_format=file_format)
+    return file_format
 
 
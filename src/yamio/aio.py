@@ -0,0 +1,169 @@
+"""Asyncio API: reads and writes run in a bounded thread pool.
+
+Examples:
+    ```python
+    mesh = await aread('mesh.mesh.xmf')
+    await awrite('mesh.geo', mesh)
+
+    # dedicated limits (e.g. per service)
+    executor = AsyncExecutor(max_workers=4, max_concurrency=16)
+    mesh = await aread('mesh.mesh.xmf', executor=executor)
+    ```
+
+Notes:
+    Parsing and HDF5 I/O run in threads (numpy and h5py release the GIL in
+    their heavy parts), i.e. the event loop is not blocked.
+
+    Cancelling the awaiting task stops the work at the beginning of the
+    next stage (e.g. before parsing the next `GeoReader` part or before the
+    pyhip step of `HipWriter`). Stages are the ones of `yamio.profiling`.
+    Work that has not started is not run.
+
+    Formats in `SERIAL_FORMATS` drive process-global state (e.g. the pyhip
+    session of `HipWriter`), i.e. their reads and writes run one at a time
+    (behind a module lock).
+"""
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+from yamio._helpers import (
+    _get_file_format,
+    read,
+    write,
+)
+from yamio.profiling import (
+    CancellationScope,
+    check_cancelled,
+)
+
+
+DEFAULT_MAX_WORKERS = 4
+
+# not thread-safe (process-global state)
+SERIAL_FORMATS = ('hip',)
+
+_default_executor = None
+_serial_lock = threading.Lock()
+
+
+class AsyncExecutor:
+    """Runs blocking functions in a bounded thread pool.
+
+    Args:
+        max_workers (int): Number of threads.
+        max_concurrency (int): Max number of operations in flight (running
+            or queued in the pool). Others wait in the event loop. Defaults
+            to `max_workers`.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_concurrency=None):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='yamio')
+        self._semaphores = weakref.WeakKeyDictionary()  # one per event loop
+
+    async def run(self, func, *args, **kwargs):
+        """Runs function in the pool (cancellable between stages).
+        """
+        loop = asyncio.get_running_loop()
+        cancel_event = threading.Event()
+
+        async with self._get_semaphore(loop):
+            future = loop.run_in_executor(
+                self._executor,
+                functools.partial(_run_cancellable, cancel_event, func, *args, **kwargs))
+            try:
+                return await future
+            except asyncio.CancelledError:
+                cancel_event.set()
+                raise
+
+    async def read(self, filename, file_format=None, cache=None):
+        file_format = _get_file_format(filename, file_format)
+        return await self.run(_get_runner(read, file_format), filename,
+                              file_format=file_format, cache=cache)
+
+    async def write(self, filename, mesh, file_format=None, **kwargs):
+        file_format = _get_file_format(filename, file_format)
+        return await self.run(_get_runner(write, file_format), filename, mesh,
+                              file_format=file_format, **kwargs)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+
+    def _get_semaphore(self, loop):
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        return semaphore
+
+
+def get_default_executor():
+    global _default_executor
+
+    if _default_executor is None:
+        _default_executor = AsyncExecutor()
+
+    return _default_executor
+
+
+def set_default_executor(executor):
+    """Sets executor used when none is given (e.g. to change limits).
+    """
+    global _default_executor
+    _default_executor = executor
+
+
+async def aread(filename, file_format=None, cache=None, executor=None):
+    """Asynchronous `yamio.read`.
+
+    Args:
+        executor (AsyncExecutor): Defaults to `get_default_executor()`.
+    """
+    executor = executor or get_default_executor()
+    return await executor.read(filename, file_format=file_format, cache=cache)
+
+
+async def awrite(filename, mesh, file_format=None, executor=None, **kwargs):
+    """Asynchronous `yamio.write`.
+
+    Args:
+        executor (AsyncExecutor): Defaults to `get_default_executor()`.
+
+    Notes:
+        If cancelled, the file may be partially written.
+    """
+    executor = executor or get_default_executor()
+    return await executor.write(filename, mesh, file_format=file_format, **kwargs)
+
+
+def _get_runner(func, file_format):
+    if file_format in SERIAL_FORMATS:
+        return functools.partial(_run_serial, func)
+
+    return func
+
+
+def _run_serial(func, *args, **kwargs):
+    # if cancelled while waiting, work stops at its first stage
+    with _serial_lock:
+        return func(*args, **kwargs)
+
+
+def _run_cancellable(cancel_event, func, *args, **kwargs):
+    with CancellationScope(cancel_event):
+        check_cancelled()
+        return func(*args, **kwargs)
@@ -0,0 +1,202 @@
+"""Compact storage of boundary patches.
+
+Examples:
+    ```python
+    bnd_patches = BoundaryPatches(conns, last_indices, labels, cell_type='quad')
+    bnd_patches['inlet']  # meshio.CellBlock (view of conns)
+
+    nodes, last_indices = get_patch_node_groups(bnd_patches)
+    ```
+
+Notes:
+    Mirrors hip's layout: faces (or nodes) of all patches are stored patch
+    after patch in one connectivity and `last_indices` (hip's `lidx`) has the
+    index after the last face of each patch.
+
+    `BoundaryPatches` behaves like the `dict` used in `yamio.Mesh.bnd_patches`
+    (items are `meshio.CellBlock` or node arrays). Items of another cell type
+    are stored separately (see `is_compact`).
+"""
+
+from collections.abc import MutableMapping
+
+import numpy as np
+import meshio
+
+
+class BoundaryPatches(MutableMapping):
+    """Boundary patches stored in a single connectivity.
+
+    Args:
+        conns (np.array): Faces (or nodes, if `cell_type` is `None`) of all
+            patches.
+        last_indices (array-like): Index after the last face of each patch.
+        labels (list): Patch names.
+        cell_type (str): Face type (`None` for node patches).
+    """
+
+    def __init__(self, conns, last_indices, labels, cell_type=None):
+        self.conns = np.asarray(conns)
+        self.last_indices = np.asarray(last_indices, dtype=np.int64)
+        self.labels = list(labels)
+        self.cell_type = cell_type
+
+        if len(self.labels) != len(self.last_indices):
+            raise Exception('Number of labels and last indices differ')
+
+        self._names = list(self.labels)  # insertion order
+        self._others = {}  # items not stored in conns
+        self._items = {}  # created items (same object on each access)
+
+    @classmethod
+    def from_dict(cls, bnd_patches):
+        """Compacts patches (all must be of the same type).
+        """
+        kinds = {_get_kind(patch_nodes) for patch_nodes in bnd_patches.values()}
+        if len(kinds) > 1:
+            raise Exception(f'Patches of different types cannot be compacted: {kinds}')
+        cell_type = kinds.pop() if kinds else None
+
+        datas = [_get_data(patch_nodes) for patch_nodes in bnd_patches.values()]
+        if datas:
+            conns = np.concatenate(datas, axis=0)
+        else:
+            conns = np.array([], dtype=np.int64)
+
+        return cls(conns, np.cumsum([len(data) for data in datas], dtype=np.int64),
+                   bnd_patches.keys(), cell_type=cell_type)
+
+    @property
+    def is_compact(self):
+        """Whether all patches are stored in `conns`.
+        """
+        return not self._others
+
+    def __getitem__(self, name):
+        if name in self._others:
+            return self._others[name]
+
+        if name not in self._items:
+            start, stop = self._get_bounds(name)
+            data = self.conns[start:stop]
+            self._items[name] = (meshio.CellBlock(self.cell_type, data)
+                                 if self.cell_type is not None else data)
+
+        return self._items[name]
+
+    def __setitem__(self, name, patch_nodes):
+        # replaced items keep their position
+        position = self._names.index(name) if name in self else len(self._names)
+        if name in self:
+            self._remove(name)
+        self._names.insert(position, name)
+
+        if _get_kind(patch_nodes) != self.cell_type:
+            self._others[name] = patch_nodes
+            return
+
+        # compact patches follow insertion order
+        previous = [other for other in self._names[:position] if other in self.labels]
+        index = self.labels.index(previous[-1]) + 1 if previous else 0
+        start = self.last_indices[index - 1] if index else 0
+        data = _get_data(patch_nodes)
+
+        if len(self.conns):
+            self.conns = np.concatenate([self.conns[:start], data, self.conns[start:]], axis=0)
+        else:
+            self.conns = np.asarray(data)
+        self.last_indices = np.r_[self.last_indices[:index], start + len(data),
+                                  self.last_indices[index:] + len(data)].astype(np.int64)
+        self.labels.insert(index, name)
+        self._items = {}
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+
+        self._remove(name)
+
+    def __iter__(self):
+        return iter(list(self._names))
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._others or name in self.labels
+
+    def __repr__(self):
+        return f'<yamio boundary patches ({self.cell_type})> {list(self._names)}'
+
+    def _remove(self, name):
+        self._names.remove(name)
+        if name in self._others:
+            del self._others[name]
+            return
+
+        index = self.labels.index(name)
+        start, stop = self._get_bounds(name)
+        self.conns = np.concatenate([self.conns[:start], self.conns[stop:]], axis=0)
+        self.last_indices = np.r_[self.last_indices[:index],
+                                  self.last_indices[index + 1:] - (stop - start)].astype(np.int64)
+        self.labels.pop(index)
+        self._items = {}
+
+    def _get_bounds(self, name):
+        index = self.labels.index(name)
+        start = self.last_indices[index - 1] if index else 0
+
+        return int(start), int(self.last_indices[index])
+
+
+def get_patch_node_groups(bnd_patches):
+    """Gets (sorted) unique nodes of each patch.
+
+    Args:
+        bnd_patches (dict or BoundaryPatches)
+
+    Returns:
+        tuple: Nodes of all patches (patch after patch) and index after the
+            last node of each patch (hip's `bnode_lidx`).
+
+    Notes:
+        Patches are processed at once (one sort), i.e. compact patches are
+        not split.
+    """
+    n_patches = len(bnd_patches)
+    if not sum(len(patch_nodes) for patch_nodes in bnd_patches.values()):
+        return np.array([], dtype=np.int64), np.zeros(n_patches, dtype=np.int64)
+
+    if isinstance(bnd_patches, BoundaryPatches) and bnd_patches.is_compact:
+        # labels follow iteration order
+        sizes = np.diff(bnd_patches.last_indices, prepend=0)
+        nodes = bnd_patches.conns.reshape(len(bnd_patches.conns), -1)
+        patch_ids = np.repeat(np.arange(n_patches), sizes * nodes.shape[1])
+        nodes = nodes.ravel()
+    else:
+        datas = [np.asarray(_get_data(patch_nodes)).ravel()
+                 for patch_nodes in bnd_patches.values()]
+        patch_ids = np.repeat(np.arange(n_patches), [len(data) for data in datas])
+        nodes = np.concatenate(datas)
+
+    nodes = nodes.astype(np.int64)
+    n_nodes = int(nodes.max()) + 1
+
+    # unique (patch, node) pairs
+    keys = np.sort(patch_ids * n_nodes + nodes)
+    keys = keys[np.r_[True, keys[1:] != keys[:-1]]]
+
+    last_indices = np.cumsum(np.bincount(keys // n_nodes, minlength=n_patches))
+
+    return keys % n_nodes, last_indices.astype(np.int64)
+
+
+def _get_kind(patch_nodes):
+    return patch_nodes.type if isinstance(patch_nodes, meshio.CellBlock) else None
+
+
+def _get_data(patch_nodes):
+    if isinstance(patch_nodes, meshio.CellBlock):
+        return patch_nodes.data
+
+    return np.asarray(patch_nodes)
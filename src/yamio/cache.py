@@ -0,0 +1,280 @@
+"""Opt-in on-disk cache of parsed meshes.
+
+Examples:
+    ```python
+    from yamio.cache import ReadCache
+
+    cache = ReadCache('/scratch/yamio_cache', max_size=50 * 2**30)
+    mesh = yamio.read(filename, cache=cache)  # warm read is a memory map
+    ```
+
+Notes:
+    Entries are keyed by path, size and modification time of the file (and
+    of the `.h5` file with the same basename, where hip and xdmf store
+    heavy data), file format and yamio version.
+
+    Points, cells, boundary patches, point data and cell data are cached.
+    Other `meshio.Mesh` attributes are not.
+
+    Entries are written to a temporary directory and renamed, so concurrent
+    processes only see complete entries. Least recently used entries are
+    evicted when the cache exceeds `max_size`.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import meshio
+
+import yamio
+from yamio.profiling import stage
+
+
+CACHE_VERSION = 1
+
+_META_FILENAME = 'meta.json'
+_TMP_PREFIX = 'tmp-'
+_TMP_MAX_AGE = 3600.  # leftovers of crashed processes
+
+
+def get_default_cache_dir():
+    cache_home = os.environ.get('XDG_CACHE_HOME',
+                                os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(cache_home, 'yamio')
+
+
+class ReadCache:
+    """Cache of parsed meshes stored as memory-mappable `.npy` files.
+
+    Args:
+        cache_dir (str): Defaults to `get_default_cache_dir()`.
+        max_size (int): Maximum size in bytes.
+        mmap_mode (str): Passed to `np.load`. Default is copy-on-write,
+            i.e. arrays can be modified without affecting the cache.
+    """
+
+    def __init__(self, cache_dir=None, max_size=10 * 2**30, mmap_mode='c'):
+        self.cache_dir = cache_dir if cache_dir is not None else get_default_cache_dir()
+        self.max_size = max_size
+        self.mmap_mode = mmap_mode
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def read(self, filename, file_format=None):
+        """Reads from cache or with `yamio.read` (and stores result).
+        """
+        filename = str(filename)
+        entry_dir = os.path.join(self.cache_dir,
+                                 self._get_key(filename, file_format))
+
+        mesh = self._load(entry_dir)
+        if mesh is not None:
+            return mesh
+
+        mesh = yamio.read(filename, file_format=file_format)
+        self._store(entry_dir, mesh)
+
+        return mesh
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            _remove_entry(os.path.join(self.cache_dir, name))
+
+    def get_size(self):
+        return sum(size for _, _, size in self._get_entries())
+
+    def _get_key(self, filename, file_format):
+        h5_filename = '.'.join(filename.split('.')[:-1]) + '.h5'
+
+        identity = [CACHE_VERSION, yamio.__version__, file_format]
+        for filename_ in (filename, h5_filename):
+            if not os.path.exists(filename_):
+                continue
+            stat = os.stat(filename_)
+            identity.extend([os.path.abspath(filename_), stat.st_size,
+                             stat.st_mtime_ns])
+
+        return hashlib.sha1(json.dumps(identity).encode('utf-8')).hexdigest()
+
+    def _load(self, entry_dir):
+        meta_filename = os.path.join(entry_dir, _META_FILENAME)
+        try:
+            with open(meta_filename, 'r') as file:
+                meta = json.load(file)
+
+            with stage('cache.load'):
+                meshes = [_load_mesh(os.path.join(entry_dir, str(i)), mesh_meta,
+                                     self.mmap_mode)
+                          for i, mesh_meta in enumerate(meta['meshes'])]
+        except (OSError, ValueError, KeyError):
+            # missing, evicted in the meantime or corrupted
+            return None
+
+        # lru bookkeeping
+        try:
+            os.utime(meta_filename)
+        except OSError:
+            pass
+
+        if meta['part_names'] is None:
+            return meshes[0]
+
+        return dict(zip(meta['part_names'], meshes))
+
+    def _store(self, entry_dir, mesh):
+        if isinstance(mesh, dict):
+            part_names, meshes = list(mesh.keys()), list(mesh.values())
+        else:
+            part_names, meshes = None, [mesh]
+
+        tmp_dir = os.path.join(self.cache_dir, f'{_TMP_PREFIX}{uuid.uuid4().hex}')
+        with stage('cache.store'):
+            os.makedirs(tmp_dir)
+            try:
+                meshes_meta = [_save_mesh(os.path.join(tmp_dir, str(i)), mesh_)
+                               for i, mesh_ in enumerate(meshes)]
+            except TypeError:
+                # e.g. polyhedra (non-rectangular arrays)
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return
+
+            with open(os.path.join(tmp_dir, _META_FILENAME), 'w') as file:
+                json.dump({'part_names': part_names, 'meshes': meshes_meta}, file)
+
+            try:
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                # another process stored it first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self._evict()
+
+    def _get_entries(self):
+        """Gets `(entry_dir, last_access, size)` of complete entries.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(_TMP_PREFIX):
+                self._remove_stale_tmp(os.path.join(self.cache_dir, name))
+                continue
+
+            entry_dir = os.path.join(self.cache_dir, name)
+            try:
+                last_access = os.stat(os.path.join(entry_dir, _META_FILENAME)).st_mtime
+                size = _get_dir_size(entry_dir)
+            except OSError:
+                continue
+            entries.append((entry_dir, last_access, size))
+
+        return entries
+
+    def _remove_stale_tmp(self, tmp_dir):
+        try:
+            if time.time() - os.stat(tmp_dir).st_mtime > _TMP_MAX_AGE:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        except OSError:
+            pass
+
+    def _evict(self):
+        entries = sorted(self._get_entries(), key=lambda entry: entry[1])
+        total_size = sum(size for _, _, size in entries)
+
+        for entry_dir, _, size in entries:
+            if total_size <= self.max_size:
+                break
+            _remove_entry(entry_dir)
+            total_size -= size
+
+
+def _save_mesh(mesh_dir, mesh):
+    os.makedirs(mesh_dir)
+
+    def save(name, array):
+        array = np.asarray(array)
+        if array.dtype == object:
+            raise TypeError('Object arrays cannot be cached')
+        np.save(os.path.join(mesh_dir, f'{name}.npy'), array)
+
+    save('points', mesh.points)
+
+    cell_types = []
+    for i, cell_block in enumerate(mesh.cells):
+        save(f'cells_{i}', cell_block.data)
+        cell_types.append(cell_block.type)
+
+    patches = []
+    for i, (patch_name, patch_nodes) in enumerate(getattr(mesh, 'bnd_patches', {}).items()):
+        if isinstance(patch_nodes, meshio.CellBlock):
+            save(f'patch_{i}', patch_nodes.data)
+            patches.append([patch_name, patch_nodes.type])
+        else:
+            save(f'patch_{i}', patch_nodes)
+            patches.append([patch_name, None])
+
+    point_data_names = list(mesh.point_data.keys())
+    for i, name in enumerate(point_data_names):
+        save(f'point_data_{i}', mesh.point_data[name])
+
+    cell_data_names = list(mesh.cell_data.keys())
+    for i, name in enumerate(cell_data_names):
+        for j, data in enumerate(mesh.cell_data[name]):
+            save(f'cell_data_{i}_{j}', data)
+
+    return {'is_yamio': isinstance(mesh, yamio.Mesh),
+            'cell_types': cell_types,
+            'patches': patches,
+            'point_data': point_data_names,
+            'cell_data': cell_data_names}
+
+
+def _load_mesh(mesh_dir, meta, mmap_mode):
+
+    def load(name):
+        return np.load(os.path.join(mesh_dir, f'{name}.npy'), mmap_mode=mmap_mode)
+
+    points = load('points')
+    cells = [meshio.CellBlock(cell_type, load(f'cells_{i}'))
+             for i, cell_type in enumerate(meta['cell_types'])]
+
+    bnd_patches = {}
+    for i, (patch_name, elem_type) in enumerate(meta['patches']):
+        data = load(f'patch_{i}')
+        bnd_patches[patch_name] = meshio.CellBlock(elem_type, data) \
+            if elem_type is not None else data
+
+    point_data = {name: load(f'point_data_{i}')
+                  for i, name in enumerate(meta['point_data'])}
+    cell_data = {name: [load(f'cell_data_{i}_{j}') for j in range(len(cells))]
+                 for i, name in enumerate(meta['cell_data'])}
+
+    if meta['is_yamio']:
+        return yamio.Mesh(points, cells, bnd_patches=bnd_patches,
+                          point_data=point_data, cell_data=cell_data)
+
+    return meshio.Mesh(points, cells, point_data=point_data, cell_data=cell_data)
+
+
+def _get_dir_size(dir_name):
+    size = 0
+    for root, _, filenames in os.walk(dir_name):
+        for filename in filenames:
+            size += os.path.getsize(os.path.join(root, filename))
+
+    return size
+
+
+def _remove_entry(entry_dir):
+    # rename first, so that other processes never see partial entries
+    tmp_dir = os.path.join(os.path.dirname(entry_dir),
+                           f'{_TMP_PREFIX}{uuid.uuid4().hex}')
+    try:
+        os.rename(entry_dir, tmp_dir)
+    except OSError:
+        return
+
+    shutil.rmtree(tmp_dir, ignore_errors=True)
@@ -0,0 +1,55 @@
+"""Command line interface.
+
+Examples:
+    yamio info mesh.mesh.xmf
+"""
+
+import argparse
+import json
+
+import yamio
+
+
+def main(argv=None):
+    parser = _get_parser()
+    args = parser.parse_args(argv)
+
+    if not hasattr(args, 'func'):
+        parser.print_help()
+        return 1
+
+    return args.func(args)
+
+
+def _get_parser():
+    parser = argparse.ArgumentParser(prog='yamio')
+    subparsers = parser.add_subparsers()
+
+    info_parser = subparsers.add_parser(
+        'info', help='show mesh info without loading mesh arrays')
+    info_parser.add_argument('filename')
+    info_parser.add_argument('--format', dest='file_format', default=None)
+    info_parser.add_argument('--bbox', action='store_true',
+                             help='scan coordinates for bounding box')
+    info_parser.add_argument('--json', action='store_true')
+    info_parser.set_defaults(func=_info)
+
+    return parser
+
+
+def _info(args):
+    mesh_info = yamio.info(args.filename, file_format=args.file_format,
+                           compute_bbox=args.bbox)
+
+    parts = mesh_info if isinstance(mesh_info, dict) else None
+    if args.json:
+        data = {name: part_info.to_dict() for name, part_info in parts.items()} \
+            if parts is not None else mesh_info.to_dict()
+        print(json.dumps(data, indent=2))
+    elif parts is not None:
+        for name, part_info in parts.items():
+            print(f'{name}:\n{part_info}')
+    else:
+        print(mesh_info)
+
+    return 0
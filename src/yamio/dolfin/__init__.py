@@ -1,4 +1,5 @@
 
 
 from yamio.dolfin._dolfin import write
+from yamio.dolfin._dolfin import read_info
 from yamio.dolfin.outputs import DolfinSolReader
@@ -1,8 +1,18 @@
+import os
+from contextlib import contextmanager
+import xml.etree.ElementTree as etree
 
 import numpy as np
 import meshio
+from meshio.xdmf.common import xdmf_to_meshio_type
 import h5py
 
+from yamio.info import (
+    MeshInfo,
+    get_dataset_bounds,
+)
+from yamio.profiling import stage
+
 
 def write(filename, mesh):
     """Extends XDMF writer to also create mesh with boundary patches.
@@ -11,13 +21,16 @@ def write(filename, mesh):
         Still experimental. It will be extended to create an unique h5 file.
     """
 
-    mesh.write(filename, file_format='xdmf')  # replicateds normal behavior
+    with stage('dolfin.write_xdmf'):
+        mesh.write(filename, file_format='xdmf')  # replicateds normal behavior
 
     if hasattr(mesh, 'bnd_patches') and mesh.bnd_patches:
         base_filename = '.'.join(filename.split('.')[:-1])
         bnd_filename = f'{base_filename}_bnd.xdmf'
-        bnd_mesh = get_bnd_mesh(mesh)
-        bnd_mesh.write(bnd_filename, file_format='xdmf')
+        with stage('dolfin.get_bnd_mesh'):
+            bnd_mesh = get_bnd_mesh(mesh)
+        with stage('dolfin.write_bnd_xdmf'):
+            bnd_mesh.write(bnd_filename, file_format='xdmf')
 
         # write patch labels
         patch_labels = list(mesh.bnd_patches.keys())
@@ -28,6 +41,95 @@ def write(filename, mesh):
                                    dtype='S24')
 
 
+def read_info(filename, compute_bbox=False):
+    """Reads mesh info from xdmf metadata (heavy data is not loaded).
+
+    Notes:
+        Boundary patches are retrieved if `_bnd` files created by `write`
+        exist. Their sizes require reading the (boundary) patch numbering.
+
+        Layouts other than a single uniform grid with data in HDF5 (e.g.
+        mixed topologies, inline XML data or time series) are fully read.
+    """
+    grid = _get_xdmf_grid(filename)
+    if not _is_header_readable(grid):
+        with stage('dolfin.read_xdmf'):
+            return MeshInfo.from_mesh(meshio.read(filename, file_format='xdmf'))
+
+    n_points, dim = _get_data_item_dims(grid.find('.//Geometry'))
+
+    cells = []
+    for topology in grid.findall('.//Topology'):
+        elem_type = xdmf_to_meshio_type[topology.get('TopologyType')]
+        n_cells = _get_data_item_dims(topology)[0]
+        cells.append((elem_type, n_cells))
+
+    bounding_box = None
+    if compute_bbox:
+        with _open_data_item(filename, grid.find('.//Geometry')) as dataset:
+            bounding_box = np.array(get_dataset_bounds(dataset))
+
+    base_filename = '.'.join(filename.split('.')[:-1])
+    bnd_filename = f'{base_filename}_bnd.xdmf'
+    bnd_patches = {}
+    if os.path.exists(bnd_filename):
+        bnd_patches = _read_bnd_patches_info(bnd_filename)
+
+    return MeshInfo(n_points, dim, cells, bnd_patches=bnd_patches,
+                    bounding_box=bounding_box)
+
+
+def _get_xdmf_grid(filename):
+    with open(filename, 'r') as file:
+        tree = etree.parse(file)
+
+    return tree.find('.//Grid')
+
+
+def _is_header_readable(grid):
+    if grid is None or grid.get('GridType', 'Uniform') != 'Uniform':
+        return False
+
+    topologies = grid.findall('Topology')
+    if not topologies or grid.find('Geometry') is None:
+        return False
+
+    # e.g. `Mixed`
+    if any(topology.get('TopologyType') not in xdmf_to_meshio_type
+           for topology in topologies):
+        return False
+
+    data_items = grid.findall('Geometry/DataItem') + grid.findall('Topology/DataItem')
+    return all(data_item.get('Format', 'XML') == 'HDF' for data_item in data_items)
+
+
+def _get_data_item_dims(node):
+    dims = node.find('.//DataItem').get('Dimensions').split()
+    return tuple(int(dim) for dim in dims) + (1,) * (2 - len(dims))
+
+
+@contextmanager
+def _open_data_item(xdmf_filename, node):
+    h5_name, h5_path = node.find('.//DataItem').text.strip().split(':')
+    h5_filename = os.path.join(os.path.dirname(xdmf_filename), h5_name)
+
+    with h5py.File(h5_filename, 'r') as h5_file:
+        yield h5_file[h5_path]
+
+
+def _read_bnd_patches_info(bnd_filename):
+    grid = _get_xdmf_grid(bnd_filename)
+    elem_type = xdmf_to_meshio_type[grid.find('.//Topology').get('TopologyType')]
+
+    with _open_data_item(bnd_filename, grid.find('.//Attribute')) as dataset:
+        patch_labels = [name.decode('utf-8').strip()
+                        for name in dataset.file['PatchLabels'][()]]
+        sizes = np.bincount(dataset[()], minlength=len(patch_labels))
+
+    return {patch_label: (elem_type, int(size))
+            for patch_label, size in zip(patch_labels, sizes)}
+
+
 def get_bnd_mesh(mesh):
     bnd_cells = _get_merged_bnd_cells(mesh)
     patch_numbering_array = _get_bnd_patch_numbering(mesh)
@@ -15,12 +15,19 @@ References:
 """
 
 
+import os
 import re
+from collections import deque
+from itertools import islice
 
 import numpy as np
 
 from meshio import Mesh
 from meshio import CellBlock
+from meshio._common import num_nodes_per_cell
+
+from yamio.info import MeshInfo
+from yamio.profiling import stage
 
 
 meshio_to_geo_type = {'vertex': 'point',
@@ -48,10 +55,14 @@ class GeoReader:
         Returns:
             meshio.Mesh or dict: Mesh if only one part or dict of Meshes if more.
         """
-        with open(filename, 'r') as file:
-            text = file.read()
+        with stage('geo.read_file') as stage_:
+            with open(filename, 'r') as file:
+                text = file.read()
+            stage_.add(bytes_read=os.path.getsize(filename))  # not characters
+
+        with stage('geo.split_parts'):
+            parts_text = [part_text for part_text in re.findall(get_part_regex(), text)]
 
-        parts_text = [part_text for part_text in re.findall(get_part_regex(), text)]
         parts = {}
         for part_text in parts_text:
             name, coords_text, cells_text = part_text
@@ -63,8 +74,12 @@ class GeoReader:
             return parts
 
     def _get_part(self, coords_text, cells_text):
-        points = self._get_part_coords(coords_text)
-        cells = self._get_part_cells(cells_text)
+        with stage('geo.parse_coords'):
+            points = self._get_part_coords(coords_text)
+
+        with stage('geo.parse_cells'):
+            cells = self._get_part_cells(cells_text)
+
         return Mesh(points, cells)
 
     def _get_part_coords(self, coords_text):
@@ -81,6 +96,81 @@ class GeoReader:
 
         return cells
 
+    def read_info(self, filename, compute_bbox=False):
+        """Reads mesh info from part headers.
+
+        Args:
+            compute_bbox (bool): If `True`, coordinates are parsed to get the
+                bounding box of each part. Otherwise, it is only available
+                for single part files with `extents`.
+
+        Returns:
+            MeshInfo or dict: Info if only one part or dict of infos if more.
+
+        Notes:
+            Ids, coordinates and connectivities are skipped without being
+            parsed: binary files (`C Binary`) are seeked, as ASCII blocks
+            with fixed width lines (e.g. `e12.5` and `i10`, as in the
+            format specification). Other ASCII blocks are skipped line by
+            line.
+        """
+        parts = {}
+        with open(filename, 'rb') as file:
+            is_binary = file.read(len(_BINARY_HEADER)).lower() == _BINARY_HEADER
+            file.seek(0)
+            blocks = _BinaryBlocks(file) if is_binary else _AsciiBlocks(file)
+
+            description = [blocks.read_string() for _ in range(3 if is_binary else 2)]
+            if description[0].lower().startswith('fortran binary'):
+                raise Exception('Fortran binary files are not supported')
+
+            # writers may mislabel lines (mode is the last word)
+            has_node_ids = _has_ids(blocks.read_string())
+            has_element_ids = _has_ids(blocks.read_string())
+
+            line = blocks.read_string()
+            extents = None
+            if line == 'extents':
+                extents = blocks.read_extents()
+                line = blocks.read_string()
+
+            while line == 'part':
+                blocks.read_int()  # part number
+                name = blocks.read_string()
+                blocks.read_string()  # coordinates
+                n_points = blocks.read_int()
+                if has_node_ids:
+                    blocks.skip_rows(n_points)
+
+                bounding_box = None
+                if compute_bbox:
+                    bounding_box = np.array([blocks.read_bounds(n_points)
+                                             for _ in range(3)]).T
+                else:
+                    blocks.skip_rows(n_points, n_values=3, is_float=True)
+
+                cells = []
+                line = blocks.read_string()
+                while line in geo_to_meshio_type:
+                    elem_type = geo_to_meshio_type[line]
+                    n_cells = blocks.read_int()
+                    if has_element_ids:
+                        blocks.skip_rows(n_cells)
+                    blocks.skip_rows(n_cells, n_values=num_nodes_per_cell[elem_type])
+                    cells.append((elem_type, n_cells))
+                    line = blocks.read_string()
+
+                parts[name] = MeshInfo(n_points, 3, cells,
+                                       bounding_box=bounding_box)
+
+        if len(parts) == 1:
+            part_info = parts[list(parts.keys())[0]]
+            if part_info.bounding_box is None:
+                part_info.bounding_box = extents
+            return part_info
+        else:
+            return parts
+
 
 class GeoWriter:
 
@@ -106,13 +196,17 @@ class GeoWriter:
         text.append(f'node_id {element_id}')
 
         # write parts
-        for i, (part_description, part_mesh) in enumerate(mesh.items()):
-            text.extend(self._add_part(i + 1, part_description, part_mesh.points,
-                                       part_mesh.cells))
+        with stage('geo.format_parts'):
+            for i, (part_description, part_mesh) in enumerate(mesh.items()):
+                text.extend(self._add_part(i + 1, part_description, part_mesh.points,
+                                           part_mesh.cells))
+            text = '\n'.join(self._process_text(text))
 
         # write file
-        with open(filename, 'w') as file:
-            file.write('\n'.join(self._process_text(text)))
+        with stage('geo.write_file') as stage_:
+            with open(filename, 'w') as file:
+                file.write(text)
+            stage_.add(bytes_written=os.path.getsize(filename))
 
     def _get_default_description(self):
         return ['yamio generated file', '']
@@ -155,6 +249,108 @@ class GeoWriter:
         return [str(elem) if type(elem) is not list else ' '.join([str(e) for e in elem]) for elem in text]
 
 
+_BINARY_HEADER = b'c binary'
+_STRING_SIZE = 80  # binary strings
+
+
+class _AsciiBlocks:
+    """Reads ASCII headers and skips blocks (file opened in binary mode).
+
+    Notes:
+        A block of `n` rows is seeked if its first, middle and last rows
+        have the same width (i.e. fixed width). Otherwise, it is skipped
+        line by line.
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def read_string(self):
+        """Gets next stripped line or `None` if end of file.
+        """
+        line = self.file.readline()
+        return line.decode('utf-8', 'replace').strip() if line else None
+
+    def read_int(self):
+        return int(self.file.readline())
+
+    def read_extents(self):
+        return np.array([self.file.readline().split() for _ in range(3)],
+                        dtype=float).T
+
+    def read_bounds(self, n_values):
+        values = np.array(list(islice(self.file, n_values)), dtype=float)
+        return values.min(), values.max()
+
+    def skip_rows(self, n_rows, n_values=1, is_float=False):
+        # one row per line (coordinates are one line per value)
+        n_lines = n_rows * n_values if is_float else n_rows
+        if n_lines == 0:
+            return
+
+        start = self.file.tell()
+        width = len(self.file.readline())
+        if self._is_fixed_width(start, width, n_lines):
+            self.file.seek(start + n_lines * width)
+        else:
+            self.file.seek(start)
+            deque(islice(self.file, n_lines), maxlen=0)
+
+    def _is_fixed_width(self, start, width, n_lines):
+        for index in (n_lines // 2, n_lines - 1):
+            if not index:
+                continue
+
+            self.file.seek(start + index * width - 1)
+            previous, line = self.file.read(1), self.file.readline()
+            if previous != b'\n' or len(line) != width or not line.endswith(b'\n'):
+                return False
+
+        return True
+
+
+class _BinaryBlocks:
+    """Reads `C Binary` headers and seeks blocks.
+
+    Notes:
+        Strings have 80 characters, integers and floats 4 bytes (native
+        byte order).
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def read_string(self):
+        data = self.file.read(_STRING_SIZE)
+        if not data:
+            return None
+
+        return data.decode('utf-8', 'replace').strip('\x00 ').strip()
+
+    def read_int(self):
+        return int(np.frombuffer(self.file.read(4), dtype=np.int32)[0])
+
+    def read_extents(self):
+        return np.frombuffer(self.file.read(24), dtype=np.float32).astype(float).reshape(3, 2).T
+
+    def read_bounds(self, n_values, chunk_size=2**20):
+        bounds = [np.inf, -np.inf]
+        for start in range(0, n_values, chunk_size):
+            n_chunk = min(chunk_size, n_values - start)
+            values = np.frombuffer(self.file.read(4 * n_chunk), dtype=np.float32)
+            bounds = [min(bounds[0], values.min()), max(bounds[1], values.max())]
+
+        return float(bounds[0]), float(bounds[1])
+
+    def skip_rows(self, n_rows, n_values=1, is_float=False):
+        self.file.seek(4 * n_rows * n_values, 1)
+
+
+def _has_ids(line):
+    # `given` and `ignore` ids are stored in the file
+    return line.split()[-1] in ('given', 'ignore')
+
+
 def get_conns_regex(with_groups=False):
     """
     Notes:
@@ -0,0 +1,373 @@
+"""Vectorized geometric quantities of cells.
+
+Notes:
+    Higher order cells are handled through their corner nodes (meshio orders
+    corner nodes first).
+
+    Volumes of 3d cells are computed with the divergence theorem over
+    triangulated faces (quad faces are split around their centroid), which
+    is exact for tetrahedra and for polyhedra with planar faces. Centroids
+    follow the same decomposition (triangles or tetrahedra around the mean
+    of the corner nodes).
+"""
+
+import numpy as np
+
+
+CELL_DIM = {'vertex': 0,
+            'line': 1,
+            'line3': 1,
+            'triangle': 2,
+            'triangle6': 2,
+            'quad': 2,
+            'quad8': 2,
+            'quad9': 2,
+            'tetra': 3,
+            'tetra10': 3,
+            'pyramid': 3,
+            'pyramid13': 3,
+            'wedge': 3,
+            'wedge15': 3,
+            'hexahedron': 3,
+            'hexahedron20': 3,
+            'hexahedron27': 3}
+
+# linear type of each type
+CORNER_TYPE = {'vertex': 'vertex',
+               'line': 'line',
+               'line3': 'line',
+               'triangle': 'triangle',
+               'triangle6': 'triangle',
+               'quad': 'quad',
+               'quad8': 'quad',
+               'quad9': 'quad',
+               'tetra': 'tetra',
+               'tetra10': 'tetra',
+               'pyramid': 'pyramid',
+               'pyramid13': 'pyramid',
+               'wedge': 'wedge',
+               'wedge15': 'wedge',
+               'hexahedron': 'hexahedron',
+               'hexahedron20': 'hexahedron',
+               'hexahedron27': 'hexahedron'}
+
+N_CORNERS = {'vertex': 1,
+             'line': 2,
+             'triangle': 3,
+             'quad': 4,
+             'tetra': 4,
+             'pyramid': 5,
+             'wedge': 6,
+             'hexahedron': 8}
+
+# outward oriented faces (edges for 2d cells) of positively oriented cells
+CELL_FACES = {
+    'triangle': [('line', [0, 1]), ('line', [1, 2]), ('line', [2, 0])],
+    'quad': [('line', [0, 1]), ('line', [1, 2]), ('line', [2, 3]), ('line', [3, 0])],
+    'tetra': [('triangle', [0, 2, 1]), ('triangle', [0, 1, 3]),
+              ('triangle', [1, 2, 3]), ('triangle', [0, 3, 2])],
+    'pyramid': [('quad', [0, 3, 2, 1]), ('triangle', [0, 1, 4]),
+                ('triangle', [1, 2, 4]), ('triangle', [2, 3, 4]),
+                ('triangle', [3, 0, 4])],
+    'wedge': [('triangle', [0, 2, 1]), ('triangle', [3, 4, 5]),
+              ('quad', [0, 1, 4, 3]), ('quad', [1, 2, 5, 4]),
+              ('quad', [2, 0, 3, 5])],
+    'hexahedron': [('quad', [0, 3, 2, 1]), ('quad', [4, 5, 6, 7]),
+                   ('quad', [0, 1, 5, 4]), ('quad', [1, 2, 6, 5]),
+                   ('quad', [2, 3, 7, 6]), ('quad', [3, 0, 4, 7])],
+}
+
+# node permutation that flips orientation
+FLIP_ORIENTATION = {'line': [1, 0],
+                    'triangle': [0, 2, 1],
+                    'quad': [0, 3, 2, 1],
+                    'tetra': [0, 2, 1, 3],
+                    'pyramid': [0, 3, 2, 1, 4],
+                    'wedge': [0, 2, 1, 3, 5, 4],
+                    'hexahedron': [0, 3, 2, 1, 4, 7, 6, 5],
+                    # higher order (mid nodes follow their edges/faces)
+                    'line3': [1, 0, 2],
+                    'triangle6': [0, 2, 1, 5, 4, 3],
+                    'quad8': [0, 3, 2, 1, 7, 6, 5, 4],
+                    'quad9': [0, 3, 2, 1, 7, 6, 5, 4, 8],
+                    'tetra10': [0, 2, 1, 3, 6, 5, 4, 7, 9, 8],
+                    'pyramid13': [0, 3, 2, 1, 4, 8, 7, 6, 5, 9, 12, 11, 10],
+                    'wedge15': [0, 2, 1, 3, 5, 4, 8, 7, 6, 11, 10, 9, 12, 14, 13],
+                    'hexahedron20': [0, 3, 2, 1, 4, 7, 6, 5, 11, 10, 9, 8, 15, 14, 13, 12,
+                                     16, 19, 18, 17],
+                    'hexahedron27': [0, 3, 2, 1, 4, 7, 6, 5, 11, 10, 9, 8, 15, 14, 13, 12,
+                                     16, 19, 18, 17, 22, 23, 20, 21, 24, 25, 26]}
+
+# split of cells in simplices (hexahedra around diagonal 0-6)
+SIMPLEX_SPLITS = {'line': [[0, 1]],
+                  'triangle': [[0, 1, 2]],
+                  'quad': [[0, 1, 2], [0, 2, 3]],
+                  'tetra': [[0, 1, 2, 3]],
+                  'pyramid': [[0, 1, 2, 4], [0, 2, 3, 4]],
+                  'wedge': [[0, 1, 2, 3], [1, 2, 3, 4], [2, 3, 4, 5]],
+                  'hexahedron': [[0, 1, 2, 6], [0, 2, 3, 6], [0, 3, 7, 6],
+                                 [0, 7, 4, 6], [0, 4, 5, 6], [0, 5, 1, 6]]}
+
+DEFAULT_CHUNK_SIZE = 2**18
+
+
+def get_corner_conns(conns, elem_type):
+    return conns[:, :N_CORNERS[CORNER_TYPE[elem_type]]]
+
+
+def is_planar_mesh(points):
+    """Checks if points are 2d (possibly padded with a constant z).
+    """
+    if points.shape[1] == 2:
+        return True
+
+    # empty meshes (nothing to compare)
+    return points.shape[1] == 3 and (len(points) == 0 or np.ptp(points[:, 2]) == 0)
+
+
+def get_cell_measures(points, conns, elem_type, signed=True,
+                      chunk_size=DEFAULT_CHUNK_SIZE):
+    """Gets lengths, areas or volumes of cells.
+
+    Args:
+        points (np.array, shape=[n_points, dim])
+        conns (np.array, shape=[n_cells, n_nodes])
+        elem_type (str): meshio cell type.
+        signed (bool): Whether to keep the orientation sign. Areas are only
+            signed for planar meshes (lengths are never signed).
+        chunk_size (int): Number of cells evaluated at once (bounds memory).
+
+    Returns:
+        np.array, shape=[n_cells]
+    """
+    corner_type = CORNER_TYPE[elem_type]
+    conns = get_corner_conns(np.asarray(conns), elem_type)
+    is_planar = is_planar_mesh(points)
+
+    measures = np.empty(len(conns))
+    for start in range(0, len(conns), chunk_size):
+        coords = points[conns[start:start + chunk_size]]
+        measures[start:start + chunk_size] = _get_measures(
+            coords, corner_type, is_planar=is_planar)
+
+    return measures if signed else np.abs(measures)
+
+
+def get_cell_centroids(points, conns, elem_type, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Gets centroids (centers of mass) of cells.
+
+    Returns:
+        np.array, shape=[n_cells, dim]
+
+    Notes:
+        Mean of corner nodes for cells with null measure.
+    """
+    corner_type = CORNER_TYPE[elem_type]
+    conns = get_corner_conns(np.asarray(conns), elem_type)
+
+    centroids = np.empty((len(conns), points.shape[1]))
+    for start in range(0, len(conns), chunk_size):
+        coords = points[conns[start:start + chunk_size]]
+        centroids[start:start + chunk_size] = _get_centroids(coords, corner_type)
+
+    return centroids
+
+
+def get_area_vectors(points, conns, elem_type, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Gets area vectors (area times unit normal) of faces.
+
+    Args:
+        elem_type (str): meshio cell type of 1d (planar meshes only) or 2d
+            cells.
+
+    Returns:
+        np.array, shape=[n_cells, dim]
+
+    Notes:
+        Normals follow node order: counterclockwise polygons point to +z and
+        lines point to the right of their direction (i.e. outward for edges
+        of counterclockwise polygons).
+    """
+    corner_type = CORNER_TYPE[elem_type]
+    dim = CELL_DIM[corner_type]
+    if dim == 1 and not is_planar_mesh(points):
+        raise Exception('Normals of lines are only defined in planar meshes')
+    if dim not in (1, 2):
+        raise Exception(f'Cannot compute area vectors of {elem_type}')
+
+    conns = get_corner_conns(np.asarray(conns), elem_type)
+
+    area_vectors = np.zeros((len(conns), points.shape[1]))
+    for start in range(0, len(conns), chunk_size):
+        coords = points[conns[start:start + chunk_size]]
+        if dim == 1:
+            tangents = coords[:, 1, :2] - coords[:, 0, :2]
+            area_vectors[start:start + chunk_size, 0] = tangents[:, 1]
+            area_vectors[start:start + chunk_size, 1] = -tangents[:, 0]
+        elif coords.shape[-1] == 2:
+            raise Exception(f'Cannot compute area vectors of {elem_type} in 2d')
+        else:
+            area_vectors[start:start + chunk_size] = _get_polygon_vector_areas(coords)
+
+    return area_vectors
+
+
+def get_barycentric_coords(coords, points):
+    """Gets barycentric coordinates of points in simplices.
+
+    Args:
+        coords (np.array, shape=[n, dim + 1, dim]): Simplices coordinates.
+        points (np.array, shape=[n, dim])
+
+    Returns:
+        np.array, shape=[n, dim + 1]: `-inf` for degenerate simplices.
+    """
+    dim = points.shape[1]
+    edges = coords[:, 1:] - coords[:, [0]]
+    vectors = points - coords[:, 0]
+
+    if dim == 1:
+        det = edges[:, 0, 0]
+        weights = vectors[:, [0]] / np.where(det != 0., det, 1.)[:, None]
+    elif dim == 2:
+        det = edges[:, 0, 0] * edges[:, 1, 1] - edges[:, 0, 1] * edges[:, 1, 0]
+        weights = np.stack([vectors[:, 0] * edges[:, 1, 1] - vectors[:, 1] * edges[:, 1, 0],
+                            edges[:, 0, 0] * vectors[:, 1] - edges[:, 0, 1] * vectors[:, 0]],
+                           axis=1) / np.where(det != 0., det, 1.)[:, None]
+    else:
+        normals = [_cross(edges[:, 1], edges[:, 2]), _cross(edges[:, 2], edges[:, 0]),
+                   _cross(edges[:, 0], edges[:, 1])]
+        det = np.einsum('ij,ij->i', edges[:, 0], normals[0])
+        weights = np.stack([np.einsum('ij,ij->i', vectors, normal) for normal in normals],
+                           axis=1) / np.where(det != 0., det, 1.)[:, None]
+
+    weights = np.c_[1. - weights.sum(axis=1), weights]
+    weights[det == 0.] = -np.inf
+
+    return weights
+
+
+def _get_measures(coords, corner_type, is_planar=False):
+    """Gets measures from cell coordinates (shape=[n_cells, n_nodes, dim]).
+    """
+    dim = CELL_DIM[corner_type]
+
+    if dim == 0:
+        return np.zeros(len(coords))
+
+    if dim == 1:
+        return np.linalg.norm(coords[:, 1] - coords[:, 0], axis=1)
+
+    if dim == 2:
+        vector_areas = _get_polygon_vector_areas(coords)
+        if vector_areas.ndim == 1:
+            return vector_areas
+        if is_planar:
+            return vector_areas[:, 2]
+        return np.linalg.norm(vector_areas, axis=1)
+
+    return _get_volumes(coords, corner_type)
+
+
+def _get_polygon_vector_areas(coords):
+    """Gets area vectors of polygons (scalar areas if 2d coordinates).
+
+    Notes:
+        Shoelace formula, i.e. exact for planar polygons.
+    """
+    next_coords = np.roll(coords, -1, axis=1)
+    if coords.shape[-1] == 2:
+        return 0.5 * np.sum(coords[..., 0] * next_coords[..., 1]
+                            - coords[..., 1] * next_coords[..., 0], axis=1)
+
+    return 0.5 * sum(_cross(coords[:, k], next_coords[:, k])
+                     for k in range(coords.shape[1]))
+
+
+def _get_volumes(coords, corner_type):
+    # relative coordinates for accuracy
+    coords = coords - coords.mean(axis=1, keepdims=True)
+
+    if corner_type == 'tetra':
+        edges = coords[:, 1:] - coords[:, [0]]
+        return np.linalg.det(edges) / 6.
+
+    volumes = np.zeros(len(coords))
+    for face_type, face in CELL_FACES[corner_type]:
+        face_coords = coords[:, face]
+        if face_type == 'triangle':
+            volumes += _dot(face_coords[:, 0],
+                            _cross(face_coords[:, 1], face_coords[:, 2]))
+        else:
+            # sum over triangles around centroid: centroid . (2 * area vector)
+            centroid = face_coords.mean(axis=1)
+            volumes += _dot(centroid, _cross(face_coords[:, 2] - face_coords[:, 0],
+                                             face_coords[:, 3] - face_coords[:, 1]))
+
+    return volumes / 6.
+
+
+def _get_centroids(coords, corner_type):
+    """Gets centroids from cell coordinates (shape=[n_cells, n_nodes, dim]).
+    """
+    dim = CELL_DIM[corner_type]
+    mean_coords = coords.mean(axis=1)
+
+    if dim < 2 or corner_type == 'tetra':
+        return mean_coords
+
+    # relative coordinates for accuracy
+    coords = coords - mean_coords[:, None]
+
+    if dim == 2:
+        # triangles around mean (weighted by signed area along cell normal)
+        next_coords = np.roll(coords, -1, axis=1)
+        if coords.shape[-1] == 2:
+            tri_areas = coords[..., 0] * next_coords[..., 1] \
+                - coords[..., 1] * next_coords[..., 0]
+        else:
+            tri_vector_areas = np.stack(
+                [_cross(coords[:, k], next_coords[:, k])
+                 for k in range(coords.shape[1])], axis=1)
+            tri_areas = np.einsum('ikj,ij->ik', tri_vector_areas,
+                                  tri_vector_areas.sum(axis=1))
+        weighted = np.einsum('ik,ikj->ij', tri_areas, coords + next_coords) / 3.
+        weights = tri_areas.sum(axis=1)
+    else:
+        # tetrahedra between mean and (triangulated) faces
+        weighted = np.zeros_like(mean_coords)
+        weights = np.zeros(len(coords))
+        for face_type, face in CELL_FACES[corner_type]:
+            face_coords = coords[:, face]
+            if face_type == 'triangle':
+                triangles = [face_coords]
+            else:
+                face_centroid = face_coords.mean(axis=1, keepdims=True)
+                next_face_coords = np.roll(face_coords, -1, axis=1)
+                triangles = [np.concatenate(
+                    [face_centroid, face_coords[:, [k]], next_face_coords[:, [k]]],
+                    axis=1) for k in range(face_coords.shape[1])]
+
+            for tri_coords in triangles:
+                volumes = _dot(tri_coords[:, 0],
+                               _cross(tri_coords[:, 1], tri_coords[:, 2]))
+                weighted += volumes[:, None] * tri_coords.sum(axis=1) / 4.
+                weights += volumes
+
+    is_null = weights == 0.
+    weights[is_null] = 1.
+    centroids = weighted / weights[:, None]
+    centroids[is_null] = 0.
+
+    return centroids + mean_coords
+
+
+def _cross(a, b):
+    # faster than np.cross for (n, 3) arrays
+    return np.stack([a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1],
+                     a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2],
+                     a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]], axis=1)
+
+
+def _dot(a, b):
+    return np.einsum('ij,ij->i', a, b)
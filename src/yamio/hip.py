@@ -15,6 +15,15 @@ from pyhip.commands.operations import hip_exit
 from pyhip.hipster import pyhip_cmd
 
 import yamio
+from yamio.bnd_patches import (
+    BoundaryPatches,
+    get_patch_node_groups,
+)
+from yamio.info import (
+    MeshInfo,
+    get_dataset_bounds,
+)
+from yamio.profiling import stage
 
 
 # TODO: extend to mixed case
@@ -37,12 +46,45 @@ class HipReader:
         h5_filename = '.'.join(filename.split('.')[:-1]) + '.h5'
 
         with h5py.File(h5_filename, 'r') as h5_file:
-            cells = self._get_cells(h5_file)
-            points = self._get_points(h5_file)
-            bnd_patches = self._get_bnd_patches(h5_file)
+            with stage('hip.read_cells'):
+                cells = self._get_cells(h5_file)
+            with stage('hip.read_points'):
+                points = self._get_points(h5_file)
+            with stage('hip.read_bnd_patches'):
+                bnd_patches = self._get_bnd_patches(h5_file)
 
         return yamio.Mesh(points, cells, bnd_patches=bnd_patches)
 
+    def read_info(self, filename, compute_bbox=False):
+        """Reads mesh info from dataset shapes (arrays are not loaded).
+
+        Args:
+            compute_bbox (bool): If `True`, coordinates are scanned in chunks
+                to get the bounding box.
+        """
+        h5_filename = '.'.join(filename.split('.')[:-1]) + '.h5'
+
+        with h5py.File(h5_filename, 'r') as h5_file:
+            axes = list(h5_file['Coordinates'].keys())
+            n_points = h5_file[f'Coordinates/{axes[0]}'].shape[0]
+
+            cells = []
+            for conns_name, dataset in h5_file['Connectivity'].items():
+                if not conns_name.endswith('->node'):
+                    continue
+                elem_type = hip_to_meshio_type[conns_name.split('-')[0]]
+                cells.append((elem_type, dataset.shape[0] // num_nodes_per_cell[elem_type]))
+
+            bnd_patches = self._get_bnd_patches_info(h5_file)
+
+            bounding_box = None
+            if compute_bbox:
+                bounding_box = np.array(
+                    [get_dataset_bounds(h5_file[f'Coordinates/{axis}']) for axis in axes]).T
+
+        return MeshInfo(n_points, len(axes), cells, bnd_patches=bnd_patches,
+                        bounding_box=bounding_box)
+
     def _get_cells(self, h5_file):
         conns_basename = 'Connectivity'
         conns_name = list(h5_file[conns_basename].keys())[0]
@@ -55,18 +97,27 @@ class HipReader:
 
     def _read_conns(self, h5_file, conns_path, elem_type):
         n_nodes_cell = num_nodes_per_cell[elem_type]
-        conns = np.array(h5_file[conns_path][()].reshape(-1, n_nodes_cell),
-                         dtype=int)
+        with stage('hip.read_h5') as stage_:
+            conns = np.array(h5_file[conns_path][()].reshape(-1, n_nodes_cell),
+                             dtype=int)
+            stage_.add(bytes_read=h5_file[conns_path].nbytes)
+
         return self._get_corrected_conns(conns, elem_type)
 
     def _get_points(self, h5_file):
         coords_basename = 'Coordinates'
         axes = list(h5_file[coords_basename].keys())
-        return np.array([h5_file[f'{coords_basename}/{axis}'][()] for axis in axes]).T
+        with stage('hip.read_h5') as stage_:
+            datasets = [h5_file[f'{coords_basename}/{axis}'] for axis in axes]
+            points = np.array([dataset[()] for dataset in datasets]).T
+            stage_.add(bytes_read=sum(dataset.nbytes for dataset in datasets))
+
+        return points
 
     def _get_corrected_conns(self, conns, elem_type):
-        conns = correct_cell_conns_reading.get(elem_type, lambda x: x)(conns)
-        conns -= 1  # correct initial index
+        with stage('hip.correct_conns'):
+            conns = correct_cell_conns_reading.get(elem_type, lambda x: x)(conns)
+            conns -= 1  # correct initial index
 
         return conns
 
@@ -89,15 +140,35 @@ class HipReader:
         # get patch labels
         patch_labels = [name.decode('utf-8').strip() for name in h5_file[f'{bnd_basename}/PatchLabels'][()]]
 
-        # organize patches
+        # patches are views of conns (same layout as hip)
         last_indices = h5_file[f'{bnd_basename}/bnd_{hip_elem_type}_lidx'][()]
-        fidx = 0
-        bnd_patches = {}
-        for patch_label, lidx in zip(patch_labels, last_indices):
-            bnd_patches[patch_label] = meshio.CellBlock(elem_type, conns[fidx:lidx])
-            fidx = lidx
 
-        return bnd_patches
+        return BoundaryPatches(conns, last_indices, patch_labels, cell_type=elem_type)
+
+    def _get_bnd_patches_info(self, h5_file):
+        bnd_basename = 'Boundary'
+        if bnd_basename not in h5_file or 'PatchLabels' not in h5_file[bnd_basename]:
+            return {}
+
+        # faces are preferred over nodes
+        lidx_name, elem_type = None, None
+        for name in h5_file[bnd_basename].keys():
+            if name.startswith('bnd_') and name.endswith('->node'):
+                hip_elem_type = name.split('-')[0].split('_')[1]
+                lidx_name = f'bnd_{hip_elem_type}_lidx'
+                elem_type = hip_to_meshio_type[hip_elem_type]
+                break
+        else:
+            if 'bnode_lidx' not in h5_file[bnd_basename]:
+                return {}
+            lidx_name = 'bnode_lidx'
+
+        patch_labels = [name.decode('utf-8').strip() for name in h5_file[f'{bnd_basename}/PatchLabels'][()]]
+        last_indices = h5_file[f'{bnd_basename}/{lidx_name}'][()]
+        sizes = np.diff(last_indices, prepend=0)
+
+        return {patch_label: (elem_type, int(size))
+                for patch_label, size in zip(patch_labels, sizes)}
 
 
 class HipWriter:
@@ -116,39 +187,45 @@ class HipWriter:
         file_basename = filename.split('.')[0]
 
         tmp_filename = f'{file_basename}_tmp.mesh.h5'
-        with h5py.File(tmp_filename, 'w') as h5_file:
-
-            # write mesh topology (conns)
-            self._write_conns(h5_file, mesh)
-
-            # write mesh coordinates
-            self._write_coords(h5_file, mesh)
-
-            # write boundary data (only in h5 file)
-            if not hasattr(mesh, 'bnd_patches') or not mesh.bnd_patches:
-                h5_file.create_group('Boundary')
-                pre_read_commands.append('set check 0')
-            else:
-                self._write_bnd_patches(h5_file, mesh.bnd_patches)
-
-        # use pyhip to complete the file
-        for command in pre_read_commands:
-            pyhip_cmd(command)
-        read_hdf5_mesh(tmp_filename)
-        for command in commands:
-            pyhip_cmd(command)
-        write_hdf5(file_basename)
-        hip_exit()
-
-        # delete tmp file
-        os.remove(tmp_filename)
+        try:
+            with stage('hip.write_h5') as stage_, h5py.File(tmp_filename, 'w') as h5_file:
+
+                # write mesh topology (conns)
+                self._write_conns(h5_file, mesh)
+
+                # write mesh coordinates
+                self._write_coords(h5_file, mesh)
+
+                # write boundary data (only in h5 file)
+                if not hasattr(mesh, 'bnd_patches') or not mesh.bnd_patches:
+                    h5_file.create_group('Boundary')
+                    pre_read_commands.append('set check 0')
+                else:
+                    self._write_bnd_patches(h5_file, mesh.bnd_patches)
+
+                stage_.add(bytes_written=_get_h5_nbytes(h5_file))
+
+            # use pyhip to complete the file
+            with stage('hip.pyhip'):
+                for command in pre_read_commands:
+                    pyhip_cmd(command)
+                read_hdf5_mesh(tmp_filename)
+                for command in commands:
+                    pyhip_cmd(command)
+                write_hdf5(file_basename)
+                hip_exit()
+        finally:
+            # delete tmp file (also if cancelled, see `yamio.aio`)
+            if os.path.exists(tmp_filename):
+                os.remove(tmp_filename)
 
     def _write_conns(self, h5_file, mesh):
         # ignores mixed case
         elem_type = mesh.cells[0].type
-        conns = mesh.cells[0].data.copy()
-        conns = correct_cell_conns_writing.get(elem_type, lambda x: x)(conns)
-        conns += 1
+        with stage('hip.correct_conns'):
+            conns = mesh.cells[0].data.copy()
+            conns = correct_cell_conns_writing.get(elem_type, lambda x: x)(conns)
+            conns += 1
 
         hip_elem_type = meshio_to_hip_type[elem_type]
         h5_path = f'/Connectivity/{hip_elem_type}->node'
@@ -166,18 +243,10 @@ class HipWriter:
             Only writes to Boundary and let's hip take care of everything else.
         """
 
-        # collect info
-        patch_labels = list(bnd_patches.keys())
-        bnd_node_groups = []
-        for patch_nodes in bnd_patches.values():
-            if isinstance(patch_nodes, meshio.CellBlock):
-                bnd_node_groups.append(np.unique(patch_nodes.data.ravel()))
-            else:
-                bnd_node_groups.append(patch_nodes)
-
-        nodes = np.concatenate(bnd_node_groups, axis=0)
-        group_dims = np.cumsum([len(node_groups) for node_groups in bnd_node_groups],
-                               dtype=int)
+        # collect info (all patches at once)
+        with stage('hip.collect_bnd_nodes'):
+            patch_labels = list(bnd_patches.keys())
+            nodes, group_dims = get_patch_node_groups(bnd_patches)
 
         # write to h5
         h5_file.create_dataset('Boundary/PatchLabels', data=patch_labels,
@@ -186,6 +255,17 @@ class HipWriter:
         h5_file.create_dataset('Boundary/bnode_lidx', data=group_dims)
 
 
+def _get_h5_nbytes(h5_file):
+    nbytes = []
+
+    def visit(name, obj):
+        if isinstance(obj, h5py.Dataset):
+            nbytes.append(obj.nbytes)
+
+    h5_file.visititems(visit)
+    return sum(nbytes)
+
+
 def _correct_tetra_conns_reading(cells):
     new_cells = cells.copy()
     new_cells[:, [1, 2]] = new_cells[:, [2, 1]]
@@ -0,0 +1,110 @@
+"""Lightweight mesh inspection.
+
+Notes:
+    Readers fill `MeshInfo` from file metadata only (e.g. dataset shapes or
+    part headers), i.e. coordinates and connectivities are not loaded.
+"""
+
+import numpy as np
+import meshio
+
+
+class MeshInfo:
+    """Summary of a mesh.
+
+    Args:
+        n_points (int)
+        dim (int): Number of coordinates per point.
+        cells (list of tuple): `(elem_type, n_cells)` for each cell block.
+        bnd_patches (dict): `(elem_type, size)` for each patch. `elem_type`
+            is `None` if the patch is defined by nodes.
+        bounding_box (np.array, shape=[2, dim]): Minimum and maximum
+            coordinates. `None` if not available.
+    """
+
+    def __init__(self, n_points, dim, cells, bnd_patches=None,
+                 bounding_box=None):
+        self.n_points = n_points
+        self.dim = dim
+        self.cells = cells
+        self.bnd_patches = bnd_patches if bnd_patches is not None else {}
+        self.bounding_box = bounding_box
+
+    @classmethod
+    def from_mesh(cls, mesh):
+        """Gets info from an already loaded mesh.
+
+        Notes:
+            Used as fallback for formats without a header-only reader.
+        """
+        points = mesh.points
+        cells = [(cell_block.type, len(cell_block)) for cell_block in mesh.cells]
+
+        bnd_patches = {}
+        for patch_name, patch_nodes in getattr(mesh, 'bnd_patches', {}).items():
+            elem_type = patch_nodes.type if isinstance(patch_nodes, meshio.CellBlock) else None
+            bnd_patches[patch_name] = (elem_type, len(patch_nodes))
+
+        bounding_box = None
+        if len(points):
+            bounding_box = np.array([points.min(axis=0), points.max(axis=0)])
+
+        return cls(points.shape[0], points.shape[1], cells,
+                   bnd_patches=bnd_patches, bounding_box=bounding_box)
+
+    @property
+    def n_cells(self):
+        return sum(n_cells for _, n_cells in self.cells)
+
+    def to_dict(self):
+        bounding_box = None
+        if self.bounding_box is not None:
+            bounding_box = np.asarray(self.bounding_box).tolist()
+
+        return {'n_points': self.n_points,
+                'dim': self.dim,
+                'cells': [list(cell_info) for cell_info in self.cells],
+                'bnd_patches': {name: list(patch_info) for name, patch_info in self.bnd_patches.items()},
+                'bounding_box': bounding_box}
+
+    def __repr__(self):
+        lines = ["<yamio mesh info>",
+                 f"  Number of points: {self.n_points}",
+                 f"  Dimension: {self.dim}"]
+
+        if self.cells:
+            lines.append("  Number of cells:")
+            for elem_type, n_cells in self.cells:
+                lines.append(f"    {elem_type}: {n_cells}")
+
+        if self.bnd_patches:
+            lines.append("  Boundary patches:")
+            for patch_name, (elem_type, size) in self.bnd_patches.items():
+                if elem_type is not None:
+                    lines.append(f"    {patch_name} ({elem_type}): {size}")
+                else:
+                    lines.append(f"    {patch_name}: {size}")
+
+        if self.bounding_box is not None:
+            min_coords, max_coords = self.bounding_box
+            lines.append(f"  Bounding box: {min_coords} - {max_coords}")
+
+        return "\n".join(lines)
+
+
+def get_dataset_bounds(dataset, chunk_size=2**20):
+    """Gets min and max along first axis of a `h5py` dataset.
+
+    Notes:
+        Dataset is read in chunks of `chunk_size` rows to bound memory.
+    """
+    min_values, max_values = None, None
+    for start in range(0, dataset.shape[0], chunk_size):
+        values = dataset[start:start + chunk_size]
+        if min_values is None:
+            min_values, max_values = values.min(axis=0), values.max(axis=0)
+        else:
+            min_values = np.minimum(min_values, values.min(axis=0))
+            max_values = np.maximum(max_values, values.max(axis=0))
+
+    return min_values, max_values
@@ -1,7 +1,20 @@
 
+import hashlib
+
 import numpy as np
 import meshio
 
+from yamio.geometry import DEFAULT_CHUNK_SIZE
+from yamio.spatial import DEFAULT_QUERY_CHUNK_SIZE
+from yamio.mesh_diff import diff_meshes
+from yamio.mesh_geometry import MeshGeometry
+from yamio.mesh_renumbering import renumber_mesh
+from yamio.mesh_search import MeshSpatialIndex
+from yamio.mesh_validation import (
+    validate_mesh,
+    repair_mesh,
+)
+
 
 class Mesh(meshio.Mesh):
     """See base class.
@@ -21,6 +34,9 @@ class Mesh(meshio.Mesh):
         super().__init__(points, cells, **kwargs)
         self.bnd_patches = bnd_patches if bnd_patches is not None else {}
 
+        self._fingerprints = {}
+        self._derived = {}
+
     def __repr__(self):
         lines = []
         repr_str = super().__repr__()
@@ -36,39 +52,260 @@ class Mesh(meshio.Mesh):
 
         return repr_str + "\n".join(lines)
 
+    def __getstate__(self):
+        # caches are recomputed on demand (not pickled)
+        state = self.__dict__.copy()
+        state.pop('_fingerprints', None)
+        state.pop('_derived', None)
+
+        return state
+
     def __eq__(self, other):
         # only points, cells and bnd_patches are verified
+        if not isinstance(other, Mesh):
+            return NotImplemented
+
+        # cheap checks first (full fingerprint hashes all points)
+        if self.points.shape != other.points.shape:
+            return False
 
-        # verify points
-        if not np.allclose(self.points, other.points):
+        if self._get_topology_fingerprint() != other._get_topology_fingerprint():
             return False
 
-        # verify cells (assumes same order of cells blocks)
-        for cells, other_cells in zip(self.cells, other.cells):
-            if cells.type != other_cells.type:
-                return False
+        # fingerprints are cached
+        if self.fingerprint() == other.fingerprint():
+            return True
 
-            if not np.array_equal(cells.data, other_cells.data):
-                return False
+        # topology is equal (cells and bnd_patches): verify points
+        return np.allclose(self.points, other.points)
 
-        # verify bnd_patches
-        # TODO: improve
-        self_keys = set(self.bnd_patches.keys())
-        other_keys = set(other.bnd_patches.keys())
-        if self_keys != other_keys:
-            return False
+    def __hash__(self):
+        # consistent with `__eq__` (points are compared with tolerance)
+        return hash((self._get_topology_fingerprint(), self.points.shape))
+
+    def diff(self, other, atol=1e-8):
+        """Compares with other mesh independently of numbering and ordering.
+
+        Returns:
+            yamio.mesh_diff.MeshDiff
+        """
+        return diff_meshes(self, other, atol=atol)
+
+    def validate(self, rtol=1e-10):
+        """Checks orientation, degeneracy, indices and boundary patches.
+
+        Returns:
+            yamio.mesh_validation.ValidationReport
+        """
+        return validate_mesh(self, rtol=rtol)
+
+    def repair(self, report=None):
+        """Reorients inverted cells in place.
+
+        Returns:
+            int: Number of reoriented cells.
+        """
+        return repair_mesh(self, report=report)
+
+    def renumber(self, method='rcm'):
+        """Renumbers nodes and cells in place (e.g. before writing).
+
+        Args:
+            method (str): `rcm`, `morton` or `hilbert`.
+
+        Returns:
+            yamio.mesh_renumbering.RenumberingReport
+        """
+        return renumber_mesh(self, method=method)
+
+    def partition(self, n_parts, method='rcb'):
+        """Splits mesh in partitions with local numbering.
+
+        Args:
+            method (str): `rcb` or `graph`.
+
+        Returns:
+            list of yamio.mesh_partitioning.MeshPartition
+        """
+        # avoids circular import (partitions are yamio meshes)
+        from yamio.mesh_partitioning import partition_mesh
+
+        return partition_mesh(self, n_parts, method=method)
+
+    def to_shared_memory(self):
+        """Copies arrays to shared memory (e.g. to hand off to workers).
+
+        Returns:
+            yamio.mesh_sharing.SharedMesh: Context manager owning the block
+                (pass its `descriptor` to `yamio.mesh_sharing.attach_mesh`).
+        """
+        from yamio.mesh_sharing import export_mesh
+
+        return export_mesh(self)
+
+    def get_geometry(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Gets cached geometric quantities of cells and boundary patches.
+
+        Returns:
+            yamio.mesh_geometry.MeshGeometry
+
+        Notes:
+            Recreated if points, cells or bnd_patches are reassigned, but not
+            if arrays are modified in place (use `clear_cache`). Replaced
+            arrays are referenced until then (see `fingerprint`).
+        """
+        return self._get_derived(
+            ('geometry', chunk_size), lambda: MeshGeometry(self, chunk_size=chunk_size))
+
+    def get_spatial_index(self, chunk_size=DEFAULT_QUERY_CHUNK_SIZE):
+        """Gets cached spatial index (point location and nearest nodes).
+
+        Returns:
+            yamio.mesh_search.MeshSpatialIndex
+
+        Notes:
+            Built lazily on first query. Invalidated as `get_geometry`.
+        """
+        return self._get_derived(
+            ('spatial_index', chunk_size),
+            lambda: MeshSpatialIndex(self, chunk_size=chunk_size))
+
+    def fingerprint(self, decimals=None):
+        """Gets content hash of points, cells and bnd_patches.
 
-        for key in self_keys:
-            self_patch = self.bnd_patches[key]
-            other_patch = other.bnd_patches[key]
-            if type(self_patch) != type(other_patch):
-                return False
+        Args:
+            decimals (int): If given, coordinates are rounded before hashing
+                (e.g. to deduplicate meshes with round-off differences).
+                Notice coordinates near rounding boundaries may still differ.
 
-            if isinstance(self_patch, meshio.CellBlock):
-                if not np.array_equal(self_patch.data, other_patch.data):
-                    return False
+        Returns:
+            str: Hexadecimal digest.
+
+        Notes:
+            Raw array memory is hashed. Results are cached and recomputed
+            if points, cells or bnd_patches are reassigned, but not if arrays
+            are modified in place (use `clear_fingerprints`).
+
+            Cached results reference the arrays they were computed from,
+            i.e. replaced arrays are kept alive until the next cache lookup
+            (stale entries are then dropped) or `clear_cache`.
+
+            Order of boundary patches does not matter.
+        """
+        return self._get_cached_fingerprint(
+            ('mesh', decimals), lambda: self._compute_fingerprint(decimals))
+
+    def clear_fingerprints(self):
+        self._fingerprints = {}
+
+    def clear_cache(self):
+        """Clears fingerprints, geometry and spatial index (e.g. after in
+        place changes or to release replaced arrays).
+        """
+        self.clear_fingerprints()
+        self._derived = {}
+
+    def _get_topology_fingerprint(self):
+        return self._get_cached_fingerprint(('topology', None),
+                                            self._compute_topology_fingerprint)
+
+    def _get_cached_fingerprint(self, key, compute):
+        # e.g. objects not created through `__init__`
+        fingerprints = self.__dict__.setdefault('_fingerprints', {})
+
+        state = self._get_state()
+        cached = fingerprints.get(key)
+        if cached is not None and _is_same_state(cached[0], state):
+            return cached[1]
+
+        # stale entries reference replaced arrays
+        for other_key in [other_key for other_key, (other_state, _) in fingerprints.items()
+                          if not _is_same_state(other_state, state)]:
+            del fingerprints[other_key]
+
+        digest = compute()
+        fingerprints[key] = (state, digest)
+
+        return digest
+
+    def _get_derived(self, key, create):
+        # objects computed from the mesh (one per kind)
+        derived = self.__dict__.setdefault('_derived', {})
+
+        state = self._get_state()
+        cached = derived.get(key[0])
+        if cached is not None and cached[0] == key and _is_same_state(cached[1], state):
+            return cached[2]
+
+        for kind in [kind for kind, (_, other_state, _) in derived.items()
+                     if not _is_same_state(other_state, state)]:
+            del derived[kind]
+
+        obj = create()
+        derived[key[0]] = (key, state, obj)
+
+        return obj
+
+    def _get_state(self):
+        """Gets arrays and their description (to invalidate cached data).
+
+        Notes:
+            Arrays are referenced (not their `id`, which may be reused once
+            they are garbage collected) and compared by identity.
+        """
+        objs = [self.points]
+        keys = [self.points.shape]
+        for cell_block in self.cells:
+            objs.extend([cell_block, cell_block.data])
+            keys.append(cell_block.type)
+        for patch_name, patch_nodes in self.bnd_patches.items():
+            data = patch_nodes.data if isinstance(patch_nodes, meshio.CellBlock) else patch_nodes
+            objs.extend([patch_nodes, data])
+            keys.append(patch_name)
+
+        return objs, keys
+
+    def _compute_fingerprint(self, decimals):
+        points = np.asarray(self.points, dtype=float)
+        if decimals is not None:
+            points = np.round(points, decimals) + 0.  # avoids -0.
+
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(self._get_topology_fingerprint().encode('utf-8'))
+        _update_hash(hasher, points)
+
+        return hasher.hexdigest()
+
+    def _compute_topology_fingerprint(self):
+        hasher = hashlib.blake2b(digest_size=16)
+
+        hasher.update(f'{len(self.cells)}'.encode('utf-8'))
+        for cell_block in self.cells:
+            hasher.update(cell_block.type.encode('utf-8'))
+            _update_hash(hasher, np.asarray(cell_block.data, dtype=np.int64))
+
+        for patch_name in sorted(self.bnd_patches.keys()):
+            patch_nodes = self.bnd_patches[patch_name]
+            hasher.update(patch_name.encode('utf-8'))
+            if isinstance(patch_nodes, meshio.CellBlock):
+                hasher.update(f'cells:{patch_nodes.type}'.encode('utf-8'))
+                _update_hash(hasher, np.asarray(patch_nodes.data, dtype=np.int64))
             else:
-                if not np.array_equal(self_patch, other_patch):
-                    return False
+                hasher.update(b'nodes')
+                _update_hash(hasher, np.asarray(patch_nodes, dtype=np.int64))
+
+        return hasher.hexdigest()
+
+
+def _is_same_state(state, other_state):
+    objs, keys = state
+    other_objs, other_keys = other_state
+
+    return keys == other_keys and len(objs) == len(other_objs) and all(
+        obj is other_obj for obj, other_obj in zip(objs, other_objs))
+
 
-        return True
+def _update_hash(hasher, array):
+    array = np.ascontiguousarray(array)
+    hasher.update(f'{array.dtype.str}{array.shape}'.encode('utf-8'))
+    hasher.update(memoryview(array).cast('B'))
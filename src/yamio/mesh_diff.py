@@ -0,0 +1,385 @@
+"""Permutation-invariant comparison of meshes.
+
+Notes:
+    Nodes are matched by coordinates within an absolute tolerance (in each
+    coordinate) using a spatial hash (sort and binary search), i.e. without
+    pairwise distances. Cells and boundary patches are then compared in the
+    numbering of the other mesh, ignoring cell blocks order, cell order and
+    rotations of cells (node orderings describing the same oriented cell).
+    Cells that only differ in orientation are reported as reoriented.
+"""
+
+import itertools
+
+import numpy as np
+import meshio
+
+from yamio.geometry import (
+    CELL_FACES,
+    CORNER_TYPE,
+    FLIP_ORIENTATION,
+    N_CORNERS,
+)
+from yamio.mesh_utils import group_rows
+from yamio.spatial import (
+    SortedKeys,
+    UniformGrid,
+    pad_points,
+)
+
+
+class MeshDiff:
+    """Structured report of differences between two meshes.
+
+    Args:
+        node_map (np.array): Index in `other` of each point of `mesh`
+            (-1 if unmatched).
+        unmatched_other_points (np.array): Indices of points of `other` that
+            are not matched.
+        cells (dict): `(n_only_in_mesh, n_only_in_other)` for each cell type.
+        bnd_patches (dict): `(n_only_in_mesh, n_only_in_other)` for each
+            common patch (cells or nodes, depending on patch kind).
+        patches_only_in_mesh (list)
+        patches_only_in_other (list)
+        patches_with_different_type (list)
+        reoriented_cells (dict): Number of cells of each cell type that
+            exist in both meshes with opposite orientation (not counted in
+            `cells`).
+        reoriented_patch_faces (dict): Same as `reoriented_cells` for each
+            common face patch.
+    """
+
+    def __init__(self, node_map, unmatched_other_points, cells, bnd_patches,
+                 patches_only_in_mesh=(), patches_only_in_other=(),
+                 patches_with_different_type=(), reoriented_cells=None,
+                 reoriented_patch_faces=None):
+        self.node_map = node_map
+        self.unmatched_other_points = unmatched_other_points
+        self.cells = cells
+        self.bnd_patches = bnd_patches
+        self.patches_only_in_mesh = list(patches_only_in_mesh)
+        self.patches_only_in_other = list(patches_only_in_other)
+        self.patches_with_different_type = list(patches_with_different_type)
+        self.reoriented_cells = reoriented_cells or {}
+        self.reoriented_patch_faces = reoriented_patch_faces or {}
+
+    @property
+    def unmatched_points(self):
+        return np.flatnonzero(self.node_map < 0)
+
+    @property
+    def is_renumbered(self):
+        return not np.array_equal(self.node_map, np.arange(len(self.node_map)))
+
+    @property
+    def is_equal(self):
+        """Whether meshes are equal up to numbering, ordering and rotations
+        of cells (orientation matters).
+        """
+        if len(self.unmatched_points) or len(self.unmatched_other_points):
+            return False
+
+        if self.patches_only_in_mesh or self.patches_only_in_other \
+                or self.patches_with_different_type:
+            return False
+
+        if any(self.reoriented_cells.values()) or any(self.reoriented_patch_faces.values()):
+            return False
+
+        counts = list(self.cells.values()) + list(self.bnd_patches.values())
+        return all(n_mesh == 0 and n_other == 0 for n_mesh, n_other in counts)
+
+    def __bool__(self):
+        # truthy if there are differences
+        return not self.is_equal
+
+    def __repr__(self):
+        lines = [f"<yamio mesh diff> ({'equal' if self.is_equal else 'different'})",
+                 f"  Renumbered: {self.is_renumbered}",
+                 f"  Unmatched points: {len(self.unmatched_points)} "
+                 f"(other: {len(self.unmatched_other_points)})"]
+
+        lines.append("  Cells (only in mesh, only in other):")
+        for elem_type, (n_mesh, n_other) in self.cells.items():
+            lines.append(f"    {elem_type}: {n_mesh}, {n_other}")
+
+        if self.bnd_patches:
+            lines.append("  Boundary patches (only in mesh, only in other):")
+            for patch_name, (n_mesh, n_other) in self.bnd_patches.items():
+                lines.append(f"    {patch_name}: {n_mesh}, {n_other}")
+
+        for title, counts in (('Reoriented cells', self.reoriented_cells),
+                              ('Reoriented patch faces', self.reoriented_patch_faces)):
+            counts = {name: count for name, count in counts.items() if count}
+            if counts:
+                lines.append(f"  {title}:")
+                lines.extend(f"    {name}: {count}" for name, count in counts.items())
+
+        for title, names in (('only in mesh', self.patches_only_in_mesh),
+                             ('only in other', self.patches_only_in_other),
+                             ('with different type', self.patches_with_different_type)):
+            if names:
+                lines.append(f"  Patches {title}: {', '.join(names)}")
+
+        return "\n".join(lines)
+
+
+def diff_meshes(mesh, other, atol=1e-8):
+    """Compares meshes independently of node numbering and cells order.
+
+    Args:
+        mesh (yamio.Mesh or meshio.Mesh)
+        other (yamio.Mesh or meshio.Mesh)
+        atol (float): Absolute tolerance in each coordinate.
+
+    Returns:
+        MeshDiff
+    """
+    node_map = match_points(mesh.points, other.points, atol=atol)
+
+    matched_other = np.zeros(len(other.points), dtype=bool)
+    matched_other[node_map[node_map >= 0]] = True
+    unmatched_other_points = np.flatnonzero(~matched_other)
+
+    cells, reoriented_cells = {}, {}
+    mesh_cells, other_cells = _get_cells_by_type(mesh.cells), _get_cells_by_type(other.cells)
+    for elem_type in list(mesh_cells.keys()) + [key for key in other_cells if key not in mesh_cells]:
+        mesh_conns = _map_conns(mesh_cells.get(elem_type), node_map)
+        other_conns = other_cells.get(elem_type)
+        *cells[elem_type], reoriented_cells[elem_type] = _count_different_rows(
+            mesh_conns, other_conns, elem_type)
+        cells[elem_type] = tuple(cells[elem_type])
+
+    mesh_patches = getattr(mesh, 'bnd_patches', {})
+    other_patches = getattr(other, 'bnd_patches', {})
+
+    bnd_patches, reoriented_patch_faces = {}, {}
+    patches_with_different_type = []
+    for patch_name in mesh_patches.keys() & other_patches.keys():
+        mesh_patch, other_patch = mesh_patches[patch_name], other_patches[patch_name]
+        if _get_patch_type(mesh_patch) != _get_patch_type(other_patch):
+            patches_with_different_type.append(patch_name)
+            continue
+
+        if isinstance(mesh_patch, meshio.CellBlock):
+            *counts, reoriented_patch_faces[patch_name] = _count_different_rows(
+                _map_conns(mesh_patch.data, node_map), other_patch.data, mesh_patch.type)
+            bnd_patches[patch_name] = tuple(counts)
+        else:
+            mesh_nodes = np.unique(node_map[np.asarray(mesh_patch, dtype=int)])
+            other_nodes = np.unique(other_patch)
+            bnd_patches[patch_name] = (
+                len(np.setdiff1d(mesh_nodes, other_nodes, assume_unique=True)),
+                len(np.setdiff1d(other_nodes, mesh_nodes, assume_unique=True)))
+
+    return MeshDiff(
+        node_map, unmatched_other_points, cells, bnd_patches,
+        patches_only_in_mesh=[name for name in mesh_patches if name not in other_patches],
+        patches_only_in_other=[name for name in other_patches if name not in mesh_patches],
+        patches_with_different_type=patches_with_different_type,
+        reoriented_cells=reoriented_cells,
+        reoriented_patch_faces=reoriented_patch_faces)
+
+
+def match_points(points, other_points, atol=1e-8):
+    """Matches points by coordinates.
+
+    Returns:
+        np.array: Index in `other_points` of each point (-1 if unmatched).
+
+    Notes:
+        Points of lower dimension are padded with zero coordinates (e.g. 2d
+        mesh and its 3d `.geo` round-trip).
+
+        Points are binned in a grid with spacing not smaller than `atol`.
+        Each point is looked up (binary search on sorted bin keys) in its bin
+        and, if unmatched, in neighbouring bins. Matching is one-to-one.
+    """
+    points, other_points = pad_points([points, other_points])
+    node_map = np.full(len(points), -1, dtype=np.int64)
+
+    if len(points) == 0 or len(other_points) == 0:
+        return node_map
+
+    grid = UniformGrid.from_points([points, other_points], spacing=atol)
+    sorted_keys = SortedKeys(grid, other_points)
+    is_taken = np.zeros(len(other_points), dtype=bool)
+
+    bins = grid.get_bins(points)
+    for offset in grid.get_neighbour_offsets():
+        unmatched = np.flatnonzero(node_map < 0)
+        if len(unmatched) == 0:
+            break
+
+        for query, candidate in sorted_keys.iter_candidates(bins[unmatched] + offset):
+            query = unmatched[query]
+
+            is_close = np.all(np.abs(points[query] - other_points[candidate]) <= atol, axis=1)
+            is_free = (node_map[query] < 0) & ~is_taken[candidate] & is_close
+            query, candidate = query[is_free], candidate[is_free]
+
+            # one-to-one
+            candidate, first = np.unique(candidate, return_index=True)
+            query = query[first]
+
+            node_map[query] = candidate
+            is_taken[candidate] = True
+
+    return node_map
+
+
+def _get_cells_by_type(cells):
+    conns_by_type = {}
+    for cell_block in cells:
+        conns_by_type.setdefault(cell_block.type, []).append(cell_block.data)
+
+    return {elem_type: np.concatenate(conns, axis=0)
+            for elem_type, conns in conns_by_type.items()}
+
+
+def _get_patch_type(patch_nodes):
+    if isinstance(patch_nodes, meshio.CellBlock):
+        return patch_nodes.type
+
+    return None
+
+
+def _map_conns(conns, node_map):
+    if conns is None:
+        return None
+
+    mapped_conns = node_map[conns]
+    # cells with unmatched nodes never match
+    mapped_conns[np.any(mapped_conns < 0, axis=1)] = -1
+
+    return mapped_conns
+
+
+def _count_different_rows(conns, other_conns, elem_type=None):
+    """Counts cells of each array not present in the other.
+
+    Returns:
+        tuple: Number of cells only in `conns`, only in `other_conns` and
+            of cells of `conns` present with opposite orientation.
+
+    Notes:
+        Rotations of cells are ignored (see `_get_canonical_rows`).
+    """
+    if conns is None or other_conns is None:
+        return (0 if conns is None else len(conns),
+                0 if other_conns is None else len(other_conns), 0)
+
+    conns, other_conns = np.asarray(conns), np.asarray(other_conns)
+
+    is_matched, is_other_matched = _match_rows(
+        _get_canonical_rows(conns, elem_type), _get_canonical_rows(other_conns, elem_type))
+
+    # unmatched cells may only be flipped
+    n_reoriented = 0
+    if elem_type in FLIP_ORIENTATION and not (is_matched.all() or is_other_matched.all()):
+        conns, other_conns = conns[~is_matched], other_conns[~is_other_matched]
+        is_flipped, is_other_flipped = _match_rows(
+            _get_canonical_rows(conns[:, FLIP_ORIENTATION[elem_type]], elem_type),
+            _get_canonical_rows(other_conns, elem_type))
+
+        n_reoriented = int(is_flipped.sum())
+        is_matched = is_flipped
+        is_other_matched = is_other_flipped
+
+    return (int((~is_matched).sum()), int((~is_other_matched).sum()), n_reoriented)
+
+
+def _match_rows(rows, other_rows):
+    """Checks which rows of each array exist in the other.
+    """
+    group_ids, counts = group_rows(np.concatenate([rows, other_rows], axis=0))
+    mesh_ids, other_ids = group_ids[:len(rows)], group_ids[len(rows):]
+    n_mesh = np.bincount(mesh_ids, minlength=len(counts))
+
+    return counts[mesh_ids] > n_mesh[mesh_ids], n_mesh[other_ids] > 0
+
+
+def _get_canonical_rows(conns, elem_type):
+    """Gets same row for all node orderings of the same oriented cell.
+
+    Notes:
+        Corner nodes are rotated to the smallest (lexicographic) ordering
+        among the orientation preserving symmetries of the cell. Other
+        nodes (higher order cells) are sorted. Unknown types are sorted.
+    """
+    corner_type = CORNER_TYPE.get(elem_type)
+    if corner_type is None:
+        return np.sort(conns, axis=1)
+
+    n_corners = N_CORNERS[corner_type]
+    corners, others = conns[:, :n_corners], conns[:, n_corners:]
+
+    canonical = corners
+    rows = np.arange(len(corners))
+    for rotation in _get_rotations(corner_type)[1:]:
+        rotated = corners[:, rotation]
+        is_different = rotated != canonical
+        first = np.argmax(is_different, axis=1)
+        is_smaller = is_different[rows, first] & (rotated[rows, first] < canonical[rows, first])
+        canonical = np.where(is_smaller[:, None], rotated, canonical)
+
+    return np.concatenate([canonical, np.sort(others, axis=1)], axis=1)
+
+
+_ROTATIONS = {}
+
+
+def _get_rotations(corner_type):
+    """Gets orientation preserving symmetries of a linear cell (identity
+    first).
+
+    Notes:
+        A symmetry maps each oriented face (edge for 2d cells) to a face
+        with the same orientation. Permutations are built from the images
+        of the first face.
+    """
+    if corner_type in _ROTATIONS:
+        return _ROTATIONS[corner_type]
+
+    n_corners = N_CORNERS[corner_type]
+    identity = list(range(n_corners))
+    if corner_type not in CELL_FACES:
+        _ROTATIONS[corner_type] = [identity]
+        return _ROTATIONS[corner_type]
+
+    faces = CELL_FACES[corner_type]
+    face_keys = {_get_face_key(face_type, face) for face_type, face in faces}
+
+    first_type, first_face = faces[0]
+    remaining = [node for node in identity if node not in first_face]
+
+    rotations = []
+    for face_type, face in faces:
+        if face_type != first_type:
+            continue
+
+        image_remaining = [node for node in identity if node not in face]
+        for shift in range(len(face)):
+            image = face[shift:] + face[:shift]
+            for image_rest in itertools.permutations(image_remaining):
+                rotation = np.empty(n_corners, dtype=int)
+                rotation[first_face] = image
+                rotation[remaining] = image_rest
+                if all(_get_face_key(other_type, rotation[other_face]) in face_keys
+                       for other_type, other_face in faces):
+                    rotations.append(rotation)
+
+    rotations.sort(key=lambda rotation: not np.array_equal(rotation, identity))
+    _ROTATIONS[corner_type] = rotations
+
+    return rotations
+
+
+def _get_face_key(face_type, face):
+    # oriented face (lines are not rotated)
+    face = [int(node) for node in face]
+    if face_type == 'line':
+        return tuple(face)
+
+    start = face.index(min(face))
+    return tuple(face[start:] + face[:start])
@@ -0,0 +1,167 @@
+"""Synthetic structured meshes.
+
+Notes:
+    Used for testing and benchmarking. Boundary patches are named after the
+    box sides (`x_min`, `x_max`, `y_min`, ...) and faces point outwards.
+"""
+
+import itertools
+
+import numpy as np
+import meshio
+
+import yamio
+
+
+DIM_BY_TYPE = {'triangle': 2,
+               'quad': 2,
+               'tetra': 3,
+               'hexahedron': 3}
+
+# number of cells generated per structured cell
+_CELLS_PER_BOX = {'triangle': 2,
+                  'quad': 1,
+                  'tetra': 6,
+                  'hexahedron': 1}
+
+_AXES_NAMES = ('x', 'y', 'z')
+
+
+def get_box_mesh(n_cells, elem_type='hexahedron', lengths=1.):
+    """Gets box mesh with approximately `n_cells` cells.
+
+    Args:
+        n_cells (int): Target number of cells.
+        elem_type (str): One of `DIM_BY_TYPE` keys.
+        lengths (float or array-like): Box lengths.
+    """
+    dim = DIM_BY_TYPE[elem_type]
+    n_boxes = max(n_cells / _CELLS_PER_BOX[elem_type], 1)
+    n_divisions = max(int(round(n_boxes ** (1 / dim))), 1)
+
+    return get_structured_box(n_divisions, elem_type=elem_type, lengths=lengths)
+
+
+def get_structured_box(n_divisions, elem_type='hexahedron', lengths=1.):
+    """Gets structured box mesh.
+
+    Args:
+        n_divisions (int or array-like): Number of divisions per axis.
+        elem_type (str): One of `DIM_BY_TYPE` keys.
+        lengths (float or array-like): Box lengths.
+
+    Returns:
+        yamio.Mesh
+    """
+    dim = DIM_BY_TYPE[elem_type]
+    n_divisions = np.broadcast_to(n_divisions, (dim,)).astype(int)
+    lengths = np.broadcast_to(lengths, (dim,)).astype(float)
+
+    # node ids (first axis varies fastest)
+    node_ids = np.arange(np.prod(n_divisions + 1)).reshape(n_divisions + 1, order='F')
+
+    axes_coords = [np.linspace(0., length, n + 1)
+                   for length, n in zip(lengths, n_divisions)]
+    points = np.stack([coords.ravel(order='F') for coords in
+                       np.meshgrid(*axes_coords, indexing='ij')], axis=1)
+
+    corners = _get_box_corners(node_ids, dim)
+    cells = [meshio.CellBlock(elem_type, _split_box(corners, elem_type))]
+
+    bnd_patches = {}
+    for axis in range(dim):
+        for side, name in ((0, 'min'), (-1, 'max')):
+            bnd_patches[f'{_AXES_NAMES[axis]}_{name}'] = meshio.CellBlock(
+                *_get_side_faces(node_ids, axis, side, elem_type))
+
+    return yamio.Mesh(points, cells, bnd_patches=bnd_patches)
+
+
+def _get_box_corners(node_ids, dim):
+    """Gets corners of structured cells following meshio's quad/hexahedron order.
+    """
+    offsets_2d = [(0, 0), (1, 0), (1, 1), (0, 1)]
+    if dim == 2:
+        offsets = offsets_2d
+    else:
+        offsets = [offset + (k,) for k in (0, 1) for offset in offsets_2d]
+
+    n_divisions = np.array(node_ids.shape) - 1
+    corners = []
+    for offset in offsets:
+        slices = tuple(slice(o, n + o) for o, n in zip(offset, n_divisions))
+        corners.append(node_ids[slices].ravel(order='F'))
+
+    return np.stack(corners, axis=1)
+
+
+def _get_side_faces(node_ids, axis, side, elem_type):
+    """Gets outward oriented faces (or edges in 2d) of a box side.
+    """
+    side_ids = np.take(node_ids, side, axis=axis)
+
+    if side_ids.ndim == 1:
+        faces = np.stack([side_ids[:-1], side_ids[1:]], axis=1)
+        # counter-clockwise boundary
+        outward_flip = (axis == 0 and side == 0) or (axis == 1 and side == -1)
+    else:
+        # remaining axes in cyclic order, so (u, v) normal is along +axis
+        if axis == 1:
+            side_ids = side_ids.T
+        faces = _get_box_corners(side_ids, 2)
+        outward_flip = side == 0
+
+    face_type, faces = _split_face(faces, elem_type)
+    if outward_flip:
+        faces = faces[:, ::-1]
+
+    return face_type, faces
+
+
+def _split_box(corners, elem_type):
+    if elem_type in ('quad', 'hexahedron'):
+        return corners
+
+    if elem_type == 'triangle':
+        return _split_quad(corners)
+
+    # Kuhn subdivision: conforming between neighbours (all diagonals start
+    # at the min corner)
+    bits_to_corner = {(0, 0, 0): 0, (1, 0, 0): 1, (1, 1, 0): 2, (0, 1, 0): 3,
+                      (0, 0, 1): 4, (1, 0, 1): 5, (1, 1, 1): 6, (0, 1, 1): 7}
+    tets = []
+    for perm in itertools.permutations(range(3)):
+        bits = np.zeros(3, dtype=int)
+        tet = [bits_to_corner[tuple(bits)]]
+        for axis in perm:
+            bits[axis] = 1
+            tet.append(bits_to_corner[tuple(bits)])
+
+        # positive volume
+        if _is_odd_permutation(perm):
+            tet[1], tet[2] = tet[2], tet[1]
+        tets.append(corners[:, tet])
+
+    return np.concatenate(tets, axis=0)
+
+
+def _split_face(faces, elem_type):
+    if elem_type in ('triangle', 'quad'):
+        return 'line', faces
+
+    if elem_type == 'hexahedron':
+        return 'quad', faces
+
+    return 'triangle', _split_quad(faces)
+
+
+def _split_quad(quads):
+    """Splits quads along the diagonal starting at first node.
+    """
+    return np.r_[quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]]
+
+
+def _is_odd_permutation(perm):
+    n_inversions = sum(1 for i, j in itertools.combinations(range(len(perm)), 2)
+                       if perm[i] > perm[j])
+    return n_inversions % 2 == 1
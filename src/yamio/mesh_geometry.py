@@ -0,0 +1,204 @@
+"""Cached geometric quantities of meshes.
+
+Examples:
+    ```python
+    geometry = mesh.get_geometry()
+
+    volume = sum(volumes.sum() for volumes in geometry.cell_measures)
+    flux = geometry.get_patch_flux('wall', face_velocities)
+    ```
+
+Notes:
+    Quantities are computed per cell block (or boundary patch) on first
+    access, in chunks of `chunk_size` cells (see `yamio.geometry`).
+
+    Boundary patches given as nodes (instead of `meshio.CellBlock`) are
+    ignored.
+"""
+
+import numpy as np
+import meshio
+
+from yamio.geometry import (
+    CELL_DIM,
+    CELL_FACES,
+    CORNER_TYPE,
+    DEFAULT_CHUNK_SIZE,
+    get_area_vectors,
+    get_cell_centroids,
+    get_cell_measures,
+    get_corner_conns,
+)
+from yamio.mesh_utils import (
+    get_boundary_faces,
+    match_rows,
+)
+from yamio.profiling import stage
+
+
+class MeshGeometry:
+    """Geometric quantities of cells and boundary patches.
+
+    Args:
+        mesh (yamio.Mesh or meshio.Mesh)
+        chunk_size (int): Number of cells evaluated at once (bounds memory).
+
+    Notes:
+        Arrays are not recomputed if the mesh changes (prefer
+        `yamio.Mesh.get_geometry`, which handles invalidation).
+    """
+
+    def __init__(self, mesh, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.mesh = mesh
+        self.chunk_size = chunk_size
+
+        self._cache = {}
+
+    @property
+    def cell_measures(self):
+        """Lengths, areas or volumes of cells (list, one array per cell block).
+
+        Notes:
+            Signed (see `yamio.geometry.get_cell_measures`).
+        """
+        return self._get_cached('cell_measures', lambda: [
+            get_cell_measures(self.mesh.points, cell_block.data, cell_block.type,
+                              chunk_size=self.chunk_size)
+            for cell_block in self.mesh.cells])
+
+    @property
+    def cell_centroids(self):
+        """Centroids of cells (list, one array per cell block).
+        """
+        return self._get_cached('cell_centroids', lambda: [
+            get_cell_centroids(self.mesh.points, cell_block.data, cell_block.type,
+                               chunk_size=self.chunk_size)
+            for cell_block in self.mesh.cells])
+
+    @property
+    def patch_area_vectors(self):
+        """Outward area vectors of patch faces (dict).
+        """
+        return self._get_cached('patch_area_vectors', self._compute_patch_area_vectors)
+
+    @property
+    def patch_areas(self):
+        """Areas (lengths in 2d) of patch faces (dict).
+        """
+        return self._get_cached('patch_areas', lambda: {
+            patch_name: np.linalg.norm(area_vectors, axis=1)
+            for patch_name, area_vectors in self.patch_area_vectors.items()})
+
+    @property
+    def patch_normals(self):
+        """Outward unit normals of patch faces (dict).
+        """
+        def compute():
+            normals = {}
+            for patch_name, area_vectors in self.patch_area_vectors.items():
+                areas = self.patch_areas[patch_name]
+                normals[patch_name] = area_vectors / np.where(areas > 0., areas, 1.)[:, None]
+            return normals
+
+        return self._get_cached('patch_normals', compute)
+
+    @property
+    def patch_centroids(self):
+        """Centroids of patch faces (dict).
+        """
+        return self._get_cached('patch_centroids', lambda: {
+            patch_name: get_cell_centroids(self.mesh.points, patch_nodes.data,
+                                           patch_nodes.type, chunk_size=self.chunk_size)
+            for patch_name, patch_nodes in self._get_face_patches().items()})
+
+    def get_patch_flux(self, patch_name, values):
+        """Integrates values over a boundary patch.
+
+        Args:
+            values (np.array): Face values, either scalar (shape=[n_faces])
+                or vector (shape=[n_faces, dim], normal component is integrated).
+
+        Returns:
+            float
+        """
+        values = np.asarray(values)
+        if values.ndim == 1:
+            return float(np.dot(values, self.patch_areas[patch_name]))
+
+        area_vectors = self.patch_area_vectors[patch_name]
+        return float(np.einsum('ij,ij->', values[:, :area_vectors.shape[1]], area_vectors))
+
+    def clear(self):
+        self._cache = {}
+
+    def _get_cached(self, key, compute):
+        if key not in self._cache:
+            with stage(f'geometry.{key}'):
+                self._cache[key] = compute()
+
+        return self._cache[key]
+
+    def _get_face_patches(self):
+        return {patch_name: patch_nodes
+                for patch_name, patch_nodes in getattr(self.mesh, 'bnd_patches', {}).items()
+                if isinstance(patch_nodes, meshio.CellBlock)}
+
+    def _compute_patch_area_vectors(self):
+        face_patches = self._get_face_patches()
+        if not face_patches:
+            return {}
+
+        points = self.mesh.points
+        volume_cells, bnd_faces = self._get_bnd_faces()
+
+        area_vectors = {}
+        for patch_name, patch_nodes in face_patches.items():
+            patch_area_vectors = get_area_vectors(points, patch_nodes.data,
+                                                  patch_nodes.type,
+                                                  chunk_size=self.chunk_size)
+
+            # orient outward using owner cell (faces off boundary are kept)
+            face_type = CORNER_TYPE[patch_nodes.type]
+            if face_type in bnd_faces:
+                faces, block_indices, cell_indices = bnd_faces[face_type]
+                conns = get_corner_conns(np.asarray(patch_nodes.data), patch_nodes.type)
+                bnd_index = match_rows(conns, faces)
+
+                is_matched = bnd_index >= 0
+                owner_centroids = self._get_owner_centroids(
+                    volume_cells, block_indices[bnd_index[is_matched]],
+                    cell_indices[bnd_index[is_matched]])
+
+                face_centroids = self.patch_centroids[patch_name][is_matched]
+                is_inward = np.einsum('ij,ij->i', patch_area_vectors[is_matched],
+                                      face_centroids - owner_centroids) < 0.
+                patch_area_vectors[np.flatnonzero(is_matched)[is_inward]] *= -1.
+
+            area_vectors[patch_name] = patch_area_vectors
+
+        return area_vectors
+
+    def _get_bnd_faces(self):
+        max_dim = max((CELL_DIM.get(cell_block.type, -1) for cell_block in self.mesh.cells),
+                      default=-1)
+        volume_cells = [cell_block for cell_block in self.mesh.cells
+                        if CELL_DIM.get(cell_block.type) == max_dim
+                        and CORNER_TYPE[cell_block.type] in CELL_FACES]
+        if not volume_cells:
+            return volume_cells, {}
+
+        return volume_cells, get_boundary_faces(volume_cells, return_owners=True,
+                                                chunk_size=self.chunk_size)
+
+    def _get_owner_centroids(self, volume_cells, block_indices, cell_indices):
+        centroids = np.empty((len(cell_indices), self.mesh.points.shape[1]))
+        for block_index, cell_block in enumerate(volume_cells):
+            is_block = block_indices == block_index
+            if not is_block.any():
+                continue
+
+            centroids[is_block] = get_cell_centroids(
+                self.mesh.points, cell_block.data[cell_indices[is_block]],
+                cell_block.type, chunk_size=self.chunk_size)
+
+        return centroids
@@ -0,0 +1,106 @@
+"""Merging of meshes (e.g. Ensight parts) with welding of coincident nodes.
+
+Examples:
+    ```python
+    parts = yamio.read('mesh.geo')  # dict of part meshes
+    mesh = merge_meshes(parts, atol=1e-10)
+    ```
+"""
+
+import numpy as np
+import meshio
+
+from yamio.geometry import CELL_DIM
+from yamio.mesh import Mesh
+from yamio.profiling import stage
+from yamio.spatial import (
+    get_merged_point_map,
+    pad_points,
+)
+
+
+def merge_meshes(meshes, atol=1e-8):
+    """Concatenates meshes and welds nodes closer than `atol`.
+
+    Args:
+        meshes (dict or list or meshio.Mesh): Named parts (e.g. output of
+            `GeoReader.read`), meshes or a single mesh (e.g. single part
+            `.geo` file).
+        atol (float): Absolute tolerance in each coordinate.
+
+    Returns:
+        yamio.Mesh
+
+    Notes:
+        If named parts are given, cells of parts of highest dimension become
+        cells and cells of other parts become `bnd_patches` (named after the
+        part, suffixed with the cell type if the part has several cell
+        blocks).
+
+        Points of lower dimension are padded with zero coordinates (e.g. 2d
+        and 3d parts).
+
+        Boundary patches of the given meshes are kept (names must not clash).
+        Point data is kept if available in all meshes (values of the first
+        welded node are kept). Cell data is ignored.
+    """
+    if isinstance(meshes, meshio.Mesh):
+        meshes = [meshes]
+
+    if isinstance(meshes, dict):
+        part_names, meshes = list(meshes.keys()), list(meshes.values())
+    else:
+        part_names, meshes = [None] * len(meshes), list(meshes)
+
+    if not meshes:
+        raise Exception('No meshes to merge')
+
+    with stage('merge.weld_points'):
+        points = np.concatenate(pad_points([mesh.points for mesh in meshes]))
+        node_map, kept_points = get_merged_point_map(points, atol)
+        offsets = np.cumsum([0] + [len(mesh.points) for mesh in meshes])
+
+    with stage('merge.remap_cells'):
+        max_dim = max(CELL_DIM.get(cell_block.type, -1)
+                      for mesh in meshes for cell_block in mesh.cells)
+
+        cells = []
+        bnd_patches = {}
+        for part_name, mesh, offset in zip(part_names, meshes, offsets):
+            part_node_map = node_map[offset:offset + len(mesh.points)]
+
+            is_patch = part_name is not None and all(
+                CELL_DIM.get(cell_block.type, -1) < max_dim for cell_block in mesh.cells)
+            for cell_block in mesh.cells:
+                remapped_block = meshio.CellBlock(cell_block.type,
+                                                  part_node_map[cell_block.data])
+                if not is_patch:
+                    cells.append(remapped_block)
+                    continue
+
+                patch_name = part_name if len(mesh.cells) == 1 else f'{part_name}_{cell_block.type}'
+                _add_patch(bnd_patches, patch_name, remapped_block)
+
+            for patch_name, patch_nodes in getattr(mesh, 'bnd_patches', {}).items():
+                if isinstance(patch_nodes, meshio.CellBlock):
+                    patch_nodes = meshio.CellBlock(patch_nodes.type,
+                                                   part_node_map[patch_nodes.data])
+                else:
+                    patch_nodes = np.unique(part_node_map[np.asarray(patch_nodes, dtype=int)])
+                _add_patch(bnd_patches, patch_name, patch_nodes)
+
+    point_data = {}
+    common_names = set.intersection(*[set(mesh.point_data.keys()) for mesh in meshes])
+    for name in [name for name in meshes[0].point_data if name in common_names]:
+        point_data[name] = np.concatenate(
+            [mesh.point_data[name] for mesh in meshes])[kept_points]
+
+    return Mesh(points[kept_points], cells, bnd_patches=bnd_patches,
+                point_data=point_data)
+
+
+def _add_patch(bnd_patches, patch_name, patch_nodes):
+    if patch_name in bnd_patches:
+        raise Exception(f'Repeated boundary patch: {patch_name}')
+
+    bnd_patches[patch_name] = patch_nodes
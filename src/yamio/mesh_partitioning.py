@@ -0,0 +1,309 @@
+"""Domain partitioning and parallel writing of partitions.
+
+Examples:
+    ```python
+    partitions = mesh.partition(8)
+    write_partitions(partitions, 'mesh_{}.mesh.xmf', max_workers=4)
+    ```
+
+Notes:
+    Cells are partitioned. Nodes of cells of different partitions are
+    duplicated (interface nodes) and owned by the lowest partition sharing
+    them (non-owned copies are ghost nodes).
+
+    Methods:
+        * `rcb`: recursive coordinate bisection of cell centers (mean of
+          their nodes) along the largest extent.
+        * `graph`: contiguous chunks of cells sorted by reverse
+          Cuthill-McKee order of their nodes (breadth-first, i.e. connected
+          and compact partitions).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import meshio
+
+from yamio.geometry import (
+    CELL_DIM,
+    CELL_FACES,
+    CORNER_TYPE,
+    get_corner_conns,
+)
+from yamio.mesh import Mesh
+from yamio.mesh_renumbering import (
+    _get_unique_sorted,
+    get_node_graph,
+    get_rcm_order,
+)
+from yamio.mesh_utils import (
+    get_boundary_faces,
+    match_rows,
+)
+from yamio.profiling import stage
+
+
+PARTITIONING_METHODS = ('rcb', 'graph')
+
+
+class MeshPartition:
+    """Partition of a mesh with local numbering.
+
+    Args:
+        mesh (yamio.Mesh): Local mesh (with its share of data and patches).
+        index (int): Partition index.
+        nodes (np.array): Global index of each local node.
+        cells (list): Global cell indices of each (global) cell block.
+        node_owners (np.array): Partition owning each local node.
+        interfaces (dict): Local indices of nodes shared with each
+            neighbour partition.
+    """
+
+    def __init__(self, mesh, index, nodes, cells, node_owners, interfaces):
+        self.mesh = mesh
+        self.index = index
+        self.nodes = nodes
+        self.cells = cells
+        self.node_owners = node_owners
+        self.interfaces = interfaces
+
+    @property
+    def ghost_nodes(self):
+        """Local indices of nodes owned by other partitions.
+        """
+        return np.flatnonzero(self.node_owners != self.index)
+
+    @property
+    def owned_nodes(self):
+        return np.flatnonzero(self.node_owners == self.index)
+
+    def __repr__(self):
+        return (f'<yamio mesh partition {self.index}> nodes: {len(self.nodes)} '
+                f'(ghost: {len(self.ghost_nodes)}), neighbours: {list(self.interfaces)}')
+
+
+def partition_mesh(mesh, n_parts, method='rcb'):
+    """Splits mesh in partitions with local numbering.
+
+    Args:
+        mesh (yamio.Mesh or meshio.Mesh)
+        n_parts (int)
+        method (str): One of `PARTITIONING_METHODS`.
+
+    Returns:
+        list of MeshPartition
+    """
+    with stage(f'partitioning.{method}'):
+        cell_parts = get_cell_partitions(mesh, n_parts, method=method)
+
+    with stage('partitioning.build'):
+        return _build_partitions(mesh, cell_parts, n_parts)
+
+
+def get_cell_partitions(mesh, n_parts, method='rcb'):
+    """Gets partition of each cell.
+
+    Returns:
+        list: Partition indices, one array per cell block.
+    """
+    if method not in PARTITIONING_METHODS:
+        raise Exception(f'Unknown partitioning method: {method}')
+
+    block_sizes = [len(cell_block.data) for cell_block in mesh.cells]
+    n_cells = sum(block_sizes)
+    if n_parts < 1 or n_parts > n_cells:
+        raise Exception(f'Cannot split {n_cells} cells in {n_parts} partitions')
+
+    if method == 'rcb':
+        centers = np.concatenate([mesh.points[cell_block.data].mean(axis=1)
+                                  for cell_block in mesh.cells])
+        parts = np.empty(n_cells, dtype=np.int64)
+        _bisect(centers, np.arange(n_cells), 0, n_parts, parts)
+    else:
+        indptr, indices = get_node_graph(mesh.cells, len(mesh.points))
+        node_map = np.empty(len(mesh.points), dtype=np.int64)
+        node_map[get_rcm_order(indptr, indices)] = np.arange(len(mesh.points))
+
+        cell_keys = np.concatenate([node_map[cell_block.data].min(axis=1)
+                                    for cell_block in mesh.cells])
+        parts = np.empty(n_cells, dtype=np.int64)
+        parts[np.argsort(cell_keys, kind='stable')] = \
+            np.arange(n_cells) * n_parts // n_cells
+
+    return np.split(parts, np.cumsum(block_sizes)[:-1])
+
+
+def write_partitions(partitions, filename_pattern, file_format=None,
+                     max_workers=None, **kwargs):
+    """Writes partitions concurrently in a process pool.
+
+    Args:
+        filename_pattern (str): Formatted with the partition index
+            (e.g. `mesh_{}.mesh.xmf`).
+        max_workers (int): Defaults to the number of processors.
+        kwargs: Passed to `yamio.write`.
+
+    Returns:
+        list: Filenames.
+    """
+    from yamio import write
+
+    filenames = [filename_pattern.format(partition.index) for partition in partitions]
+    with stage('partitioning.write'):
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(write, filename, partition.mesh,
+                                       file_format=file_format, **kwargs)
+                       for filename, partition in zip(filenames, partitions)]
+            for future in futures:
+                future.result()
+
+    return filenames
+
+
+def _bisect(centers, cells, first_part, n_parts, parts):
+    if n_parts == 1:
+        parts[cells] = first_part
+        return
+
+    cell_centers = centers[cells]
+    axis = np.argmax(np.ptp(cell_centers, axis=0))
+
+    # split proportionally to number of parts of each side
+    n_left_parts = n_parts // 2
+    n_left = len(cells) * n_left_parts // n_parts
+    order = np.argpartition(cell_centers[:, axis], n_left)
+
+    _bisect(centers, cells[order[:n_left]], first_part, n_left_parts, parts)
+    _bisect(centers, cells[order[n_left:]], first_part + n_left_parts,
+            n_parts - n_left_parts, parts)
+
+
+def _build_partitions(mesh, cell_parts, n_parts):
+    n_points = len(mesh.points)
+
+    # partitions of each node (sorted unique packed pairs)
+    keys = _get_unique_sorted(np.concatenate([
+        np.asarray(cell_block.data, dtype=np.int64) * n_parts + block_parts[:, None]
+        for cell_block, block_parts in zip(mesh.cells, cell_parts)]).ravel())
+    node_part_pairs = np.stack([keys // n_parts, keys % n_parts], axis=1)
+
+    node_owners = np.full(n_points, -1, dtype=np.int64)
+    # lowest partition (pairs are sorted by node, then partition)
+    node_owners[node_part_pairs[::-1, 0]] = node_part_pairs[::-1, 1]
+    n_node_parts = np.bincount(node_part_pairs[:, 0], minlength=n_points)
+
+    patch_parts = _get_patch_parts(mesh, cell_parts, keys, n_parts)
+
+    partitions = []
+    for part in range(n_parts):
+        nodes = node_part_pairs[node_part_pairs[:, 1] == part, 0]
+        node_map = np.full(n_points, -1, dtype=np.int64)
+        node_map[nodes] = np.arange(len(nodes))
+
+        cells, local_cells = [], []
+        for cell_block, block_parts in zip(mesh.cells, cell_parts):
+            block_cells = np.flatnonzero(block_parts == part)
+            cells.append(block_cells)
+            if len(block_cells):
+                local_cells.append(meshio.CellBlock(cell_block.type,
+                                                    node_map[cell_block.data[block_cells]]))
+
+        cell_data = {
+            name: [np.asarray(values)[block_cells]
+                   for values, block_cells in zip(block_values, cells) if len(block_cells)]
+            for name, block_values in mesh.cell_data.items()}
+        point_data = {name: np.asarray(values)[nodes]
+                      for name, values in mesh.point_data.items()}
+
+        bnd_patches = {}
+        for patch_name, patch_nodes in getattr(mesh, 'bnd_patches', {}).items():
+            if isinstance(patch_nodes, meshio.CellBlock):
+                data = patch_nodes.data[patch_parts[patch_name] == part]
+                bnd_patches[patch_name] = meshio.CellBlock(patch_nodes.type, node_map[data])
+            else:
+                local_nodes = node_map[np.asarray(patch_nodes, dtype=int)]
+                bnd_patches[patch_name] = local_nodes[local_nodes >= 0]
+
+        # interfaces: other partitions of shared nodes
+        is_shared = n_node_parts[node_part_pairs[:, 0]] > 1
+        shared = node_part_pairs[is_shared & (node_map[node_part_pairs[:, 0]] >= 0)
+                                 & (node_part_pairs[:, 1] != part)]
+        interfaces = {int(other): node_map[shared[shared[:, 1] == other, 0]]
+                      for other in np.unique(shared[:, 1])}
+
+        partitions.append(MeshPartition(
+            Mesh(mesh.points[nodes], local_cells, bnd_patches=bnd_patches,
+                 point_data=point_data, cell_data=cell_data),
+            part, nodes, cells, node_owners[nodes], interfaces))
+
+    return partitions
+
+
+def _get_patch_parts(mesh, cell_parts, node_part_keys, n_parts):
+    """Gets partition of each patch face.
+
+    Notes:
+        Boundary faces go to the partition of their cell. Other faces (e.g.
+        internal patches) go to the lowest partition having all their nodes.
+    """
+    face_patches = {patch_name: patch_nodes
+                    for patch_name, patch_nodes in getattr(mesh, 'bnd_patches', {}).items()
+                    if isinstance(patch_nodes, meshio.CellBlock)}
+    if not face_patches:
+        return {}
+
+    max_dim = max(CELL_DIM.get(cell_block.type, -1) for cell_block in mesh.cells)
+    block_indices = [block_index for block_index, cell_block in enumerate(mesh.cells)
+                     if CELL_DIM.get(cell_block.type) == max_dim
+                     and CORNER_TYPE[cell_block.type] in CELL_FACES]
+    bnd_faces = get_boundary_faces([mesh.cells[block_index] for block_index in block_indices],
+                                   return_owners=True)
+
+    patch_parts = {}
+    for patch_name, patch_nodes in face_patches.items():
+        parts = np.full(len(patch_nodes.data), -1, dtype=np.int64)
+
+        face_type = CORNER_TYPE[patch_nodes.type]
+        if face_type in bnd_faces:
+            faces, owner_blocks, owner_cells = bnd_faces[face_type]
+            bnd_index = match_rows(get_corner_conns(np.asarray(patch_nodes.data),
+                                                    patch_nodes.type), faces)
+            is_matched = bnd_index >= 0
+            for local_block_index, block_index in enumerate(block_indices):
+                is_block = np.zeros(len(parts), dtype=bool)
+                is_block[is_matched] = owner_blocks[bnd_index[is_matched]] == local_block_index
+                parts[is_block] = cell_parts[block_index][owner_cells[bnd_index[is_block]]]
+
+        is_unmatched = parts < 0
+        if is_unmatched.any():
+            parts[is_unmatched] = _get_node_parts(
+                np.asarray(patch_nodes.data)[is_unmatched], node_part_keys, n_parts,
+                patch_name)
+
+        patch_parts[patch_name] = parts
+
+    return patch_parts
+
+
+def _get_node_parts(conns, node_part_keys, n_parts, patch_name):
+    """Gets lowest partition having all nodes of each face.
+
+    Args:
+        node_part_keys (np.array): Sorted `node * n_parts + part` keys.
+    """
+    conns = np.asarray(conns, dtype=np.int64)
+    parts = np.full(len(conns), -1, dtype=np.int64)
+    for part in range(n_parts):
+        is_free = parts < 0
+        if not is_free.any():
+            break
+
+        keys = conns[is_free] * n_parts + part
+        indices = np.minimum(np.searchsorted(node_part_keys, keys), len(node_part_keys) - 1)
+        has_nodes = np.all(node_part_keys[indices] == keys, axis=1)
+        parts[np.flatnonzero(is_free)[has_nodes]] = part
+
+    if np.any(parts < 0):
+        raise Exception(f'Faces of patch {patch_name} do not belong to any partition')
+
+    return parts
@@ -0,0 +1,388 @@
+"""Cache-friendly renumbering of nodes and cells.
+
+Examples:
+    ```python
+    report = mesh.renumber('rcm')
+    print(report.bandwidth_before, report.bandwidth_after)
+    ```
+
+Notes:
+    Methods:
+        * `rcm`: Reverse Cuthill-McKee on the node graph (nodes sharing a
+          cell are connected). Cells are sorted by their lowest node.
+        * `morton`, `hilbert`: nodes and cells (mean of their nodes) are
+          sorted along a space-filling curve.
+
+    Cuthill-McKee is evaluated level by level (vectorized breadth-first
+    search), which gives the same order as the classic queue-based version.
+
+    Points, cells, bnd_patches, point data, cell data, point sets and cell
+    sets (meshio's indices of nodes and of cells of each cell block) are
+    renumbered.
+"""
+
+import numpy as np
+import meshio
+
+from yamio.profiling import stage
+
+
+RENUMBERING_METHODS = ('rcm', 'morton', 'hilbert')
+
+# bits per axis of space-filling curve keys (fit in int64)
+_CURVE_BITS = {1: 62, 2: 31, 3: 21}
+
+
+class RenumberingReport:
+    """Result of a renumbering.
+
+    Args:
+        node_order (np.array): Old index of each new node.
+        cell_orders (list): Old index of each new cell, per cell block.
+        bandwidth_before (int)
+        bandwidth_after (int)
+    """
+
+    def __init__(self, node_order, cell_orders, bandwidth_before, bandwidth_after):
+        self.node_order = node_order
+        self.cell_orders = cell_orders
+        self.bandwidth_before = bandwidth_before
+        self.bandwidth_after = bandwidth_after
+
+    @property
+    def node_map(self):
+        """New index of each old node.
+        """
+        node_map = np.empty_like(self.node_order)
+        node_map[self.node_order] = np.arange(len(self.node_order))
+        return node_map
+
+    def __repr__(self):
+        return (f'<yamio renumbering report> bandwidth: {self.bandwidth_before} '
+                f'-> {self.bandwidth_after}')
+
+
+def renumber_mesh(mesh, method='rcm'):
+    """Renumbers nodes and cells in place.
+
+    Args:
+        mesh (yamio.Mesh or meshio.Mesh)
+        method (str): One of `RENUMBERING_METHODS`.
+
+    Returns:
+        RenumberingReport
+
+    Notes:
+        Sets that are not indices (e.g. values of `DolfinSolReader`) cannot
+        be renumbered and raise.
+    """
+    if method not in RENUMBERING_METHODS:
+        raise Exception(f'Unknown renumbering method: {method}')
+
+    invalid_sets = [name for name, indices in mesh.point_sets.items()
+                    if not _is_indices(indices)]
+    invalid_sets += [name for name, block_sets in mesh.cell_sets.items()
+                     if not all(_is_indices(indices) for indices in block_sets
+                                if indices is not None)]
+    if invalid_sets:
+        raise Exception(f'Sets cannot be renumbered (not indices): {invalid_sets}')
+
+    bandwidth_before = get_bandwidth(mesh.cells)
+
+    with stage(f'renumbering.{method}'):
+        if method == 'rcm':
+            indptr, indices = get_node_graph(mesh.cells, len(mesh.points))
+            node_order = get_rcm_order(indptr, indices)
+        else:
+            node_order = get_curve_order(mesh.points, curve=method)
+
+    node_map = np.empty_like(node_order)
+    node_map[node_order] = np.arange(len(node_order))
+
+    with stage('renumbering.apply'):
+        mesh.points = mesh.points[node_order]
+        for name, values in mesh.point_data.items():
+            mesh.point_data[name] = np.asarray(values)[node_order]
+        for name, indices in mesh.point_sets.items():
+            mesh.point_sets[name] = np.sort(node_map[np.asarray(indices, dtype=int)])
+
+        cell_orders = []
+        for block_index, cell_block in enumerate(mesh.cells):
+            conns = node_map[cell_block.data]
+            if method == 'rcm':
+                cell_order = np.argsort(conns.min(axis=1), kind='stable')
+            else:
+                cell_order = get_curve_order(
+                    mesh.points[conns].mean(axis=1), curve=method,
+                    bounds=(mesh.points.min(axis=0), mesh.points.max(axis=0)))
+
+            mesh.cells[block_index] = meshio.CellBlock(cell_block.type, conns[cell_order])
+            for values in mesh.cell_data.values():
+                values[block_index] = np.asarray(values[block_index])[cell_order]
+            cell_orders.append(cell_order)
+
+        for block_sets in mesh.cell_sets.values():
+            for block_index, (indices, cell_order) in enumerate(zip(block_sets, cell_orders)):
+                if indices is None:
+                    continue
+                cell_map = np.empty_like(cell_order)
+                cell_map[cell_order] = np.arange(len(cell_order))
+                block_sets[block_index] = np.sort(cell_map[np.asarray(indices, dtype=int)])
+
+        bnd_patches = getattr(mesh, 'bnd_patches', {})
+        for patch_name, patch_nodes in bnd_patches.items():
+            if isinstance(patch_nodes, meshio.CellBlock):
+                conns = node_map[patch_nodes.data]
+                conns = conns[np.argsort(conns.min(axis=1), kind='stable')]
+                bnd_patches[patch_name] = meshio.CellBlock(patch_nodes.type, conns)
+            else:
+                bnd_patches[patch_name] = np.sort(node_map[np.asarray(patch_nodes, dtype=int)])
+
+    if hasattr(mesh, 'clear_cache'):
+        mesh.clear_cache()
+
+    return RenumberingReport(node_order, cell_orders, bandwidth_before,
+                             get_bandwidth(mesh.cells))
+
+
+def _is_indices(indices):
+    indices = np.asarray(indices)
+    return indices.size == 0 or np.issubdtype(indices.dtype, np.integer)
+
+
+def get_bandwidth(cells):
+    """Gets max difference between node indices of a cell.
+    """
+    bandwidth = 0
+    for cell_block in cells:
+        conns = np.asarray(cell_block.data)
+        if conns.size:
+            bandwidth = max(bandwidth, int(np.max(conns.max(axis=1) - conns.min(axis=1))))
+
+    return bandwidth
+
+
+def get_node_graph(cells, n_points):
+    """Gets adjacency of nodes sharing a cell (CSR, without self loops).
+
+    Returns:
+        tuple: `indptr` and `indices`.
+    """
+    edges = []
+    for cell_block in cells:
+        conns = np.asarray(cell_block.data, dtype=np.int64)
+        for i in range(conns.shape[1]):
+            for j in range(i + 1, conns.shape[1]):
+                edges.append(conns[:, [i, j]])
+
+    if not edges:
+        return np.zeros(n_points + 1, dtype=np.int64), np.array([], dtype=np.int64)
+
+    edges = np.concatenate(edges, axis=0)
+    edges = edges[edges[:, 0] != edges[:, 1]]
+
+    # unique undirected edges (sorted packed keys), then both directions
+    keys = _get_unique_sorted(np.minimum(edges[:, 0], edges[:, 1]) * n_points
+                              + np.maximum(edges[:, 0], edges[:, 1]))
+    low, high = keys // n_points, keys % n_points
+    keys = np.sort(np.r_[keys, high * n_points + low])
+    sources, indices = keys // n_points, keys % n_points
+
+    indptr = np.zeros(n_points + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum(np.bincount(sources, minlength=n_points))
+
+    return indptr, indices
+
+
+def get_rcm_order(indptr, indices):
+    """Gets reverse Cuthill-McKee order.
+
+    Returns:
+        np.array: Old index of each new node.
+
+    Notes:
+        Each connected component starts at a pseudo-peripheral node. Isolated
+        nodes are placed at the end.
+    """
+    n_points = len(indptr) - 1
+    degrees = np.diff(indptr)
+
+    is_visited = degrees == 0
+    order = []
+    while not is_visited.all():
+        unvisited = np.flatnonzero(~is_visited)
+        start = _get_pseudo_peripheral_node(
+            indptr, indices, degrees, unvisited[np.argmin(degrees[unvisited])])
+
+        component_order = _get_cuthill_mckee_order(indptr, indices, degrees, start, n_points)
+        is_visited[component_order] = True
+        order.append(component_order)
+
+    order = np.concatenate(order)[::-1] if order else np.array([], dtype=np.int64)
+
+    return np.r_[order, np.flatnonzero(degrees == 0)].astype(np.int64)
+
+
+def get_curve_order(points, curve='hilbert', bounds=None):
+    """Gets order of points along a space-filling curve.
+
+    Args:
+        curve (str): `morton` or `hilbert`.
+        bounds (tuple): Min and max coordinates used to quantize points.
+            Defaults to points bounds.
+
+    Returns:
+        np.array: Old index of each new point.
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) == 0:
+        return np.array([], dtype=np.int64)
+
+    dim = points.shape[1]
+    n_bits = _CURVE_BITS[dim]
+
+    if bounds is None:
+        bounds = (points.min(axis=0), points.max(axis=0))
+    min_coords, max_coords = bounds
+    extents = np.where(max_coords > min_coords, max_coords - min_coords, 1.)
+
+    max_int = 2 ** n_bits - 1
+    coords = np.clip(((points - min_coords) / extents * max_int), 0, max_int).astype(np.int64)
+
+    if curve == 'hilbert':
+        coords = _get_hilbert_transpose(coords, n_bits)
+    elif curve != 'morton':
+        raise Exception(f'Unknown curve: {curve}')
+
+    return np.argsort(_interleave_bits(coords, n_bits), kind='stable')
+
+
+def _get_cuthill_mckee_order(indptr, indices, degrees, start, n_points):
+    """Breadth-first search level by level.
+
+    Notes:
+        Neighbours of each level are sorted by position of their first
+        visited neighbour and then by degree (as in the queue-based version).
+    """
+    is_visited = np.zeros(n_points, dtype=bool)
+    is_visited[start] = True
+
+    levels = [np.array([start])]
+    while True:
+        frontier = levels[-1]
+        parents, neighbours = _get_neighbours(indptr, indices, frontier)
+        is_new = ~is_visited[neighbours]
+        parents, neighbours = parents[is_new], neighbours[is_new]
+        if len(neighbours) == 0:
+            break
+
+        # parents are already sorted by position
+        order = np.lexsort((degrees[neighbours], parents))
+        neighbours = neighbours[order]
+        _, first = np.unique(neighbours, return_index=True)
+        level = neighbours[np.sort(first)]
+
+        is_visited[level] = True
+        levels.append(level)
+
+    return np.concatenate(levels)
+
+
+def _get_pseudo_peripheral_node(indptr, indices, degrees, start, n_iterations=2):
+    """Moves start to a node of min degree in the last level (few iterations).
+    """
+    n_points = len(indptr) - 1
+    n_levels = 0
+    for _ in range(n_iterations):
+        levels = _get_levels(indptr, indices, start, n_points)
+        if len(levels) <= n_levels:
+            break
+
+        n_levels = len(levels)
+        last_level = levels[-1]
+        start = last_level[np.argmin(degrees[last_level])]
+
+    return start
+
+
+def _get_levels(indptr, indices, start, n_points):
+    is_visited = np.zeros(n_points, dtype=bool)
+    is_visited[start] = True
+
+    levels = [np.array([start])]
+    while True:
+        _, neighbours = _get_neighbours(indptr, indices, levels[-1])
+        level = np.unique(neighbours[~is_visited[neighbours]])
+        if len(level) == 0:
+            return levels
+
+        is_visited[level] = True
+        levels.append(level)
+
+
+def _get_neighbours(indptr, indices, nodes):
+    """Gets `(position in nodes, neighbour)` pairs.
+    """
+    counts = indptr[nodes + 1] - indptr[nodes]
+    parents = np.repeat(np.arange(len(nodes)), counts)
+    positions = np.arange(len(parents)) - np.repeat(np.cumsum(counts) - counts, counts) \
+        + np.repeat(indptr[nodes], counts)
+
+    return parents, indices[positions]
+
+
+def _get_unique_sorted(keys):
+    # faster than np.unique for large arrays
+    keys = np.sort(keys)
+    return keys[np.r_[True, keys[1:] != keys[:-1]]]
+
+
+def _get_hilbert_transpose(coords, n_bits):
+    """Converts coordinates to Hilbert "transpose" form (Skilling, 2004).
+    """
+    coords = coords.copy()
+    dim = coords.shape[1]
+
+    # inverse undo excess work
+    q = 1 << (n_bits - 1)
+    while q > 1:
+        p = q - 1
+        for i in range(dim):
+            has_bit = (coords[:, i] & q) != 0
+            if i == 0:
+                # invert low bits of first axis
+                coords[:, 0] = np.where(has_bit, coords[:, 0] ^ p, coords[:, 0])
+                continue
+
+            # invert low bits of first axis or exchange them with axis i
+            t = np.where(has_bit, 0, (coords[:, 0] ^ coords[:, i]) & p)
+            coords[:, 0] = np.where(has_bit, coords[:, 0] ^ p, coords[:, 0] ^ t)
+            coords[:, i] ^= t
+        q >>= 1
+
+    # gray encode
+    for i in range(1, dim):
+        coords[:, i] ^= coords[:, i - 1]
+
+    t = np.zeros(len(coords), dtype=np.int64)
+    q = 1 << (n_bits - 1)
+    while q > 1:
+        t ^= np.where((coords[:, dim - 1] & q) != 0, q - 1, 0)
+        q >>= 1
+
+    for i in range(dim):
+        coords[:, i] ^= t
+
+    return coords
+
+
+def _interleave_bits(coords, n_bits):
+    """Interleaves bits of coordinates (most significant first, first axis first).
+    """
+    dim = coords.shape[1]
+    keys = np.zeros(len(coords), dtype=np.int64)
+    for bit in range(n_bits - 1, -1, -1):
+        for axis in range(dim):
+            keys = (keys << 1) | ((coords[:, axis] >> bit) & 1)
+
+    return keys
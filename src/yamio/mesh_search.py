@@ -0,0 +1,255 @@
+"""Point location, nearest node queries and field transfer between meshes.
+
+Examples:
+    ```python
+    index = mesh.get_spatial_index()
+    location = index.locate(query_points)
+    values = location.interpolate(mesh.point_data['T'])
+
+    target_mesh.point_data.update(transfer_fields(mesh, target_mesh)[0])
+    ```
+
+Notes:
+    Cells are split in simplices (see `yamio.geometry.SIMPLEX_SPLITS`), i.e.
+    interpolation is linear in each simplex (exact for simplicial meshes).
+
+    Only cells with the dimension of the mesh (2d cells in planar meshes)
+    are used to locate points.
+"""
+
+import numpy as np
+
+from yamio.geometry import (
+    CELL_DIM,
+    CORNER_TYPE,
+    SIMPLEX_SPLITS,
+    get_cell_centroids,
+    is_planar_mesh,
+)
+from yamio.profiling import stage
+from yamio.spatial import (
+    DEFAULT_QUERY_CHUNK_SIZE,
+    PointIndex,
+    SimplexIndex,
+)
+
+
+class PointLocation:
+    """Cells containing query points and interpolation weights.
+
+    Args:
+        block_indices (np.array): Cell block index (-1 if not found).
+        cell_indices (np.array): Cell index in block (-1 if not found).
+        nodes (np.array, shape=[n_points, dim + 1]): Nodes of containing
+            simplex.
+        weights (np.array, shape=[n_points, dim + 1]): Barycentric weights.
+    """
+
+    def __init__(self, block_indices, cell_indices, nodes, weights):
+        self.block_indices = block_indices
+        self.cell_indices = cell_indices
+        self.nodes = nodes
+        self.weights = weights
+
+    @property
+    def is_found(self):
+        return self.block_indices >= 0
+
+    def interpolate(self, point_values, fill_value=np.nan):
+        """Interpolates nodal values (shape=[n_nodes, ...]).
+        """
+        point_values = np.asarray(point_values)
+        weights = self.weights.reshape(self.weights.shape + (1,) * (point_values.ndim - 1))
+
+        values = np.sum(weights * point_values[self.nodes], axis=1)
+        values[~self.is_found] = fill_value
+
+        return values
+
+    def get_cell_values(self, cell_values, fill_value=np.nan):
+        """Gets values of containing cells.
+
+        Args:
+            cell_values (list): One array per cell block (e.g. `cell_data` item).
+        """
+        first_values = np.asarray(cell_values[0])
+        values = np.full((len(self.block_indices),) + first_values.shape[1:], fill_value,
+                         dtype=np.result_type(first_values, type(fill_value)))
+
+        for block_index, block_values in enumerate(cell_values):
+            is_block = self.block_indices == block_index
+            values[is_block] = np.asarray(block_values)[self.cell_indices[is_block]]
+
+        return values
+
+
+class MeshSpatialIndex:
+    """Lazily built point location and nearest node indices of a mesh.
+
+    Args:
+        mesh (yamio.Mesh or meshio.Mesh)
+        chunk_size (int): Number of query points evaluated at once.
+
+    Notes:
+        Indices are not rebuilt if the mesh changes (prefer
+        `yamio.Mesh.get_spatial_index`, which handles invalidation).
+    """
+
+    def __init__(self, mesh, chunk_size=DEFAULT_QUERY_CHUNK_SIZE):
+        self.mesh = mesh
+        self.chunk_size = chunk_size
+
+        self._point_index = None
+        self._simplex_index = None
+        self._simplex_owners = None
+
+    @property
+    def dim(self):
+        points = self.mesh.points
+        return 2 if is_planar_mesh(points) else points.shape[1]
+
+    def locate(self, points, tol=1e-10):
+        """Finds cells containing points.
+
+        Args:
+            points (np.array): Query points (extra coordinates are ignored,
+                e.g. z in planar meshes).
+            tol (float): Tolerance in barycentric coordinates.
+
+        Returns:
+            PointLocation
+        """
+        simplex_index = self._get_simplex_index()
+        block_indices, cell_indices, simplices = self._simplex_owners
+
+        with stage('spatial.locate'):
+            indices, weights = simplex_index.locate(
+                np.asarray(points)[:, :self.dim], tol=tol, chunk_size=self.chunk_size)
+
+        is_found = indices >= 0
+        nodes = np.zeros_like(weights, dtype=np.int64)
+        nodes[is_found] = simplices[indices[is_found]]
+
+        return PointLocation(np.where(is_found, block_indices[indices], -1),
+                             np.where(is_found, cell_indices[indices], -1),
+                             nodes, weights)
+
+    def find_nearest_nodes(self, points):
+        """Finds nearest nodes.
+
+        Returns:
+            tuple: Node indices and distances.
+        """
+        if self._point_index is None:
+            with stage('spatial.build_point_index'):
+                self._point_index = PointIndex(self.mesh.points[:, :self.dim])
+
+        with stage('spatial.find_nearest_nodes'):
+            return self._point_index.query(np.asarray(points)[:, :self.dim],
+                                           chunk_size=self.chunk_size)
+
+    def _get_simplex_index(self):
+        if self._simplex_index is not None:
+            return self._simplex_index
+
+        with stage('spatial.build_simplex_index'):
+            block_indices, cell_indices, simplices = [], [], []
+            for block_index, cell_block in enumerate(self.mesh.cells):
+                corner_type = CORNER_TYPE.get(cell_block.type)
+                if CELL_DIM.get(cell_block.type) != self.dim or corner_type not in SIMPLEX_SPLITS:
+                    continue
+
+                conns = np.asarray(cell_block.data)
+                for split in SIMPLEX_SPLITS[corner_type]:
+                    simplices.append(conns[:, split])
+                    block_indices.append(np.full(len(conns), block_index))
+                    cell_indices.append(np.arange(len(conns)))
+
+            if not simplices:
+                raise Exception(f'No {self.dim}d cells to locate points in')
+
+            self._simplex_owners = (np.concatenate(block_indices),
+                                    np.concatenate(cell_indices),
+                                    np.concatenate(simplices))
+            self._simplex_index = SimplexIndex(self.mesh.points[:, :self.dim],
+                                               self._simplex_owners[2],
+                                               chunk_size=self.chunk_size)
+
+        return self._simplex_index
+
+
+def transfer_fields(source_mesh, target_mesh, point_data_names=None,
+                    cell_data_names=None, extrapolate=True, tol=1e-10):
+    """Transfers point and cell data between meshes.
+
+    Args:
+        point_data_names (list): Defaults to all `source_mesh.point_data`.
+        cell_data_names (list): Defaults to all `source_mesh.cell_data`.
+        extrapolate (bool): Whether to use the nearest node (point data) or
+            the cell of the nearest node (cell data) for points outside the
+            source mesh. Otherwise they are `nan`.
+
+    Returns:
+        tuple: `point_data` and `cell_data` of the target mesh.
+
+    Notes:
+        Point data is interpolated at target nodes. Cell data is the value
+        of the source cell containing each target cell centroid.
+    """
+    spatial_index = _get_spatial_index(source_mesh)
+
+    if point_data_names is None:
+        point_data_names = list(source_mesh.point_data.keys())
+    if cell_data_names is None:
+        cell_data_names = list(source_mesh.cell_data.keys())
+
+    point_data = {}
+    if point_data_names:
+        location = spatial_index.locate(target_mesh.points, tol=tol)
+        nearest_nodes = _get_nearest_nodes(spatial_index, target_mesh.points, location,
+                                           extrapolate)
+
+        for name in point_data_names:
+            values = location.interpolate(source_mesh.point_data[name])
+            if nearest_nodes is not None:
+                values[~location.is_found] = source_mesh.point_data[name][nearest_nodes]
+            point_data[name] = values
+
+    cell_data = {}
+    if cell_data_names:
+        centroids = [get_cell_centroids(target_mesh.points, cell_block.data, cell_block.type)
+                     for cell_block in target_mesh.cells]
+        sizes = np.cumsum([0] + [len(block_centroids) for block_centroids in centroids])
+        location = spatial_index.locate(np.concatenate(centroids), tol=tol)
+
+        nearest_nodes = _get_nearest_nodes(spatial_index, np.concatenate(centroids),
+                                           location, extrapolate)
+        if nearest_nodes is not None:
+            # cell containing the nearest node
+            is_outside = ~location.is_found
+            node_location = spatial_index.locate(source_mesh.points[nearest_nodes], tol=tol)
+            location.block_indices[is_outside] = node_location.block_indices
+            location.cell_indices[is_outside] = node_location.cell_indices
+
+        for name in cell_data_names:
+            values = location.get_cell_values(source_mesh.cell_data[name])
+            cell_data[name] = [values[start:stop] for start, stop in zip(sizes[:-1], sizes[1:])]
+
+    return point_data, cell_data
+
+
+def _get_spatial_index(mesh):
+    if hasattr(mesh, 'get_spatial_index'):
+        return mesh.get_spatial_index()
+
+    return MeshSpatialIndex(mesh)
+
+
+def _get_nearest_nodes(spatial_index, points, location, extrapolate):
+    if not extrapolate or location.is_found.all():
+        return None
+
+    nearest_nodes, _ = spatial_index.find_nearest_nodes(
+        np.asarray(points)[~location.is_found])
+
+    return nearest_nodes
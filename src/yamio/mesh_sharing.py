@@ -0,0 +1,220 @@
+"""Zero-copy hand-off of meshes to other processes via shared memory.
+
+Examples:
+    ```python
+    with export_mesh(mesh) as shared_mesh:
+        # descriptor is small (no arrays), i.e. cheap to pickle
+        executor.map(work, [shared_mesh.descriptor] * n_tasks)
+
+    def work(descriptor):
+        with attach_mesh(descriptor) as attached_mesh:
+            return attached_mesh.mesh.points.sum()
+    ```
+
+Notes:
+    Points, cells, bnd_patches, point data and cell data are copied once
+    into a single shared memory block. Attached meshes are read-only views
+    of that block (arrays must not be referenced after leaving the context).
+    Cached data (e.g. fingerprints, geometry) is not shared.
+
+    The exporting process owns the block: it is removed when the exporting
+    context exits (attached processes only close their handle). Before
+    python 3.13, only child processes of the exporting process should attach
+    (otherwise their resource tracker removes the block when they exit).
+"""
+
+import gc
+from multiprocessing import shared_memory
+
+import numpy as np
+import meshio
+
+from yamio.mesh import Mesh
+from yamio.profiling import stage
+
+
+# alignment of each array in the shared block (bytes)
+_ALIGNMENT = 64
+
+
+class SharedMeshDescriptor:
+    """Layout of a mesh in a shared memory block.
+
+    Args:
+        shm_name (str): Name of shared memory block.
+        layout (list): `(kind, name, cell_type, offset, shape, dtype)` of
+            each array. Kinds are `points`, `cells`, `bnd_patch`,
+            `point_data` and `cell_data`.
+    """
+
+    def __init__(self, shm_name, layout):
+        self.shm_name = shm_name
+        self.layout = layout
+
+    def __repr__(self):
+        return f'<yamio shared mesh descriptor> {self.shm_name}: {len(self.layout)} arrays'
+
+
+class SharedMesh:
+    """Owner of a mesh exported to shared memory (context manager).
+
+    Args:
+        mesh (yamio.Mesh or meshio.Mesh)
+    """
+
+    def __init__(self, mesh):
+        arrays = _get_mesh_arrays(mesh)
+
+        layout, size = [], 0
+        for kind, name, cell_type, array in arrays:
+            layout.append((kind, name, cell_type, size, array.shape, array.dtype.str))
+            size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+        with stage('sharing.export'):
+            self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            for (_, _, _, array), (_, _, _, offset, shape, dtype) in zip(arrays, layout):
+                _get_view(self._shm, offset, shape, dtype)[...] = array
+
+        self.descriptor = SharedMeshDescriptor(self._shm.name, layout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Releases and removes shared memory block.
+        """
+        if self._shm is None:
+            return
+
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+
+class AttachedMesh:
+    """Mesh attached from shared memory (context manager).
+
+    Args:
+        descriptor (SharedMeshDescriptor)
+
+    Notes:
+        `mesh` (read-only views) is only available inside the context. Its
+        arrays must not be referenced when leaving it (e.g. use them in a
+        function called inside the context).
+    """
+
+    def __init__(self, descriptor):
+        self.descriptor = descriptor
+        self.mesh = None
+        self._shm = None
+
+    def __enter__(self):
+        # block is owned (and unlinked) by the exporting process
+        try:
+            self._shm = shared_memory.SharedMemory(name=self.descriptor.shm_name,
+                                                   track=False)
+        except TypeError:
+            # python < 3.13: child processes share the resource tracker of
+            # the exporting process (registration is a no-op)
+            self._shm = shared_memory.SharedMemory(name=self.descriptor.shm_name)
+
+        with stage('sharing.attach'):
+            self.mesh = _build_mesh(self._shm, self.descriptor.layout)
+
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._shm is None:
+            return
+
+        self.mesh = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # views may still be referenced by cached objects (cycles)
+            gc.collect()
+            try:
+                self._shm.close()
+            except BufferError:
+                raise Exception('Arrays of shared mesh are still referenced (e.g. by local '
+                                'variables) when leaving its context')
+        self._shm = None
+
+
+def export_mesh(mesh):
+    """Copies mesh arrays to shared memory.
+
+    Returns:
+        SharedMesh
+    """
+    return SharedMesh(mesh)
+
+
+def attach_mesh(descriptor):
+    """Attaches to mesh in shared memory (without copies).
+
+    Returns:
+        AttachedMesh
+    """
+    return AttachedMesh(descriptor)
+
+
+def _get_mesh_arrays(mesh):
+    arrays = [('points', None, None, mesh.points)]
+
+    for cell_block in mesh.cells:
+        if cell_block.type.startswith('polyhedron'):
+            raise Exception('Polyhedron cells cannot be shared')
+        arrays.append(('cells', None, cell_block.type, cell_block.data))
+
+    for patch_name, patch_nodes in getattr(mesh, 'bnd_patches', {}).items():
+        if isinstance(patch_nodes, meshio.CellBlock):
+            arrays.append(('bnd_patch', patch_name, patch_nodes.type, patch_nodes.data))
+        else:
+            arrays.append(('bnd_patch', patch_name, None, patch_nodes))
+
+    for name, values in mesh.point_data.items():
+        arrays.append(('point_data', name, None, values))
+
+    for name, block_values in mesh.cell_data.items():
+        for values in block_values:
+            arrays.append(('cell_data', name, None, values))
+
+    return [(kind, name, cell_type, np.ascontiguousarray(array))
+            for kind, name, cell_type, array in arrays]
+
+
+def _get_view(shm, offset, shape, dtype):
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape, dtype=np.int64))
+
+    return np.frombuffer(shm.buf, dtype=dtype, count=count, offset=offset).reshape(shape)
+
+
+def _build_mesh(shm, layout):
+    points, cells, bnd_patches = None, [], {}
+    point_data, cell_data = {}, {}
+    for kind, name, cell_type, offset, shape, dtype in layout:
+        array = _get_view(shm, offset, shape, dtype)
+        array.flags.writeable = False
+
+        if kind == 'points':
+            points = array
+        elif kind == 'cells':
+            cells.append(meshio.CellBlock(cell_type, array))
+        elif kind == 'bnd_patch':
+            bnd_patches[name] = (meshio.CellBlock(cell_type, array)
+                                 if cell_type is not None else array)
+        elif kind == 'point_data':
+            point_data[name] = array
+        else:
+            cell_data.setdefault(name, []).append(array)
+
+    return Mesh(points, cells, bnd_patches=bnd_patches, point_data=point_data,
+                cell_data=cell_data)
@@ -2,6 +2,14 @@ import numpy as np
 
 import meshio
 
+from yamio.geometry import (
+    CELL_FACES,
+    CORNER_TYPE,
+    DEFAULT_CHUNK_SIZE,
+    get_corner_conns,
+)
+from yamio.profiling import stage
+
 
 # TODO: review
 
@@ -26,10 +34,11 @@ def get_brep(points, cells):
 
     # name face is for simplification (represents edge if 2d)
     brep_cells = []
-    for cell in cells:
-        elem_type, faces = map_to_elem[cell.type](cell.data, keep_repeated=True)
-        bnd_faces = np.array([face for face in faces if not is_repeated_conn(faces, face)])
-        brep_cells.append(meshio.CellBlock(elem_type, bnd_faces))
+    with stage('mesh_utils.get_brep'):
+        for cell in cells:
+            elem_type, faces = map_to_elem[cell.type](cell.data, keep_repeated=True)
+            bnd_faces = np.array([face for face in faces if not is_repeated_conn(faces, face)])
+            brep_cells.append(meshio.CellBlock(elem_type, bnd_faces))
 
     points, cells = get_local_points_and_cells(points, brep_cells)
 
@@ -122,30 +131,224 @@ def get_local_points_and_cells(points, cells):
 
     # TODO: merge same cell types
 
-    all_req_dofs = []
-    for cell in cells:
-        all_req_dofs.extend(cell.data.ravel().tolist())
-    all_req_dofs = set(all_req_dofs)
+    with stage('mesh_utils.get_local_points_and_cells'):
+        all_req_dofs = []
+        for cell in cells:
+            all_req_dofs.extend(cell.data.ravel().tolist())
+        all_req_dofs = set(all_req_dofs)
 
-    dof_map = {dof: new_dof for new_dof, dof in enumerate(all_req_dofs)}
+        dof_map = {dof: new_dof for new_dof, dof in enumerate(all_req_dofs)}
 
-    # gather data
-    new_cells_data = {}
-    for cell in cells:
-        shape = cell.data.shape
-        data = np.empty_like(cell.data)
-        for i in range(shape[0]):
-            for j in range(shape[1]):
-                data[i, j] = dof_map[cell.data[i, j]]
+        # gather data
+        new_cells_data = {}
+        for cell in cells:
+            shape = cell.data.shape
+            data = np.empty_like(cell.data)
+            for i in range(shape[0]):
+                for j in range(shape[1]):
+                    data[i, j] = dof_map[cell.data[i, j]]
 
-        if cell.type in new_cells_data:
-            new_cells_data[cell.type] = np.r_[new_cells_data[cell.type], data]
-        else:
-            new_cells_data[cell.type] = data
+            if cell.type in new_cells_data:
+                new_cells_data[cell.type] = np.r_[new_cells_data[cell.type], data]
+            else:
+                new_cells_data[cell.type] = data
 
-    # create cells
-    new_cells = [meshio.CellBlock(elem_type, data) for elem_type, data in new_cells_data.items()]
+        # create cells
+        new_cells = [meshio.CellBlock(elem_type, data) for elem_type, data in new_cells_data.items()]
 
-    new_points = points[list(all_req_dofs), :]
+        new_points = points[list(all_req_dofs), :]
 
     return new_points, new_cells
+
+
+def get_boundary_faces(cells, return_owners=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Gets faces that belong to only one cell, grouped by face type.
+
+    Args:
+        cells (list of meshio.CellBlock): Cells of same dimension.
+        return_owners (bool): Whether to also return the cell block index
+            and the cell index of the (only) cell of each face.
+        chunk_size (int): Approximate number of faces built and grouped at
+            once (bounds memory).
+
+    Returns:
+        dict: Outward oriented faces for each face type (corner nodes only).
+            If `return_owners`, values are `(faces, block_indices, cell_indices)`.
+
+    Notes:
+        Vectorized alternative to `get_brep` (faces are not renumbered).
+
+        Faces are hash-partitioned by their smallest node (equal faces fall
+        in the same bucket) and each bucket is grouped separately. Besides
+        the output, memory is one index (8 bytes) per face plus one chunk of
+        faces.
+    """
+    faces_by_type = {}
+    for block_index, cell_block in enumerate(cells):
+        corner_type = CORNER_TYPE[cell_block.type]
+        conns = get_corner_conns(np.asarray(cell_block.data), cell_block.type)
+        for face_type, face in CELL_FACES[corner_type]:
+            block_faces = faces_by_type.setdefault(face_type, {}).setdefault(
+                block_index, (conns, []))
+            block_faces[1].append(face)
+
+    bnd_faces = {}
+    for face_type, block_faces in faces_by_type.items():
+        face_set = _FaceSet(block_faces)
+        bnd_ids = face_set.get_boundary_ids(chunk_size)
+        faces, block_indices, cell_indices = face_set.get_faces(bnd_ids)
+
+        bnd_faces[face_type] = ((faces, block_indices, cell_indices) if return_owners
+                                else faces)
+
+    return bnd_faces
+
+
+class _FaceSet:
+    """Faces of one type of several cell blocks, identified by an id.
+
+    Args:
+        block_faces (dict): Corner connectivity and local faces (of the
+            same type) of each cell block.
+
+    Notes:
+        Ids follow cell blocks, then local faces, then cells.
+    """
+
+    def __init__(self, block_faces):
+        self.block_indices = np.array(list(block_faces.keys()))
+        self.conns = [conns for conns, _ in block_faces.values()]
+        self.local_faces = [np.array(faces) for _, faces in block_faces.values()]
+
+        sizes = [len(conns) * len(faces) for conns, faces in zip(self.conns, self.local_faces)]
+        self.offsets = np.cumsum([0] + sizes)
+
+    @property
+    def n_faces(self):
+        return int(self.offsets[-1])
+
+    def iter_chunks(self, chunk_size):
+        """Iterates over ids and nodes of faces (in chunks of cells).
+        """
+        for conns, local_faces, offset in zip(self.conns, self.local_faces, self.offsets):
+            n_cells_chunk = max(1, chunk_size // len(local_faces))
+            for local_index, face in enumerate(local_faces):
+                for start in range(0, len(conns), n_cells_chunk):
+                    faces = conns[start:start + n_cells_chunk, face]
+                    first_id = offset + local_index * len(conns) + start
+                    yield np.arange(first_id, first_id + len(faces)), faces
+
+    def get_faces(self, ids):
+        """Gets nodes, (local) cell block and cell of faces.
+        """
+        owner_index = np.searchsorted(self.offsets, ids, side='right') - 1
+
+        n_nodes = self.local_faces[0].shape[1]
+        faces = np.empty((len(ids), n_nodes), dtype=np.result_type(*self.conns))
+        cell_indices = np.empty(len(ids), dtype=np.int64)
+        for index in np.unique(owner_index):
+            is_block = owner_index == index
+            conns = self.conns[index]
+            local_indices, cell_indices[is_block] = np.divmod(
+                ids[is_block] - self.offsets[index], len(conns))
+            faces[is_block] = conns[cell_indices[is_block][:, None],
+                                    self.local_faces[index][local_indices]]
+
+        return faces, self.block_indices[owner_index], cell_indices
+
+    def get_boundary_ids(self, chunk_size):
+        """Gets (sorted) ids of faces that appear once.
+        """
+        n_buckets = max(1, -(-self.n_faces // chunk_size))
+        face_ids, bucket_offsets = self._get_bucket_sorted_ids(n_buckets, chunk_size)
+
+        bnd_ids = []
+        for start, stop in zip(bucket_offsets[:-1], bucket_offsets[1:]):
+            ids = face_ids[start:stop]
+            faces, _, _ = self.get_faces(ids)
+            group_ids, counts = group_rows(np.sort(faces, axis=1))
+            bnd_ids.append(ids[counts[group_ids] == 1])
+
+        return np.sort(np.concatenate(bnd_ids)) if bnd_ids else np.array([], dtype=np.int64)
+
+    def _get_bucket_sorted_ids(self, n_buckets, chunk_size):
+        """Gets face ids sorted by bucket (counting sort in two passes).
+        """
+        counts = np.zeros(n_buckets, dtype=np.int64)
+        for _, faces in self.iter_chunks(chunk_size):
+            counts += np.bincount(faces.min(axis=1) % n_buckets, minlength=n_buckets)
+
+        bucket_offsets = np.r_[0, np.cumsum(counts)]
+        filled = bucket_offsets[:-1].copy()
+        face_ids = np.empty(self.n_faces, dtype=np.int64)
+        for ids, faces in self.iter_chunks(chunk_size):
+            buckets = faces.min(axis=1) % n_buckets
+            order = np.argsort(buckets, kind='stable')
+            buckets = buckets[order]
+
+            chunk_counts = np.bincount(buckets, minlength=n_buckets)
+            ranks = np.arange(len(buckets)) - np.repeat(np.cumsum(chunk_counts) - chunk_counts,
+                                                        chunk_counts)
+            face_ids[filled[buckets] + ranks] = ids[order]
+            filled += chunk_counts
+
+        return face_ids, bucket_offsets
+
+
+def match_rows(rows, reference_rows):
+    """Gets index of each row in reference (ignoring node order).
+
+    Returns:
+        np.array: Index in `reference_rows` (-1 if not found).
+    """
+    rows = np.sort(rows, axis=1)
+    reference_rows = np.sort(reference_rows, axis=1)
+
+    group_ids, counts = group_rows(np.concatenate([rows, reference_rows], axis=0))
+
+    reference_index = np.full(len(counts), -1, dtype=np.int64)
+    reference_index[group_ids[len(rows):][::-1]] = np.arange(len(reference_rows))[::-1]
+
+    return reference_index[group_ids[:len(rows)]]
+
+
+def is_row_in(rows, reference_rows):
+    """Checks which rows exist in reference (ignoring node order).
+    """
+    return match_rows(rows, reference_rows) >= 0
+
+
+def group_rows(rows):
+    """Groups equal rows (sort-based).
+
+    Returns:
+        tuple: group id of each row and number of rows in each group.
+    """
+    if len(rows) == 0:
+        return np.array([], dtype=int), np.array([], dtype=int)
+
+    rows = _pack_rows(rows)
+    order = np.lexsort(rows.T[::-1])
+    sorted_rows = rows[order]
+
+    is_new_group = np.r_[True, np.any(sorted_rows[1:] != sorted_rows[:-1], axis=1)]
+    group_ids_sorted = np.cumsum(is_new_group) - 1
+    counts = np.bincount(group_ids_sorted)
+
+    group_ids = np.empty(len(rows), dtype=int)
+    group_ids[order] = group_ids_sorted
+
+    return group_ids, counts
+
+
+def _pack_rows(rows):
+    """Packs pairs of non-negative columns in int64 (fewer sorting keys).
+    """
+    if rows.shape[1] < 3 or rows.min() < 0 or rows.max() >= 2**31:
+        return rows
+
+    rows = rows.astype(np.int64)
+    if rows.shape[1] % 2:
+        rows = np.c_[rows, np.zeros(len(rows), dtype=np.int64)]
+
+    return (rows[:, ::2] << 31) | rows[:, 1::2]
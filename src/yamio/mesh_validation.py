@@ -0,0 +1,227 @@
+"""Vectorized validation and repair of meshes.
+"""
+
+import numpy as np
+import meshio
+
+from yamio.geometry import (
+    CELL_DIM,
+    CELL_FACES,
+    CORNER_TYPE,
+    FLIP_ORIENTATION,
+    get_cell_measures,
+    get_corner_conns,
+    is_planar_mesh,
+)
+from yamio.mesh_utils import (
+    get_boundary_faces,
+    is_row_in,
+)
+from yamio.profiling import stage
+
+
+class MeshValidationError(Exception):
+    pass
+
+
+class ValidationReport:
+    """Issues found in a mesh.
+
+    Args:
+        out_of_range_cells (dict): Cell indices per cell block index.
+        degenerate_cells (dict): Cell indices per cell block index (zero
+            measure or repeated nodes).
+        inverted_cells (dict): Cell indices per cell block index.
+        unused_points (np.array): Points not used by any cell.
+        patches_out_of_range (dict): Cell (or node) indices per patch.
+        patch_faces_not_on_boundary (dict): Cell (or node) indices per patch.
+    """
+
+    def __init__(self, out_of_range_cells, degenerate_cells, inverted_cells,
+                 unused_points, patches_out_of_range, patch_faces_not_on_boundary):
+        self.out_of_range_cells = out_of_range_cells
+        self.degenerate_cells = degenerate_cells
+        self.inverted_cells = inverted_cells
+        self.unused_points = unused_points
+        self.patches_out_of_range = patches_out_of_range
+        self.patch_faces_not_on_boundary = patch_faces_not_on_boundary
+
+    @property
+    def is_valid(self):
+        issues = [self.out_of_range_cells, self.degenerate_cells,
+                  self.inverted_cells, self.patches_out_of_range,
+                  self.patch_faces_not_on_boundary]
+        return len(self.unused_points) == 0 and not any(issues)
+
+    def raise_if_invalid(self):
+        if not self.is_valid:
+            raise MeshValidationError(f'Invalid mesh:\n{self}')
+
+    def __repr__(self):
+        lines = [f"<yamio validation report> ({'valid' if self.is_valid else 'invalid'})"]
+
+        for title, indices_by_key in (
+                ('Out of range cells', self.out_of_range_cells),
+                ('Degenerate cells', self.degenerate_cells),
+                ('Inverted cells', self.inverted_cells),
+                ('Patches out of range', self.patches_out_of_range),
+                ('Patch faces not on boundary', self.patch_faces_not_on_boundary)):
+            if indices_by_key:
+                lines.append(f"  {title}:")
+                for key, indices in indices_by_key.items():
+                    lines.append(f"    {key}: {len(indices)}")
+
+        if len(self.unused_points):
+            lines.append(f"  Unused points: {len(self.unused_points)}")
+
+        return "\n".join(lines)
+
+
+def validate_mesh(mesh, rtol=1e-10):
+    """Validates mesh.
+
+    Args:
+        mesh (yamio.Mesh or meshio.Mesh)
+        rtol (float): Cells with absolute measure below `rtol` times the mean
+            absolute measure of their block are degenerate.
+
+    Returns:
+        ValidationReport
+
+    Notes:
+        Orientation is only checked for 3d cells and for 2d cells in planar
+        meshes.
+    """
+    points = mesh.points
+    n_points = len(points)
+    is_planar = is_planar_mesh(points)
+
+    out_of_range_cells = {}
+    degenerate_cells = {}
+    inverted_cells = {}
+    is_used = np.zeros(n_points, dtype=bool)
+
+    with stage('validation.cells'):
+        for block_index, cell_block in enumerate(mesh.cells):
+            conns = np.asarray(cell_block.data)
+            is_in_range = np.all((conns >= 0) & (conns < n_points), axis=1)
+            _add_indices(out_of_range_cells, block_index, ~is_in_range)
+
+            in_range_conns = conns[is_in_range]
+            is_used[in_range_conns.ravel()] = True
+
+            if cell_block.type not in CORNER_TYPE:
+                continue
+
+            is_degenerate = _has_repeated_nodes(
+                get_corner_conns(in_range_conns, cell_block.type))
+
+            measures = get_cell_measures(points, in_range_conns, cell_block.type)
+            abs_measures = np.abs(measures)
+            if len(measures):
+                is_degenerate |= abs_measures <= rtol * abs_measures.mean()
+
+            elem_dim = CELL_DIM[cell_block.type]
+            if elem_dim == 3 or (elem_dim == 2 and is_planar):
+                is_inverted = (measures < 0) & ~is_degenerate
+                _add_indices(inverted_cells, block_index, is_inverted,
+                             indices=np.flatnonzero(is_in_range))
+
+            _add_indices(degenerate_cells, block_index, is_degenerate,
+                         indices=np.flatnonzero(is_in_range))
+
+    with stage('validation.bnd_patches'):
+        patches_out_of_range, patch_faces_not_on_boundary = _validate_bnd_patches(
+            mesh, n_points)
+
+    return ValidationReport(out_of_range_cells, degenerate_cells, inverted_cells,
+                            np.flatnonzero(~is_used), patches_out_of_range,
+                            patch_faces_not_on_boundary)
+
+
+def repair_mesh(mesh, report=None):
+    """Reorients inverted cells in place.
+
+    Args:
+        report (ValidationReport): Computed if not given.
+
+    Returns:
+        int: Number of reoriented cells.
+
+    Notes:
+        Higher order cells are reoriented with their mid nodes (meshio
+        ordering).
+    """
+    if report is None:
+        report = validate_mesh(mesh)
+
+    # verified before modifying any block
+    for block_index in report.inverted_cells:
+        elem_type = mesh.cells[block_index].type
+        if elem_type not in FLIP_ORIENTATION:
+            raise Exception(f'Cannot reorient {elem_type} cells')
+
+    n_reoriented = 0
+    for block_index, indices in report.inverted_cells.items():
+        cell_block = mesh.cells[block_index]
+        cell_block.data[indices] = cell_block.data[indices][:, FLIP_ORIENTATION[cell_block.type]]
+        n_reoriented += len(indices)
+
+    if n_reoriented and hasattr(mesh, 'clear_cache'):
+        mesh.clear_cache()
+
+    return n_reoriented
+
+
+def _validate_bnd_patches(mesh, n_points):
+    bnd_patches = getattr(mesh, 'bnd_patches', {})
+    if not bnd_patches:
+        return {}, {}
+
+    max_dim = max((CELL_DIM.get(cell_block.type, -1) for cell_block in mesh.cells),
+                  default=-1)
+    volume_cells = [cell_block for cell_block in mesh.cells
+                    if CELL_DIM.get(cell_block.type) == max_dim
+                    and CORNER_TYPE[cell_block.type] in CELL_FACES]
+    bnd_faces = get_boundary_faces(volume_cells) if volume_cells else {}
+
+    bnd_nodes = None
+    patches_out_of_range = {}
+    patch_faces_not_on_boundary = {}
+    for patch_name, patch_nodes in bnd_patches.items():
+        if isinstance(patch_nodes, meshio.CellBlock):
+            conns = get_corner_conns(np.asarray(patch_nodes.data), patch_nodes.type)
+            is_in_range = np.all((conns >= 0) & (conns < n_points), axis=1)
+
+            face_type = CORNER_TYPE[patch_nodes.type]
+            if face_type in bnd_faces:
+                is_on_boundary = is_row_in(conns, bnd_faces[face_type])
+            else:
+                is_on_boundary = np.zeros(len(conns), dtype=bool)
+        else:
+            nodes = np.asarray(patch_nodes)
+            is_in_range = (nodes >= 0) & (nodes < n_points)
+
+            if bnd_nodes is None:
+                bnd_nodes = np.unique(np.concatenate(
+                    [faces.ravel() for faces in bnd_faces.values()] + [np.array([], dtype=int)]))
+            is_on_boundary = np.isin(nodes, bnd_nodes)
+
+        _add_indices(patches_out_of_range, patch_name, ~is_in_range)
+        _add_indices(patch_faces_not_on_boundary, patch_name,
+                     ~is_on_boundary & is_in_range)
+
+    return patches_out_of_range, patch_faces_not_on_boundary
+
+
+def _add_indices(indices_by_key, key, mask, indices=None):
+    if not mask.any():
+        return
+
+    selected = np.flatnonzero(mask)
+    indices_by_key[key] = indices[selected] if indices is not None else selected
+
+
+def _has_repeated_nodes(conns):
+    sorted_conns = np.sort(conns, axis=1)
+    return np.any(sorted_conns[:, 1:] == sorted_conns[:, :-1], axis=1)
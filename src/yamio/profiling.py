@@ -0,0 +1,302 @@
+"""Stage-level instrumentation of I/O and mesh utilities.
+
+Readers, writers and utilities wrap their stages in `stage`, which is a
+no-op unless a `Profiler` is active.
+
+Examples:
+    ```python
+    from yamio.profiling import Profiler
+
+    with Profiler(trace_memory=True) as profiler:
+        mesh = yamio.read(filename)
+
+    profiler.to_chrome_trace('trace.json')  # open in chrome://tracing
+    ```
+
+Notes:
+    Memory peaks are measured with `tracemalloc`, i.e. only allocations
+    traced by Python (including numpy arrays) are considered.
+
+    Stages are nested per thread (e.g. concurrent reads of `yamio.aio`),
+    but memory peaks are process-wide, i.e. they include allocations of
+    stages running in other threads. Stages must be entered and exited in
+    the same thread.
+
+    Stages are also cancellation points of work running in a
+    `CancellationScope` (see `yamio.aio`).
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+
+_profilers = []
+_profilers_lock = threading.Lock()
+_local = threading.local()
+
+
+class StageEvent:
+    """Information about a finished (or running) stage.
+
+    Args:
+        name (str): Stage name (e.g. `hip.write_h5`).
+        start (float): Start time in seconds (`time.perf_counter`).
+        duration (float): Duration in seconds.
+        bytes_read (int)
+        bytes_written (int)
+        peak_memory (int): Peak of traced memory above the memory at the
+            beginning of the stage. `None` if memory is not traced.
+        depth (int): Nesting level (within its thread).
+        thread_id (int): Thread running the stage.
+    """
+
+    def __init__(self, name, start, depth=0, thread_id=None):
+        self.name = name
+        self.start = start
+        self.duration = None
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.peak_memory = None
+        self.depth = depth
+        self.thread_id = thread_id
+
+        self._start_memory = 0
+        self._peak = 0
+
+    def add(self, bytes_read=0, bytes_written=0):
+        self.bytes_read += bytes_read
+        self.bytes_written += bytes_written
+
+    def to_dict(self):
+        return {'name': self.name,
+                'start': self.start,
+                'duration': self.duration,
+                'bytes_read': self.bytes_read,
+                'bytes_written': self.bytes_written,
+                'peak_memory': self.peak_memory,
+                'depth': self.depth,
+                'thread_id': self.thread_id}
+
+    def __repr__(self):
+        return f'<StageEvent {self.name}: {self.duration}s>'
+
+
+class Profiler:
+    """Collects stage events while active.
+
+    Args:
+        trace_memory (bool): Whether to measure peak allocations per stage.
+        callbacks (list of callable): Called with each `StageEvent` when the
+            stage finishes.
+    """
+
+    def __init__(self, trace_memory=False, callbacks=()):
+        self.trace_memory = trace_memory
+        self.callbacks = list(callbacks)
+        self.events = []
+
+        self._local = threading.local()  # stage stack of each thread
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    @property
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+
+        return self._local.stack
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+        with _profilers_lock:
+            _profilers.append(self)
+        return self
+
+    def __exit__(self, *args):
+        with _profilers_lock:
+            _profilers.remove(self)
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _enter_stage(self, name):
+        event = StageEvent(name, time.perf_counter(), depth=len(self._stack),
+                           thread_id=threading.get_ident())
+
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            for parent in self._stack:
+                parent._peak = max(parent._peak, peak)
+            _reset_peak()
+            event._start_memory = event._peak = current
+
+        self._stack.append(event)
+        return event
+
+    def _exit_stage(self, event):
+        event.duration = time.perf_counter() - event.start
+        self._stack.pop()
+
+        if self.trace_memory:
+            peak = max(event._peak, tracemalloc.get_traced_memory()[1])
+            event.peak_memory = peak - event._start_memory
+            for parent in self._stack:
+                parent._peak = max(parent._peak, peak)
+
+        with self._lock:
+            self.events.append(event)
+        for callback in self.callbacks:
+            callback(event)
+
+    def summary(self):
+        """Aggregates events by stage name.
+
+        Returns:
+            dict: `count`, `duration`, `bytes_read`, `bytes_written` and
+                `peak_memory` for each stage.
+        """
+        summary = {}
+        for event in self.events:
+            stage_summary = summary.setdefault(
+                event.name, {'count': 0, 'duration': 0., 'bytes_read': 0,
+                             'bytes_written': 0, 'peak_memory': None})
+            stage_summary['count'] += 1
+            stage_summary['duration'] += event.duration
+            stage_summary['bytes_read'] += event.bytes_read
+            stage_summary['bytes_written'] += event.bytes_written
+            if event.peak_memory is not None:
+                stage_summary['peak_memory'] = max(stage_summary['peak_memory'] or 0,
+                                                   event.peak_memory)
+
+        return summary
+
+    def to_json(self, filename=None):
+        data = [event.to_dict() for event in self.events]
+        return _dump_json(data, filename)
+
+    def to_chrome_trace(self, filename=None):
+        """Exports events in Chrome's trace event format.
+        """
+        pid = os.getpid()
+
+        trace_events = []
+        for event in sorted(self.events, key=lambda event: event.start):
+            trace_events.append({
+                'name': event.name,
+                'ph': 'X',
+                'ts': event.start * 1e6,
+                'dur': event.duration * 1e6,
+                'pid': pid,
+                'tid': event.thread_id,
+                'args': {'bytes_read': event.bytes_read,
+                         'bytes_written': event.bytes_written,
+                         'peak_memory': event.peak_memory},
+            })
+
+        return _dump_json({'traceEvents': trace_events}, filename)
+
+
+class _Stage:
+
+    def __init__(self, name):
+        self.name = name
+        self._events = None
+
+    def __enter__(self):
+        self._events = [(profiler, profiler._enter_stage(self.name))
+                        for profiler in list(_profilers)]
+        return self
+
+    def __exit__(self, *args):
+        for profiler, event in reversed(self._events):
+            profiler._exit_stage(event)
+
+    def add(self, bytes_read=0, bytes_written=0):
+        for _, event in self._events:
+            event.add(bytes_read=bytes_read, bytes_written=bytes_written)
+
+
+class _NullStage:
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def add(self, bytes_read=0, bytes_written=0):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class CancellationScope:
+    """Makes stages started in the current thread cancellation points.
+
+    Args:
+        event (threading.Event): When set, the next stage raises
+            `concurrent.futures.CancelledError`.
+    """
+
+    def __init__(self, event):
+        self.event = event
+        self._previous_event = None
+
+    def __enter__(self):
+        self._previous_event = getattr(_local, 'cancel_event', None)
+        _local.cancel_event = self.event
+        return self
+
+    def __exit__(self, *args):
+        _local.cancel_event = self._previous_event
+
+
+def check_cancelled(name=None):
+    """Raises `concurrent.futures.CancelledError` if the current scope was
+    cancelled.
+    """
+    event = getattr(_local, 'cancel_event', None)
+    if event is not None and event.is_set():
+        from concurrent.futures import CancelledError  # only used by yamio.aio
+        raise CancelledError(f'Cancelled before {name}' if name else 'Cancelled')
+
+
+def stage(name):
+    """Context manager delimiting an instrumented stage.
+
+    Notes:
+        Returns a shared no-op object if no profiler is active.
+
+        Use `add` on the returned object to report bytes read or written.
+
+        Raises `concurrent.futures.CancelledError` if the current
+        `CancellationScope` was cancelled.
+    """
+    check_cancelled(name)
+
+    if not _profilers:
+        return _NULL_STAGE
+
+    return _Stage(name)
+
+
+def _reset_peak():
+    # python >= 3.9
+    if hasattr(tracemalloc, 'reset_peak'):
+        tracemalloc.reset_peak()
+
+
+def _dump_json(data, filename=None):
+    if filename is None:
+        return json.dumps(data)
+
+    with open(filename, 'w') as file:
+        json.dump(data, file)
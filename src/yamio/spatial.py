@@ -0,0 +1,515 @@
+"""Spatial hashing of points in uniform grids.
+
+Notes:
+    Bins are identified by flat `int64` keys, i.e. lookups are binary searches
+    on sorted keys (no pairwise distances, no dict of bins).
+
+    Queries are evaluated in chunks of `chunk_size` points to bound memory.
+"""
+
+import itertools
+
+import numpy as np
+
+from yamio.geometry import get_barycentric_coords
+
+
+# max number of bins per axis (keeps flat keys in int64)
+_MAX_BINS_EXP = {1: 60, 2: 30, 3: 20}
+
+DEFAULT_QUERY_CHUNK_SIZE = 2**16
+_BRUTE_FORCE_SIZE = 2**22  # distances evaluated at once
+
+
+class UniformGrid:
+    """Uniform grid of bins with flat keys.
+
+    Args:
+        min_coords (np.array)
+        max_coords (np.array)
+        spacing (float): Bin size. Enlarged if needed to keep keys in `int64`.
+
+    Notes:
+        Grid is padded by one bin in each direction, so that neighbours of
+        bins of points within bounds never need bounds checks.
+    """
+
+    def __init__(self, min_coords, max_coords, spacing):
+        self.min_coords = np.asarray(min_coords, dtype=float)
+        max_coords = np.asarray(max_coords, dtype=float)
+
+        dim = len(self.min_coords)
+        extents = max_coords - self.min_coords
+        self.spacing = max(spacing, extents.max() / 2 ** _MAX_BINS_EXP[dim], 1e-300)
+
+        self.n_bins = np.floor(extents / self.spacing).astype(np.int64) + 3
+        self.strides = np.cumprod(np.r_[1, self.n_bins[:-1]])
+
+    @classmethod
+    def from_points(cls, points_list, spacing):
+        """Creates grid bounding all points.
+        """
+        min_coords = np.min([points.min(axis=0) for points in points_list], axis=0)
+        max_coords = np.max([points.max(axis=0) for points in points_list], axis=0)
+
+        return cls(min_coords, max_coords, spacing)
+
+    @property
+    def dim(self):
+        return len(self.min_coords)
+
+    def get_bins(self, points):
+        return np.floor((points - self.min_coords) / self.spacing).astype(np.int64) + 1
+
+    def get_keys(self, bins):
+        return bins @ self.strides
+
+    def is_inside(self, bins):
+        """Checks if bins are inside the (unpadded) grid.
+        """
+        return np.all((bins >= 1) & (bins <= self.n_bins - 2), axis=1)
+
+    def clip(self, bins):
+        return np.clip(bins, 1, self.n_bins - 2)
+
+    def get_neighbour_offsets(self, half=False):
+        """Gets offsets of neighbour bins (including own bin), closest first.
+
+        Args:
+            half (bool): If `True`, only one of each pair of opposite offsets
+                is returned (enough to find each pair of neighbours once).
+        """
+        offsets = [np.array(offset) for offset in itertools.product((-1, 0, 1), repeat=self.dim)]
+        if half:
+            # lexicographically non-negative
+            offsets = [offset for offset in offsets
+                       if not offset.any() or offset[np.flatnonzero(offset)[0]] > 0]
+
+        return sorted(offsets, key=lambda offset: np.abs(offset).sum())
+
+
+class SortedKeys:
+    """Points sorted by bin key (for bin queries).
+
+    Args:
+        grid (UniformGrid)
+        points (np.array)
+    """
+
+    def __init__(self, grid, points):
+        self.grid = grid
+
+        keys = grid.get_keys(grid.get_bins(points))
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+
+    def get_ranges(self, bins):
+        """Gets `(start, stop)` of each bin in `order`.
+        """
+        keys = self.grid.get_keys(bins)
+
+        # binary search is much faster (cache friendly) with sorted queries
+        query_order = None
+        if len(keys) > 1 and np.any(keys[1:] < keys[:-1]):
+            query_order = np.argsort(keys)
+            keys = keys[query_order]
+
+        start = np.searchsorted(self.sorted_keys, keys, side='left')
+        stop = np.searchsorted(self.sorted_keys, keys, side='right')
+        if query_order is None:
+            return start, stop
+
+        ranges = np.empty((2, len(keys)), dtype=start.dtype)
+        ranges[0, query_order] = start
+        ranges[1, query_order] = stop
+
+        return ranges[0], ranges[1]
+
+    def get_candidates(self, bins):
+        """Gets all (query, candidate) pairs at once.
+
+        Returns:
+            tuple: Query indices (in `bins`) and candidate point indices.
+        """
+        start, stop = self.get_ranges(bins)
+        queries, positions = _expand_ranges(start, stop)
+
+        return queries, self.order[positions]
+
+    def iter_candidates(self, bins):
+        """Iterates over bin occupancy (usually small).
+
+        Yields:
+            tuple: Query indices (in `bins`) and candidate point indices.
+        """
+        start, stop = self.get_ranges(bins)
+
+        rank = 0
+        while True:
+            has_candidate = start + rank < stop
+            if not has_candidate.any():
+                break
+
+            yield np.flatnonzero(has_candidate), self.order[start[has_candidate] + rank]
+
+            rank += 1
+
+
+def pad_points(points_list):
+    """Pads points with zero coordinates to the largest dimension.
+
+    Notes:
+        E.g. planar meshes written in 3d formats (`.geo`) get `z = 0`.
+    """
+    points_list = [np.asarray(points, dtype=float) for points in points_list]
+    dim = max(points.shape[1] for points in points_list)
+
+    return [np.pad(points, ((0, 0), (0, dim - points.shape[1])))
+            if points.shape[1] < dim else points for points in points_list]
+
+
+def find_close_pairs(points, atol):
+    """Finds pairs of points closer than `atol` in each coordinate.
+
+    Returns:
+        tuple: Arrays `(i, j)`, with `i > j`.
+    """
+    points = np.asarray(points, dtype=float)
+    if len(points) == 0:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+    grid = UniformGrid.from_points([points], spacing=atol)
+    sorted_keys = SortedKeys(grid, points)
+
+    # queries in key order (keys of neighbour bins are shifted keys)
+    bins = grid.get_bins(points[sorted_keys.order])
+
+    pairs_i, pairs_j = [], []
+    for offset in grid.get_neighbour_offsets(half=True):
+        for query, candidate in sorted_keys.iter_candidates(bins + offset):
+            query = sorted_keys.order[query]
+            is_pair = query != candidate if offset.any() else query > candidate
+            query, candidate = query[is_pair], candidate[is_pair]
+
+            is_close = np.all(np.abs(points[query] - points[candidate]) <= atol, axis=1)
+            query, candidate = query[is_close], candidate[is_close]
+
+            pairs_i.append(np.maximum(query, candidate))
+            pairs_j.append(np.minimum(query, candidate))
+
+    return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+
+def get_merged_point_map(points, atol):
+    """Maps each point to its merged point (groups of close points).
+
+    Returns:
+        tuple: Index of merged point for each point and indices of points
+            kept (first point of each group, in original order).
+
+    Notes:
+        Groups are connected components of close pairs, i.e. chains of
+        close points are merged even if their ends are not close.
+    """
+    n_points = len(points)
+    pairs_i, pairs_j = find_close_pairs(points, atol)
+
+    # min label propagation with pointer jumping
+    labels = np.arange(n_points)
+    while len(pairs_i):
+        new_labels = labels.copy()
+        np.minimum.at(new_labels, pairs_i, labels[pairs_j])
+        np.minimum.at(new_labels, pairs_j, labels[pairs_i])
+        new_labels = new_labels[new_labels]
+
+        if np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+
+    is_kept = labels == np.arange(n_points)
+    new_indices = np.cumsum(is_kept) - 1
+
+    return new_indices[labels], np.flatnonzero(is_kept)
+
+
+class PointIndex:
+    """Nearest point queries.
+
+    Args:
+        points (np.array)
+        points_per_bin (float): Average number of points per bin.
+        max_ring (int): Rings of neighbour bins searched for a first
+            candidate before falling back to brute force (only relevant for
+            large empty regions).
+        max_box_bins (int): Max number of bins searched per query. Queries
+            requiring more (e.g. far from all points) are brute forced.
+    """
+
+    def __init__(self, points, points_per_bin=2., max_ring=3, max_box_bins=4096):
+        self.points = np.asarray(points, dtype=float)
+        self.max_ring = max_ring
+        self.max_box_bins = max_box_bins
+
+        if len(self.points) == 0:
+            raise Exception('Cannot index empty points')
+
+        extents = np.ptp(self.points, axis=0)
+        is_active = extents > 0.
+        if is_active.any():
+            spacing = (np.prod(extents[is_active]) * points_per_bin
+                       / len(self.points)) ** (1. / is_active.sum())
+        else:
+            spacing = 1.
+
+        self.grid = UniformGrid.from_points([self.points], spacing=spacing)
+        self.sorted_keys = SortedKeys(self.grid, self.points)
+
+    def query(self, points, chunk_size=DEFAULT_QUERY_CHUNK_SIZE):
+        """Finds nearest points.
+
+        Returns:
+            tuple: Indices of nearest points and distances.
+        """
+        points = np.asarray(points, dtype=float)
+        indices = np.empty(len(points), dtype=np.int64)
+        distances = np.empty(len(points))
+
+        for start in range(0, len(points), chunk_size):
+            indices[start:start + chunk_size], distances[start:start + chunk_size] = \
+                self._query(points[start:start + chunk_size])
+
+        return indices, distances
+
+    def _query(self, points):
+        grid = self.grid
+        n_points = len(points)
+
+        best_indices = np.full(n_points, -1, dtype=np.int64)
+        best_sq_distances = np.full(n_points, np.inf)
+
+        # upper bound: rings of bins around (clipped) bin until a point is found
+        bins = grid.clip(grid.get_bins(points))
+        active = np.arange(n_points)
+        for ring in range(self.max_ring + 1):
+            offsets = np.array(_get_ring_offsets(ring, grid.dim))
+            ring_queries = np.repeat(active, len(offsets))
+            ring_bins = np.repeat(bins[active], len(offsets), axis=0) \
+                + np.tile(offsets, (len(active), 1))
+
+            is_valid = np.all((ring_bins >= 0) & (ring_bins < grid.n_bins), axis=1)
+            queries, candidates = self.sorted_keys.get_candidates(ring_bins[is_valid])
+            self._update(points, ring_queries[is_valid][queries], candidates,
+                         best_indices, best_sq_distances)
+
+            active = active[best_indices[active] < 0]
+            if len(active) == 0:
+                break
+
+        # exact: all bins closer than upper bound
+        radii = np.sqrt(best_sq_distances)[:, None]
+        low = grid.clip(grid.get_bins(points - np.where(np.isfinite(radii), radii, 0.)))
+        counts = grid.clip(grid.get_bins(points + np.where(np.isfinite(radii), radii, 0.))) \
+            - low + 1
+        n_box_bins = np.prod(counts, axis=1)
+
+        # e.g. far from all points or large empty regions
+        is_brute_force = (best_indices < 0) | (n_box_bins > self.max_box_bins)
+        self._brute_force_update(points, np.flatnonzero(is_brute_force),
+                                 best_indices, best_sq_distances)
+        n_box_bins[is_brute_force] = 0
+
+        queries, local = _expand_ranges(np.zeros(n_points, dtype=np.int64), n_box_bins)
+        box_bins = _unravel_box_indices(local, low[queries], counts[queries])
+
+        # skip bins farther than upper bound
+        bin_low = grid.min_coords + (box_bins - 1) * grid.spacing
+        gaps = np.maximum(np.maximum(bin_low - points[queries],
+                                     points[queries] - bin_low - grid.spacing), 0.)
+        is_close = np.sum(gaps ** 2, axis=1) <= best_sq_distances[queries]
+        queries, box_bins = queries[is_close], box_bins[is_close]
+
+        box_queries, candidates = self.sorted_keys.get_candidates(box_bins)
+        self._update(points, queries[box_queries], candidates,
+                     best_indices, best_sq_distances)
+
+        return best_indices, np.sqrt(best_sq_distances)
+
+    def _brute_force_update(self, points, queries, best_indices, best_sq_distances):
+        if len(queries) == 0:
+            return
+
+        # expanded squared distances (matrix product), exact distance of closest
+        sq_norms = np.sum(self.points ** 2, axis=1)
+        chunk_size = max(1, _BRUTE_FORCE_SIZE // len(self.points))
+        for start in range(0, len(queries), chunk_size):
+            queries_ = queries[start:start + chunk_size]
+            closest = np.argmin(sq_norms - 2. * points[queries_] @ self.points.T, axis=1)
+
+            best_indices[queries_] = closest
+            best_sq_distances[queries_] = np.sum(
+                (points[queries_] - self.points[closest]) ** 2, axis=1)
+
+    def _update(self, points, queries, candidates, best_indices, best_sq_distances):
+        if len(queries) == 0:
+            return
+
+        sq_distances = np.sum((points[queries] - self.points[candidates]) ** 2, axis=1)
+
+        # closest candidate of each query (queries are grouped)
+        is_first = np.r_[True, queries[1:] != queries[:-1]]
+        group_ids = np.cumsum(is_first) - 1
+        min_sq_distances = np.minimum.reduceat(sq_distances, np.flatnonzero(is_first))
+
+        closest = np.flatnonzero(sq_distances == min_sq_distances[group_ids])
+        closest = closest[np.r_[True, group_ids[closest[1:]] != group_ids[closest[:-1]]]]
+        queries, candidates, sq_distances = (queries[closest], candidates[closest],
+                                             sq_distances[closest])
+
+        is_better = sq_distances < best_sq_distances[queries]
+        best_indices[queries[is_better]] = candidates[is_better]
+        best_sq_distances[queries[is_better]] = sq_distances[is_better]
+
+
+class SimplexIndex:
+    """Point location in simplices.
+
+    Args:
+        points (np.array, shape=[n_points, dim])
+        simplices (np.array, shape=[n_simplices, dim + 1])
+        chunk_size (int): Number of simplices binned at once.
+
+    Notes:
+        Simplices are registered in all bins overlapped by their bounding
+        box. Bin size is the mean bounding box size.
+    """
+
+    def __init__(self, points, simplices, chunk_size=DEFAULT_QUERY_CHUNK_SIZE):
+        self.points = np.asarray(points, dtype=float)
+        self.simplices = np.asarray(simplices)
+
+        dim = self.points.shape[1]
+        if self.simplices.shape[1] != dim + 1:
+            raise Exception(f'Simplices must have {dim + 1} nodes in {dim}d')
+
+        self.bbox_min, self.bbox_max = bbox_min, bbox_max = self._get_bboxes(chunk_size)
+        spacing = np.mean(np.max(bbox_max - bbox_min, axis=1)) if len(bbox_min) else 1.
+        self.grid = UniformGrid(self.points.min(axis=0), self.points.max(axis=0), spacing)
+
+        keys, simplex_indices = [], []
+        for start in range(0, len(self.simplices), chunk_size):
+            keys_, simplex_indices_ = self._get_entries(
+                bbox_min[start:start + chunk_size], bbox_max[start:start + chunk_size])
+            keys.append(keys_)
+            simplex_indices.append(simplex_indices_ + start)
+
+        keys = np.concatenate(keys) if keys else np.array([], dtype=np.int64)
+        order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[order]
+        self.entries = np.concatenate(simplex_indices)[order] if keys.size else keys
+
+    def locate(self, points, tol=1e-10, chunk_size=DEFAULT_QUERY_CHUNK_SIZE):
+        """Finds simplices containing points.
+
+        Args:
+            tol (float): Tolerance in barycentric coordinates.
+
+        Returns:
+            tuple: Simplex index of each point (-1 if not found) and
+                barycentric weights (shape=[n_points, dim + 1]).
+        """
+        points = np.asarray(points, dtype=float)
+        simplex_indices = np.full(len(points), -1, dtype=np.int64)
+        weights = np.zeros((len(points), self.points.shape[1] + 1))
+
+        for start in range(0, len(points), chunk_size):
+            simplex_indices[start:start + chunk_size], weights[start:start + chunk_size] = \
+                self._locate(points[start:start + chunk_size], tol)
+
+        return simplex_indices, weights
+
+    def _locate(self, points, tol):
+        grid = self.grid
+        simplex_indices = np.full(len(points), -1, dtype=np.int64)
+        weights = np.zeros((len(points), points.shape[1] + 1))
+
+        bins = grid.get_bins(points)
+        inside = np.flatnonzero(grid.is_inside(bins))
+        keys = grid.get_keys(bins[inside])
+
+        query_order = np.argsort(keys, kind='stable')
+        inside, keys = inside[query_order], keys[query_order]
+
+        start = np.searchsorted(self.sorted_keys, keys, side='left')
+        stop = np.searchsorted(self.sorted_keys, keys, side='right')
+        queries, positions = _expand_ranges(start, stop)
+        queries, candidates = inside[queries], self.entries[positions]
+
+        # bounding box test is much cheaper than barycentric coordinates
+        margin = tol * grid.spacing
+        query_points = points[queries]
+        is_in_bbox = np.all((query_points >= self.bbox_min[candidates] - margin)
+                            & (query_points <= self.bbox_max[candidates] + margin), axis=1)
+        queries, candidates = queries[is_in_bbox], candidates[is_in_bbox]
+
+        candidate_weights = get_barycentric_coords(
+            self.points[self.simplices[candidates]], points[queries])
+        is_inside = np.all(candidate_weights >= -tol, axis=1)
+
+        # first containing simplex
+        queries, first = np.unique(queries[is_inside], return_index=True)
+        simplex_indices[queries] = candidates[is_inside][first]
+        weights[queries] = candidate_weights[is_inside][first]
+
+        return simplex_indices, weights
+
+    def _get_bboxes(self, chunk_size):
+        dim = self.points.shape[1]
+        bbox_min = np.empty((len(self.simplices), dim))
+        bbox_max = np.empty((len(self.simplices), dim))
+        for start in range(0, len(self.simplices), chunk_size):
+            coords = self.points[self.simplices[start:start + chunk_size]]
+            bbox_min[start:start + chunk_size] = coords.min(axis=1)
+            bbox_max[start:start + chunk_size] = coords.max(axis=1)
+
+        return bbox_min, bbox_max
+
+    def _get_entries(self, bbox_min, bbox_max):
+        low = self.grid.get_bins(bbox_min)
+        counts = self.grid.get_bins(bbox_max) - low + 1
+
+        n_entries = np.prod(counts, axis=1)
+        simplex_indices, local = _expand_ranges(np.zeros_like(n_entries), n_entries)
+
+        bins = _unravel_box_indices(local, low[simplex_indices], counts[simplex_indices])
+
+        return self.grid.get_keys(bins), simplex_indices
+
+
+def _get_ring_offsets(ring, dim):
+    if ring == 0:
+        return [np.zeros(dim, dtype=np.int64)]
+
+    return [np.array(offset) for offset in itertools.product(range(-ring, ring + 1), repeat=dim)
+            if max(abs(value) for value in offset) == ring]
+
+
+def _expand_ranges(start, stop):
+    """Gets owner and position of each element of several ranges.
+    """
+    counts = stop - start
+    owners = np.repeat(np.arange(len(start)), counts)
+    positions = np.arange(len(owners)) - np.repeat(np.cumsum(counts) - counts, counts) \
+        + np.repeat(start, counts)
+
+    return owners, positions
+
+
+def _unravel_box_indices(local, low, counts):
+    """Gets bins from local indices in boxes of bins (first axis fastest).
+    """
+    bins = np.empty(low.shape, dtype=np.int64)
+    for axis in range(low.shape[1]):
+        bins[:, axis] = low[:, axis] + local % counts[:, axis]
+        local = local // counts[:, axis]
+
+    return bins
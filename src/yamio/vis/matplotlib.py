@@ -1,4 +1,111 @@
+"""Matplotlib triangulations of 2d meshes.
+
+Notes:
+    Triangulations (and their trifinders) are cached per mesh and rebuilt
+    only if its points or cells are reassigned (not if modified in place).
+"""
+
+import weakref
+
+import numpy as np
 import matplotlib.tri as tri
+from matplotlib.animation import FuncAnimation
+
+from yamio.geometry import (
+    CELL_DIM,
+    CORNER_TYPE,
+    SIMPLEX_SPLITS,
+    get_corner_conns,
+)
+
+
+# by mesh id (entries are removed when meshes are garbage collected)
+_TRIANGULATIONS = {}
+
+
+class MeshTriangulation:
+    """Triangulation of the 2d cells of a mesh.
+
+    Args:
+        triangulation (matplotlib.tri.Triangulation)
+        block_indices (np.array): Cell block of each triangle.
+        cell_indices (np.array): Cell (in block) of each triangle.
+        block_sizes (list): Number of cells of each cell block.
+    """
+
+    def __init__(self, triangulation, block_indices, cell_indices, block_sizes):
+        self.triangulation = triangulation
+        self.block_indices = block_indices
+        self.cell_indices = cell_indices
+        self.block_sizes = block_sizes
+
+    @property
+    def trifinder(self):
+        # cached by matplotlib
+        return self.triangulation.get_trifinder()
+
+    def get_triangle_values(self, cell_values):
+        """Gets value of each triangle.
+
+        Args:
+            cell_values (list or np.array): One array per cell block (e.g.
+                `cell_data` item) or values of all cells (e.g. `cell_sets`
+                of `DolfinSolReader`).
+        """
+        if not isinstance(cell_values, np.ndarray):
+            cell_values = np.concatenate(cell_values)
+
+        offsets = np.cumsum([0] + list(self.block_sizes))
+        return cell_values[offsets[self.block_indices] + self.cell_indices]
+
+
+def get_triangles(cells):
+    """Splits 2d cells in triangles (higher order cells use their corners).
+
+    Returns:
+        tuple: Triangles, cell block and cell (in block) of each triangle.
+    """
+    triangles, block_indices, cell_indices = [], [], []
+    for block_index, cell_block in enumerate(cells):
+        if CELL_DIM.get(cell_block.type) != 2:
+            continue
+
+        conns = get_corner_conns(np.asarray(cell_block.data), cell_block.type)
+        for split in SIMPLEX_SPLITS[CORNER_TYPE[cell_block.type]]:
+            triangles.append(conns[:, split])
+            block_indices.append(np.full(len(conns), block_index))
+            cell_indices.append(np.arange(len(conns)))
+
+    if not triangles:
+        raise ValueError('No 2d cells to triangulate')
+
+    return (np.concatenate(triangles), np.concatenate(block_indices),
+            np.concatenate(cell_indices))
+
+
+def get_mesh_triangulation(meshio_mesh):
+    """Gets (cached) triangulation of mesh.
+
+    Returns:
+        MeshTriangulation
+    """
+    state = (meshio_mesh.points, [cell_block.data for cell_block in meshio_mesh.cells])
+
+    cached = _TRIANGULATIONS.get(id(meshio_mesh))
+    if cached is not None and _is_same_state(cached[0], state):
+        return cached[1]
+
+    if cached is None:
+        weakref.finalize(meshio_mesh, _TRIANGULATIONS.pop, id(meshio_mesh), None)
+
+    triangles, block_indices, cell_indices = get_triangles(meshio_mesh.cells)
+    xy = meshio_mesh.points
+    mesh_triangulation = MeshTriangulation(
+        tri.Triangulation(xy[:, 0], xy[:, 1], triangles), block_indices, cell_indices,
+        [len(cell_block.data) for cell_block in meshio_mesh.cells])
+    _TRIANGULATIONS[id(meshio_mesh)] = (state, mesh_triangulation)
+
+    return mesh_triangulation
 
 
 def mesh2tri(meshio_mesh):
@@ -6,10 +113,113 @@ def mesh2tri(meshio_mesh):
 
     Notes:
         Adapted from dolfin source code (avoid dependency).
+
+        Quads and mixed 2d cell blocks are split in triangles. The
+        triangulation is cached (see `get_mesh_triangulation`).
     """
-    cells = meshio_mesh.cells[0]
-    if cells.type != 'triangle':
-        raise Exception("Only works with triangles")
+    return get_mesh_triangulation(meshio_mesh).triangulation
 
-    xy = meshio_mesh.points
-    return tri.Triangulation(xy[:, 0], xy[:, 1], cells.data)
+
+def animate_time_series(meshes, var_name, ax=None, interval=200, vmin=None,
+                        vmax=None, **kwargs):
+    """Animates a variable of a time series (e.g. read by `DolfinSolReader`).
+
+    Args:
+        meshes (meshio.Mesh or list): Mesh with data of all frames (shared
+            mesh) or one mesh per frame.
+        var_name (str): Point or cell variable (in `point_sets` or
+            `cell_sets`).
+        ax (matplotlib.axes.Axes): Defaults to a new figure.
+        vmin, vmax (float): Color limits. Default to limits of all frames.
+        kwargs: Passed to `tripcolor`.
+
+    Returns:
+        matplotlib.animation.FuncAnimation
+
+    Notes:
+        Each frame only updates the colors (the triangulation of a mesh is
+        built once and reused).
+    """
+    frames = _get_frames(meshes, var_name)
+    first_mesh = meshes[0] if isinstance(meshes, (list, tuple)) else meshes
+    shading = 'gouraud' if var_name in first_mesh.point_sets else 'flat'
+
+    if ax is None:
+        import matplotlib.pyplot as plt
+        _, ax = plt.subplots()
+
+    if vmin is None:
+        vmin = min(np.min(values) for _, values, _ in frames)
+    if vmax is None:
+        vmax = max(np.max(values) for _, values, _ in frames)
+
+    def draw(mesh_triangulation, values):
+        return ax.tripcolor(mesh_triangulation.triangulation, values,
+                            shading=shading, vmin=vmin, vmax=vmax, **kwargs)
+
+    mesh_triangulation, values, time = frames[0]
+    artists = {'collection': draw(mesh_triangulation, values),
+               'triangulation': mesh_triangulation}
+    ax.set_aspect('equal')
+    ax.set_title(f't = {time}')
+
+    def update(frame_index):
+        mesh_triangulation, values, time = frames[frame_index]
+
+        if mesh_triangulation is artists['triangulation']:
+            artists['collection'].set_array(values)
+        else:
+            artists['collection'].remove()
+            artists['collection'] = draw(mesh_triangulation, values)
+            artists['triangulation'] = mesh_triangulation
+
+        ax.set_title(f't = {time}')
+
+        return artists['collection'],
+
+    return FuncAnimation(ax.figure, update, frames=len(frames), interval=interval)
+
+
+def _get_frames(meshes, var_name):
+    """Gets triangulation, values and time of each frame.
+    """
+    if not isinstance(meshes, (list, tuple)):
+        mesh_triangulation = get_mesh_triangulation(meshes)
+        return [(mesh_triangulation,
+                 _get_plot_values(mesh_triangulation, meshes, var_name, values), time)
+                for values, time in zip(_get_var_values(meshes, var_name),
+                                        meshes.info['time'])]
+
+    frames = []
+    for mesh in meshes:
+        mesh_triangulation = get_mesh_triangulation(mesh)
+        values = _get_plot_values(mesh_triangulation, mesh, var_name,
+                                  _get_var_values(mesh, var_name))
+        frames.append((mesh_triangulation, values, mesh.info['time']))
+
+    return frames
+
+
+def _get_var_values(mesh, var_name):
+    if var_name in mesh.point_sets:
+        return mesh.point_sets[var_name]
+    if var_name in mesh.cell_sets:
+        return mesh.cell_sets[var_name]
+
+    raise Exception(f'Unknown variable: {var_name}')
+
+
+def _get_plot_values(mesh_triangulation, mesh, var_name, values):
+    values = np.asarray(values)
+    if var_name in mesh.point_sets:
+        return values.ravel()
+
+    return mesh_triangulation.get_triangle_values(values.ravel())
+
+
+def _is_same_state(state, other_state):
+    points, conns = state
+    other_points, other_conns = other_state
+
+    return points is other_points and len(conns) == len(other_conns) and all(
+        data is other_data for data, other_data in zip(conns, other_conns))
@@ -0,0 +1,79 @@
+import asyncio
+import threading
+import time
+
+import yamio
+from yamio import aio
+from yamio.aio import AsyncExecutor
+from yamio.mesh_generators import get_structured_box
+from yamio.profiling import stage
+
+
+def test_aread_awrite(tmp_path):
+    mesh = get_structured_box(4, elem_type='quad')
+    filenames = [str(tmp_path / f'mesh_{index}.geo') for index in range(4)]
+
+    async def convert():
+        with AsyncExecutor(max_workers=2) as executor:
+            await asyncio.gather(*[
+                yamio.awrite(filename, mesh, executor=executor, part_description='box')
+                for filename in filenames])
+            return await asyncio.gather(*[yamio.aread(filename, executor=executor)
+                                          for filename in filenames])
+
+    for read_mesh in asyncio.run(convert()):
+        assert len(read_mesh.points) == len(mesh.points)
+
+
+def test_cancel_between_stages():
+    stages_done = []
+    is_started = threading.Event()
+
+    def work():
+        for index in range(100):
+            with stage(f'work.{index}'):
+                is_started.set()
+                time.sleep(0.01)
+            stages_done.append(index)
+
+    async def run_and_cancel():
+        with AsyncExecutor(max_workers=1) as executor:
+            task = asyncio.ensure_future(executor.run(work))
+            while not is_started.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+        return False
+
+    assert asyncio.run(run_and_cancel())
+    assert 0 < len(stages_done) < 100
+
+
+def test_serial_formats(tmp_path, monkeypatch):
+    running, max_running = [0], [0]
+
+    def write(filename, mesh, file_format=None, **kwargs):
+        running[0] += 1
+        max_running[0] = max(max_running[0], running[0])
+        time.sleep(0.02)
+        running[0] -= 1
+
+    monkeypatch.setattr(aio, 'write', write)
+    monkeypatch.setattr(aio, 'SERIAL_FORMATS', ('geo',))
+    mesh = get_structured_box(2, elem_type='quad')
+
+    async def write_all(file_format):
+        with AsyncExecutor(max_workers=4) as executor:
+            await asyncio.gather(*[
+                executor.write(str(tmp_path / f'mesh_{index}.geo'), mesh,
+                               file_format=file_format)
+                for index in range(4)])
+
+    asyncio.run(write_all('geo'))
+    assert max_running[0] == 1
+
+    asyncio.run(write_all('vtu'))
+    assert max_running[0] > 1
@@ -0,0 +1,64 @@
+
+import copy
+
+import numpy as np
+import meshio
+
+import yamio
+from yamio.bnd_patches import (
+    BoundaryPatches,
+    get_patch_node_groups,
+)
+from yamio.mesh_generators import get_structured_box
+
+
+def test_compact_patches():
+    mesh = get_structured_box(3, elem_type='hexahedron')
+    bnd_patches = BoundaryPatches.from_dict(mesh.bnd_patches)
+
+    assert bnd_patches.is_compact
+    assert list(bnd_patches) == list(mesh.bnd_patches)
+    for name, patch in mesh.bnd_patches.items():
+        assert bnd_patches[name].type == patch.type
+        assert np.array_equal(bnd_patches[name].data, patch.data)
+        assert np.shares_memory(bnd_patches[name].data, bnd_patches.conns)
+        assert bnd_patches[name] is bnd_patches[name]
+
+    compact_mesh = yamio.Mesh(mesh.points, mesh.cells, bnd_patches=bnd_patches)
+    assert compact_mesh.fingerprint() == mesh.fingerprint()
+
+    renumbered_mesh = copy.deepcopy(compact_mesh)
+    renumbered_mesh.renumber('hilbert')
+    assert isinstance(renumbered_mesh.bnd_patches, BoundaryPatches)
+    assert renumbered_mesh.diff(mesh).is_equal
+
+    # behaves as dict (replaced items keep their position)
+    names = list(bnd_patches)
+    bnd_patches[names[1]] = meshio.CellBlock('quad', bnd_patches[names[1]].data[:2])
+    assert list(bnd_patches) == names
+    assert len(bnd_patches[names[1]]) == 2
+    assert np.array_equal(bnd_patches[names[2]].data, mesh.bnd_patches[names[2]].data)
+
+    del bnd_patches[names[0]]
+    bnd_patches['nodes'] = np.array([0, 1])
+    assert not bnd_patches.is_compact
+    assert list(bnd_patches) == names[1:] + ['nodes']
+    assert np.array_equal(bnd_patches['nodes'], [0, 1])
+
+    copied_patches = copy.deepcopy(bnd_patches)
+    assert np.array_equal(copied_patches.conns, bnd_patches.conns)
+
+
+def test_patch_node_groups():
+    mesh = get_structured_box(3, elem_type='hexahedron')
+    expected_nodes = [np.unique(patch.data) for patch in mesh.bnd_patches.values()]
+
+    # compact (single sort)
+    nodes, last_indices = get_patch_node_groups(BoundaryPatches.from_dict(mesh.bnd_patches))
+    assert np.array_equal(nodes, np.concatenate(expected_nodes))
+    assert np.array_equal(last_indices, np.cumsum([len(nodes_) for nodes_ in expected_nodes]))
+
+    # mixed
+    mesh.bnd_patches['nodes'] = np.array([5, 1, 1])
+    nodes, last_indices = get_patch_node_groups(mesh.bnd_patches)
+    assert np.array_equal(nodes[last_indices[-2]:], [1, 5])
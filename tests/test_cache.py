@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+
+import yamio
+from yamio.cache import ReadCache
+from yamio.ensight.gold import GeoWriter
+from yamio.mesh_generators import get_structured_box
+
+
+def test_read_cache(tmp_path):
+    filename = str(tmp_path / 'mesh.geo')
+    mesh = get_structured_box(3, elem_type='hexahedron')
+    GeoWriter().write(filename, mesh, part_description='box')
+
+    cache = ReadCache(str(tmp_path / 'cache'))
+    cold_mesh = yamio.read(filename, cache=cache)
+    warm_mesh = yamio.read(filename, cache=cache)
+
+    assert isinstance(warm_mesh.points.base, np.memmap)
+    assert np.allclose(warm_mesh.points, cold_mesh.points)
+    assert np.array_equal(warm_mesh.cells[0].data, mesh.cells[0].data)
+
+    # file modification invalidates entry
+    GeoWriter().write(filename, get_structured_box(2, elem_type='hexahedron'),
+                      part_description='box')
+    os.utime(filename, ns=(0, 0))
+    assert len(yamio.read(filename, cache=cache).points) == 27
+
+
+def test_read_cache_eviction(tmp_path):
+    mesh = get_structured_box(4, elem_type='quad')
+    cache = ReadCache(str(tmp_path / 'cache'))
+
+    for i in range(3):
+        filename = str(tmp_path / f'mesh_{i}.geo')
+        GeoWriter().write(filename, mesh, part_description='box')
+        cache.read(filename)
+
+        if i == 0:
+            cache.max_size = int(1.5 * cache.get_size())
+
+    assert len(os.listdir(cache.cache_dir)) == 1
@@ -0,0 +1,48 @@
+import json
+
+import numpy as np
+import meshio
+
+import yamio
+from yamio.cli import main
+from yamio.mesh_generators import get_structured_box
+
+
+def test_read_info(tmp_path):
+    filename = str(tmp_path / 'mesh.xdmf')
+    mesh = get_structured_box(3, elem_type='triangle')
+    yamio.write(filename, mesh, file_format='dolfin-yamio')
+
+    mesh_info = yamio.info(filename, compute_bbox=True)
+
+    assert mesh_info.n_points == len(mesh.points)
+    assert mesh_info.cells == [('triangle', len(mesh.cells[0]))]
+    assert np.allclose(mesh_info.bounding_box, [[0., 0.], [1., 1.]])
+    assert mesh_info.bnd_patches == {name: ('line', len(patch))
+                                     for name, patch in mesh.bnd_patches.items()}
+
+
+def test_read_info_fallback(tmp_path):
+    # mixed topology and inline data are not read from headers
+    filename = str(tmp_path / 'mesh.xdmf')
+    mesh = meshio.Mesh([[0., 0.], [1., 0.], [1., 1.], [0., 1.], [2., 0.]],
+                       [('quad', [[0, 1, 2, 3]]), ('triangle', [[1, 4, 2]])])
+    meshio.write(filename, mesh, data_format='XML')
+
+    mesh_info = yamio.info(filename)
+
+    assert mesh_info.n_points == 5
+    assert mesh_info.cells == [('quad', 1), ('triangle', 1)]
+
+
+def test_cli_info_json(tmp_path, capsys):
+    filename = str(tmp_path / 'mesh.xdmf')
+    mesh = get_structured_box(2, elem_type='tetra')
+    yamio.write(filename, mesh, file_format='dolfin-yamio')
+
+    assert main(['info', filename, '--json']) == 0
+
+    data = json.loads(capsys.readouterr().out)
+    assert data['n_points'] == len(mesh.points)
+    assert data['cells'] == [['tetra', len(mesh.cells[0])]]
+    assert set(data['bnd_patches']) == set(mesh.bnd_patches)
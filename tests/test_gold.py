@@ -0,0 +1,146 @@
+import numpy as np
+
+import meshio
+
+import yamio
+from yamio.ensight.gold import GeoWriter
+from yamio.mesh_generators import get_structured_box
+from yamio.mesh_merge import merge_meshes
+from yamio.mesh_utils import get_local_points_and_cells
+
+
+def _get_mesh():
+    points = np.array([[0., 0.], [1., 0.], [1., 1.], [0., 1.]])
+    cells = [meshio.CellBlock('triangle', np.array([[0, 1, 2], [0, 2, 3]])),
+             meshio.CellBlock('quad', np.array([[0, 1, 2, 3]]))]
+    return meshio.Mesh(points, cells)
+
+
+def test_info_single_part(tmp_path):
+    filename = str(tmp_path / 'mesh.geo')
+    GeoWriter().write(filename, _get_mesh(), part_description='fluid')
+
+    mesh_info = yamio.info(filename, compute_bbox=True)
+
+    assert mesh_info.n_points == 4
+    assert mesh_info.cells == [('triangle', 2), ('quad', 1)]
+    assert np.allclose(mesh_info.bounding_box, [[0., 0., 0.], [1., 1., 0.]])
+
+
+def test_info_multiple_parts(tmp_path):
+    filename = str(tmp_path / 'mesh.geo')
+    GeoWriter().write(filename, {'fluid': _get_mesh(), 'solid': _get_mesh()})
+
+    parts_info = yamio.info(filename)
+    parts = yamio.read(filename)
+
+    assert set(parts_info.keys()) == set(parts.keys())
+    for name, part_info in parts_info.items():
+        assert part_info.n_points == len(parts[name].points)
+        assert part_info.bounding_box is None
+
+
+def test_merge_parts(tmp_path):
+    mesh = get_structured_box(3, elem_type='hexahedron')
+
+    parts = {'fluid': meshio.Mesh(*get_local_points_and_cells(mesh.points, mesh.cells))}
+    for patch_name, patch_cells in mesh.bnd_patches.items():
+        parts[patch_name] = meshio.Mesh(*get_local_points_and_cells(mesh.points, [patch_cells]))
+
+    filename = str(tmp_path / 'mesh.geo')
+    GeoWriter().write(filename, parts)
+
+    merged_mesh = merge_meshes(yamio.read(filename), atol=1e-6)
+
+    assert len(merged_mesh.points) == len(mesh.points)
+    assert mesh.diff(merged_mesh, atol=1e-6).is_equal
+
+
+def test_merge_single_part(tmp_path):
+    mesh = get_structured_box(3, elem_type='triangle')
+
+    filename = str(tmp_path / 'mesh.geo')
+    yamio.write(filename, mesh, part_description='fluid')
+    part = yamio.read(filename)
+    assert isinstance(part, meshio.Mesh)
+
+    merged_mesh = merge_meshes(part, atol=1e-6)
+    assert len(merged_mesh.points) == len(mesh.points)
+    assert yamio.Mesh(mesh.points, mesh.cells).diff(merged_mesh, atol=1e-6).is_equal
+
+
+def test_diff_and_merge_2d(tmp_path):
+    box = get_structured_box(3, elem_type='quad')
+    mesh = yamio.Mesh(box.points, box.cells)  # patches are not written
+
+    # geo points are 3d
+    filename = str(tmp_path / 'mesh.geo')
+    yamio.write(filename, mesh, part_description='box')
+    read_mesh = yamio.read(filename)
+    assert read_mesh.points.shape[1] == 3
+    assert mesh.diff(read_mesh, atol=1e-6).is_equal
+
+    merged_mesh = merge_meshes([mesh, read_mesh], atol=1e-6)
+    assert merged_mesh.points.shape == read_mesh.points.shape
+
+
+def _write_fixed_width_geo(filename, mesh, ids='given'):
+    # as written by other tools (e12.5 floats, i10 integers)
+    points = np.c_[mesh.points, np.zeros(len(mesh.points))][:, :3]
+    lines = ['description', '', f'node id {ids}', f'element id {ids}', 'extents']
+    lines += [f'{points[:, i].min():12.5e}{points[:, i].max():12.5e}' for i in range(3)]
+    lines += ['part', f'{1:10d}', 'fluid', 'coordinates', f'{len(points):10d}']
+    lines += [f'{i + 1:10d}' for i in range(len(points))]
+    lines += [f'{x:12.5e}' for x in points.T.ravel()]
+    for cell_block in mesh.cells:
+        lines += ['tria3' if cell_block.type == 'triangle' else 'quad4',
+                  f'{len(cell_block.data):10d}']
+        lines += [f'{i + 1:10d}' for i in range(len(cell_block.data))]
+        lines += [''.join(f'{node:10d}' for node in conn) for conn in cell_block.data + 1]
+
+    with open(filename, 'w') as file:
+        file.write('\n'.join(lines) + '\n')
+
+
+def _write_binary_geo(filename, mesh, ids='given'):
+    points = np.c_[mesh.points, np.zeros(len(mesh.points))][:, :3]
+
+    def string(text):
+        return text.encode().ljust(80, b'\x00')
+
+    def ints(values):
+        return np.asarray(values, dtype=np.int32).tobytes()
+
+    data = [string('C Binary'), string('description'), string(''),
+            string(f'node id {ids}'), string(f'element id {ids}'), string('part'),
+            ints([1]), string('fluid'), string('coordinates'), ints([len(points)]),
+            ints(np.arange(1, len(points) + 1)), points.T.astype(np.float32).tobytes()]
+    for cell_block in mesh.cells:
+        data += [string('tria3' if cell_block.type == 'triangle' else 'quad4'),
+                 ints([len(cell_block.data)]), ints(np.arange(1, len(cell_block.data) + 1)),
+                 ints(cell_block.data + 1)]
+
+    with open(filename, 'wb') as file:
+        file.write(b''.join(data))
+
+
+def test_info_ids(tmp_path):
+    mesh = get_structured_box(3, elem_type='triangle', lengths=[1., 2.])
+    mesh.cells.append(meshio.CellBlock('quad', np.array([[0, 1, 5, 4]])))
+    expected_cells = [('triangle', len(mesh.cells[0].data)), ('quad', 1)]
+
+    filename = str(tmp_path / 'mesh.geo')
+    _write_fixed_width_geo(filename, mesh)
+    for compute_bbox in (False, True):
+        mesh_info = yamio.info(filename, compute_bbox=compute_bbox)
+        assert mesh_info.n_points == len(mesh.points)
+        assert mesh_info.cells == expected_cells
+        assert np.allclose(mesh_info.bounding_box, [[0., 0., 0.], [1., 2., 0.]])
+
+    filename = str(tmp_path / 'mesh_binary.geo')
+    _write_binary_geo(filename, mesh)
+    for compute_bbox in (False, True):
+        mesh_info = yamio.info(filename, compute_bbox=compute_bbox)
+        assert mesh_info.n_points == len(mesh.points)
+        assert mesh_info.cells == expected_cells
+    assert np.allclose(mesh_info.bounding_box, [[0., 0., 0.], [1., 2., 0.]])
@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+
+def test_import_is_lazy():
+    code = ("import sys, yamio; "
+            "heavy = ['h5py', 'pyhip', 'yamio.hip', 'yamio.dolfin', 'yamio.ensight.gold', "
+            "'asyncio', 'concurrent.futures', 'yamio.aio']; "
+            "print(','.join(name for name in heavy if name in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True,
+                            text=True, check=True).stdout.strip()
+
+    assert output == ''
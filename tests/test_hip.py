@@ -3,6 +3,3 @@
 # TODO: add test to verify if passed mesh is not modified
 
 # TODO: iter over an h5 file to ensure everything works?
-# TODO: make also validation of Mesh object
-
-# TODO: validate negative volume error
\ No newline at end of file
@@ -0,0 +1,405 @@
+import copy
+import pickle
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+import meshio
+
+import yamio
+from yamio.mesh_generators import get_structured_box
+from yamio.mesh_partitioning import write_partitions
+from yamio.mesh_search import transfer_fields
+from yamio.mesh_utils import (
+    get_boundary_faces,
+    is_row_in,
+)
+from yamio.mesh_sharing import attach_mesh
+
+
+def test_eq():
+    mesh = get_structured_box(3, elem_type='tetra')
+    other_mesh = copy.deepcopy(mesh)
+    assert mesh == other_mesh
+    assert hash(mesh) == hash(other_mesh)
+
+    # tolerance in points
+    other_mesh.points = other_mesh.points + 1e-12
+    assert mesh == other_mesh
+    assert mesh.fingerprint() != other_mesh.fingerprint()
+    assert mesh.fingerprint(decimals=6) == other_mesh.fingerprint(decimals=6)
+
+    other_mesh.points = other_mesh.points + 1.
+    assert mesh != other_mesh
+
+
+def test_fingerprint_reassigned_points():
+    mesh = get_structured_box(3, elem_type='tetra')
+
+    shifted_points = mesh.points + 1.
+    fingerprint = mesh.fingerprint()
+
+    # new array may reuse the id of the freed one
+    mesh.points = None
+    mesh.points = shifted_points.view()
+    assert mesh.fingerprint() != fingerprint
+
+
+def test_fingerprint_releases_replaced_arrays():
+    mesh = get_structured_box(3, elem_type='tetra')
+    mesh.fingerprint()
+    mesh._get_topology_fingerprint()
+
+    old_points = weakref.ref(mesh.points)
+    mesh.points = mesh.points + 1.
+    assert old_points() is not None  # referenced by the cache
+
+    mesh._get_topology_fingerprint()
+    assert old_points() is None
+
+
+def test_eq_topology():
+    mesh = get_structured_box(3, elem_type='quad')
+
+    other_mesh = copy.deepcopy(mesh)
+    other_mesh.cells = [meshio.CellBlock('quad', mesh.cells[0].data[::-1])]
+    assert mesh != other_mesh
+
+    other_mesh = copy.deepcopy(mesh)
+    other_mesh.bnd_patches['x_min'] = np.unique(mesh.bnd_patches['x_min'].data)
+    assert mesh != other_mesh
+
+
+def test_dedup():
+    meshes = [get_structured_box(n, elem_type='triangle') for n in (2, 3, 2, 3)]
+    assert len(set(meshes)) == 2
+
+
+def test_diff_renumbered():
+    mesh = get_structured_box(3, elem_type='hexahedron')
+
+    perm = np.random.default_rng(0).permutation(len(mesh.points))
+    inv_perm = np.argsort(perm)
+    other_mesh = yamio.Mesh(
+        mesh.points[perm],
+        [meshio.CellBlock('hexahedron', inv_perm[mesh.cells[0].data][::-1])],
+        bnd_patches={name: meshio.CellBlock(patch.type, inv_perm[patch.data])
+                     for name, patch in mesh.bnd_patches.items()})
+
+    assert mesh != other_mesh
+
+    mesh_diff = mesh.diff(other_mesh)
+    assert mesh_diff.is_equal
+    assert np.array_equal(mesh_diff.node_map, inv_perm)
+
+    other_mesh.points[0] += 1.
+    del other_mesh.bnd_patches['x_min']
+    mesh_diff = mesh.diff(other_mesh)
+    assert not mesh_diff.is_equal
+    assert len(mesh_diff.unmatched_points) == 1
+    assert mesh_diff.patches_only_in_mesh == ['x_min']
+
+
+def test_diff_orientation():
+    mesh = get_structured_box(3, elem_type='hexahedron')
+    conns = mesh.cells[0].data
+
+    # same cells starting at another node
+    rotated = conns[:, [1, 2, 3, 0, 5, 6, 7, 4]]
+    other_mesh = yamio.Mesh(mesh.points, [meshio.CellBlock('hexahedron', rotated)],
+                            bnd_patches=mesh.bnd_patches)
+    assert mesh.diff(other_mesh).is_equal
+
+    reversed_ = conns[:, [0, 3, 2, 1, 4, 7, 6, 5]]
+    other_mesh.cells[0] = meshio.CellBlock('hexahedron', reversed_)
+    mesh_diff = mesh.diff(other_mesh)
+    assert not mesh_diff.is_equal
+    assert mesh_diff.reoriented_cells == {'hexahedron': len(conns)}
+    assert mesh_diff.cells == {'hexahedron': (0, 0)}
+    assert not other_mesh.validate().is_valid
+
+
+def test_diff_empty_blocks():
+    mesh = get_structured_box(2, elem_type='quad')
+    mesh.cells.append(meshio.CellBlock('line', np.zeros((0, 2), dtype=int)))
+    mesh.bnd_patches['empty'] = meshio.CellBlock('line', np.zeros((0, 2), dtype=int))
+
+    mesh_diff = mesh.diff(copy.deepcopy(mesh))
+    assert mesh_diff.is_equal
+    assert mesh_diff.cells['line'] == (0, 0)
+
+
+def test_validate_and_repair():
+    mesh = get_structured_box(3, elem_type='tetra')
+    assert mesh.validate().is_valid
+
+    inverted = [0, 5, 9]
+    conns = mesh.cells[0].data
+    conns[inverted] = conns[inverted][:, [1, 0, 2, 3]]
+    mesh.bnd_patches['inner'] = np.array([21])  # (1, 1, 1) node
+
+    report = mesh.validate()
+    assert np.array_equal(report.inverted_cells[0], inverted)
+    assert np.array_equal(report.patch_faces_not_on_boundary['inner'], [0])
+
+    assert mesh.repair(report) == len(inverted)
+    assert 0 not in mesh.validate().inverted_cells
+
+
+def test_repair_higher_order():
+    mesh = get_structured_box(3, elem_type='tetra')
+    points, conns = mesh.points, mesh.cells[0].data
+
+    # mid nodes of tetra10 edges (meshio ordering)
+    edges = [[0, 1], [1, 2], [2, 0], [0, 3], [1, 3], [2, 3]]
+    mid_points = points[conns[:, edges]].mean(axis=2).reshape(-1, 3)
+    mid_nodes = len(points) + np.arange(len(mid_points)).reshape(-1, 6)
+    mesh = yamio.Mesh(np.r_[points, mid_points],
+                      [meshio.CellBlock('tetra10', np.c_[conns, mid_nodes])])
+    assert mesh.validate().is_valid
+
+    inverted = [0, 5, 9]
+    flip = [0, 2, 1, 3, 6, 5, 4, 7, 9, 8]
+    mesh.cells[0].data[inverted] = mesh.cells[0].data[inverted][:, flip]
+    assert not mesh.validate().is_valid
+
+    assert mesh.repair() == len(inverted)
+    assert mesh.validate().is_valid
+
+
+def test_validate_empty():
+    mesh = yamio.Mesh(np.zeros((0, 3)), [])
+    assert mesh.validate().is_valid
+
+
+def test_boundary_faces_chunks():
+    mesh = get_structured_box(4, elem_type='tetra')
+    n_bnd_faces = sum(len(patch.data) for patch in mesh.bnd_patches.values())
+
+    faces, block_indices, cell_indices = get_boundary_faces(
+        mesh.cells, return_owners=True)['triangle']
+    assert len(faces) == n_bnd_faces
+
+    for chunk_size in (1, 10, 100):
+        chunked_faces = get_boundary_faces(mesh.cells, return_owners=True,
+                                           chunk_size=chunk_size)['triangle']
+        for array, chunked_array in zip((faces, block_indices, cell_indices), chunked_faces):
+            assert np.array_equal(array, chunked_array)
+
+
+def test_geometry():
+    mesh = get_structured_box(3, elem_type='hexahedron', lengths=[1., 2., 3.])
+    # inward oriented patch
+    x_min = mesh.bnd_patches['x_min']
+    mesh.bnd_patches['x_min'] = meshio.CellBlock(x_min.type, x_min.data[:, ::-1])
+
+    geometry = mesh.get_geometry(chunk_size=5)
+    assert mesh.get_geometry(chunk_size=5) is geometry
+
+    volumes, centroids = geometry.cell_measures[0], geometry.cell_centroids[0]
+    assert np.isclose(volumes.sum(), 6.)
+    assert np.allclose(volumes @ centroids / volumes.sum(), [0.5, 1., 1.5])
+
+    assert np.isclose(geometry.patch_areas['x_min'].sum(), 6.)
+    assert np.allclose(geometry.patch_normals['x_min'], [-1., 0., 0.])
+    assert np.allclose(geometry.patch_normals['z_max'], [0., 0., 1.])
+    assert np.isclose(geometry.get_patch_flux('y_max', np.ones((9, 3))), 3.)
+
+
+def test_pickle_without_cache():
+    mesh = get_structured_box(3, elem_type='tetra')
+    fingerprint = mesh.fingerprint()
+    mesh.get_geometry().cell_measures
+
+    loaded_mesh = pickle.loads(pickle.dumps(mesh))
+    assert not loaded_mesh.__dict__.get('_fingerprints')
+    assert not loaded_mesh.__dict__.get('_derived')
+    assert loaded_mesh.fingerprint() == fingerprint
+
+
+def test_locate():
+    mesh = get_structured_box(4, elem_type='hexahedron')
+    spatial_index = mesh.get_spatial_index(chunk_size=7)
+    assert mesh.get_spatial_index(chunk_size=7) is spatial_index
+
+    points = np.random.default_rng(0).random((50, 3)) * 1.2 - 0.1
+    location = spatial_index.locate(points)
+
+    is_inside = np.all((points >= 0.) & (points <= 1.), axis=1)
+    assert np.array_equal(location.is_found, is_inside)
+    assert np.allclose(location.weights[is_inside].sum(axis=1), 1.)
+
+    # linear fields are interpolated exactly
+    values = location.interpolate(mesh.points @ [1., 2., 3.])
+    assert np.allclose(values[is_inside], points[is_inside] @ [1., 2., 3.])
+    assert np.isnan(values[~is_inside]).all()
+
+
+def test_find_nearest_nodes():
+    mesh = get_structured_box(4, elem_type='tetra')
+
+    # includes points far from all nodes (brute force)
+    points = np.random.default_rng(0).random((50, 3)) * 20. - 10.
+    nodes, distances = mesh.get_spatial_index().find_nearest_nodes(points)
+
+    all_distances = np.linalg.norm(points[:, None] - mesh.points[None], axis=2)
+    assert np.allclose(distances, all_distances.min(axis=1))
+    assert np.allclose(np.linalg.norm(points - mesh.points[nodes], axis=1), distances)
+
+
+def test_transfer_fields():
+    mesh = get_structured_box(6, elem_type='quad')
+    mesh.point_data['f'] = mesh.points @ [1., -2.]
+    mesh.cell_data['c'] = [np.arange(len(mesh.cells[0].data), dtype=float)]
+
+    target_mesh = get_structured_box(5, elem_type='triangle', lengths=[1.2, 1.])
+    point_data, cell_data = transfer_fields(mesh, target_mesh)
+
+    is_inside = target_mesh.points[:, 0] <= 1.
+    assert np.allclose(point_data['f'][is_inside],
+                       target_mesh.points[is_inside] @ [1., -2.])
+    assert not np.isnan(point_data['f']).any()
+    assert not np.isnan(cell_data['c'][0]).any()
+
+    point_data, _ = transfer_fields(mesh, target_mesh, extrapolate=False)
+    assert np.isnan(point_data['f'][~is_inside]).all()
+
+
+def test_renumber():
+    mesh = get_structured_box(4, elem_type='tetra')
+
+    perm = np.random.default_rng(0).permutation(len(mesh.points))
+    inv_perm = np.argsort(perm)
+    shuffled_mesh = yamio.Mesh(
+        mesh.points[perm], [meshio.CellBlock('tetra', inv_perm[mesh.cells[0].data])],
+        bnd_patches={name: meshio.CellBlock(patch.type, inv_perm[patch.data])
+                     for name, patch in mesh.bnd_patches.items()},
+        point_data={'x': mesh.points[perm, 0]},
+        cell_data={'c': [np.arange(len(mesh.cells[0].data))]})
+
+    for method in ('rcm', 'morton', 'hilbert'):
+        renumbered_mesh = copy.deepcopy(shuffled_mesh)
+        cell_data = renumbered_mesh.cell_data['c'][0].copy()
+
+        report = renumbered_mesh.renumber(method)
+
+        assert renumbered_mesh.diff(mesh).is_equal
+        assert np.allclose(renumbered_mesh.point_data['x'], renumbered_mesh.points[:, 0])
+        assert np.array_equal(renumbered_mesh.cell_data['c'][0],
+                              cell_data[report.cell_orders[0]])
+        assert renumbered_mesh.validate().is_valid
+
+    assert report.bandwidth_before > shuffled_mesh.renumber('rcm').bandwidth_after
+
+
+def test_renumber_sets():
+    mesh = get_structured_box(3, elem_type='triangle')
+    conns = mesh.cells[0].data.copy()
+    point_indices, cell_indices = np.array([0, 5, 7]), np.array([1, 4])
+    mesh.point_sets['p'] = point_indices
+    mesh.cell_sets['c'] = [cell_indices]
+
+    report = mesh.renumber('rcm')
+
+    assert np.array_equal(np.sort(report.node_order[mesh.point_sets['p']]), point_indices)
+    assert np.array_equal(np.sort(report.cell_orders[0][mesh.cell_sets['c'][0]]), cell_indices)
+    set_conns = report.node_order[mesh.cells[0].data[mesh.cell_sets['c'][0]]]
+    assert is_row_in(set_conns, conns[cell_indices]).all()
+
+    # e.g. values of DolfinSolReader
+    mesh.point_sets['u'] = mesh.points[:, 0]
+    with pytest.raises(Exception):
+        mesh.renumber('rcm')
+
+
+def test_partition(tmp_path):
+    mesh = get_structured_box(4, elem_type='hexahedron')
+    mesh.point_data['x'] = mesh.points[:, 0]
+    mesh.cell_data['c'] = [np.arange(len(mesh.cells[0].data))]
+
+    for method, n_parts in (('rcb', 3), ('graph', 4)):
+        partitions = mesh.partition(n_parts, method=method)
+        assert len(partitions) == n_parts
+
+        cell_counts = np.zeros(len(mesh.cells[0].data), dtype=int)
+        patch_sizes = {name: 0 for name in mesh.bnd_patches}
+        for partition in partitions:
+            local_mesh = partition.mesh
+            cell_counts[partition.cells[0]] += 1
+
+            assert np.allclose(local_mesh.points, mesh.points[partition.nodes])
+            assert np.array_equal(partition.nodes[local_mesh.cells[0].data],
+                                  mesh.cells[0].data[partition.cells[0]])
+            assert np.allclose(local_mesh.point_data['x'], local_mesh.points[:, 0])
+            assert np.array_equal(local_mesh.cell_data['c'][0], partition.cells[0])
+
+            for name, patch in local_mesh.bnd_patches.items():
+                patch_sizes[name] += len(patch.data)
+            assert local_mesh.validate().is_valid
+
+            for other, nodes in partition.interfaces.items():
+                other_partition = partitions[other]
+                assert np.isin(partition.nodes[nodes], other_partition.nodes).all()
+            assert np.all(partition.node_owners[partition.ghost_nodes] < partition.index)
+
+        assert np.all(cell_counts == 1)
+        assert patch_sizes == {name: len(patch.data) for name, patch in mesh.bnd_patches.items()}
+
+    filenames = write_partitions(partitions, str(tmp_path / 'mesh_{}.vtu'), max_workers=2)
+    for filename, partition in zip(filenames, partitions):
+        assert len(yamio.read(filename).points) == len(partition.nodes)
+
+
+def test_partition_internal_patch():
+    mesh = get_structured_box(4, elem_type='hexahedron')
+
+    # x = 0.5 plane
+    node_ids = np.arange(5**3).reshape((5, 5, 5), order='F')[2]
+    faces = np.stack([node_ids[:-1, :-1], node_ids[1:, :-1], node_ids[1:, 1:],
+                      node_ids[:-1, 1:]], axis=-1).reshape(-1, 4)
+    mesh.bnd_patches['inner'] = meshio.CellBlock('quad', faces)
+
+    partitions = mesh.partition(4)
+    n_faces = 0
+    for partition in partitions:
+        local_faces = partition.mesh.bnd_patches['inner'].data
+        assert np.all(local_faces >= 0)
+        assert is_row_in(partition.nodes[local_faces], faces).all()
+        n_faces += len(local_faces)
+
+    assert n_faces == len(faces)
+
+
+def _get_shared_mesh_summary(descriptor):
+    with attach_mesh(descriptor) as attached_mesh:
+        return _get_mesh_summary(attached_mesh.mesh)
+
+
+def _get_mesh_summary(mesh):
+    return (mesh.fingerprint(), mesh.points.flags.writeable,
+            mesh.get_geometry().cell_measures[0].sum())
+
+
+def test_shared_memory():
+    mesh = get_structured_box(3, elem_type='tetra')
+    mesh.point_data['x'] = mesh.points[:, 0]
+    mesh.cell_data['c'] = [np.arange(len(mesh.cells[0].data))]
+
+    with mesh.to_shared_memory() as shared_mesh:
+        with attach_mesh(shared_mesh.descriptor) as attached_mesh:
+            assert attached_mesh.mesh == mesh
+            assert attached_mesh.mesh.bnd_patches.keys() == mesh.bnd_patches.keys()
+            assert np.array_equal(attached_mesh.mesh.point_data['x'], mesh.point_data['x'])
+            assert np.array_equal(attached_mesh.mesh.cell_data['c'][0], mesh.cell_data['c'][0])
+        assert attached_mesh.mesh is None
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            summaries = list(executor.map(_get_shared_mesh_summary,
+                                          [shared_mesh.descriptor] * 2))
+
+    for fingerprint, is_writeable, volume in summaries:
+        assert fingerprint == mesh.fingerprint()
+        assert not is_writeable
+        assert np.isclose(volume, 1.)
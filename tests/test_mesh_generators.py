@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+
+from yamio.mesh_generators import (
+    DIM_BY_TYPE,
+    get_structured_box,
+)
+
+
+@pytest.mark.parametrize('elem_type', DIM_BY_TYPE.keys())
+def test_structured_box(elem_type):
+    dim = DIM_BY_TYPE[elem_type]
+    mesh = get_structured_box(3, elem_type=elem_type)
+
+    assert mesh.points.shape == (4 ** dim, dim)
+    assert len(mesh.bnd_patches) == 2 * dim
+
+    # all nodes are used
+    assert np.array_equal(np.unique(mesh.cells[0].data), np.arange(4 ** dim))
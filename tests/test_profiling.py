@@ -0,0 +1,72 @@
+import json
+import os
+import threading
+import time
+
+import yamio
+from yamio.mesh_generators import get_structured_box
+from yamio.profiling import (
+    Profiler,
+    stage,
+)
+
+
+def test_stage_without_profiler():
+    with stage('noop') as stage_:
+        stage_.add(bytes_read=10)
+
+
+def test_profiler_geo(tmp_path):
+    filename = str(tmp_path / 'mesh.geo')
+    mesh = get_structured_box(4, elem_type='quad')
+
+    received = []
+    with Profiler(trace_memory=True, callbacks=[received.append]) as profiler:
+        yamio.write(filename, mesh, part_description='box')
+        yamio.read(filename)
+
+    summary = profiler.summary()
+    assert summary['geo.write_file']['bytes_written'] > 0
+    assert summary['geo.read_file']['bytes_read'] == summary['geo.write_file']['bytes_written']
+    assert summary['yamio.read']['peak_memory'] >= summary['geo.parse_coords']['peak_memory']
+    assert len(received) == len(profiler.events)
+
+    trace = json.loads(profiler.to_chrome_trace())
+    assert len(trace['traceEvents']) == len(profiler.events)
+
+
+def test_profiler_threads():
+    barrier = threading.Barrier(2)
+
+    def work(index):
+        with stage(f'outer.{index}'):
+            barrier.wait()
+            with stage(f'inner.{index}'):
+                time.sleep(0.01)
+
+    with Profiler() as profiler:
+        threads = [threading.Thread(target=work, args=(index,)) for index in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    depths = {event.name: event.depth for event in profiler.events}
+    assert depths == {'outer.0': 0, 'outer.1': 0, 'inner.0': 1, 'inner.1': 1}
+
+    trace = json.loads(profiler.to_chrome_trace())
+    assert len({event['tid'] for event in trace['traceEvents']}) == 2
+
+
+def test_profiler_bytes(tmp_path):
+    # non-ascii characters take several bytes
+    filename = str(tmp_path / 'mesh.geo')
+    mesh = get_structured_box(2, elem_type='quad')
+
+    with Profiler() as profiler:
+        yamio.write(filename, mesh, part_description='flüid')
+        yamio.read(filename)
+
+    summary = profiler.summary()
+    assert summary['geo.write_file']['bytes_written'] == os.path.getsize(filename)
+    assert summary['geo.read_file']['bytes_read'] == os.path.getsize(filename)
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+import meshio
+
+from yamio.mesh_generators import get_structured_box
+
+matplotlib = pytest.importorskip('matplotlib')
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from yamio.vis.matplotlib import (  # noqa: E402
+    animate_time_series,
+    get_mesh_triangulation,
+    get_triangles,
+)
+
+
+def _get_mixed_mesh():
+    # unit square: quad on the left, two triangles on the right
+    points = np.array([[0., 0.], [.5, 0.], [1., 0.], [0., 1.], [.5, 1.], [1., 1.]])
+    cells = [meshio.CellBlock('line', np.array([[0, 1]])),
+             meshio.CellBlock('quad', np.array([[0, 1, 4, 3]])),
+             meshio.CellBlock('triangle', np.array([[1, 2, 5], [1, 5, 4]]))]
+
+    return meshio.Mesh(points, cells)
+
+
+def _get_areas(points, triangles):
+    edges_1 = points[triangles[:, 1]] - points[triangles[:, 0]]
+    edges_2 = points[triangles[:, 2]] - points[triangles[:, 0]]
+
+    return 0.5 * (edges_1[:, 0] * edges_2[:, 1] - edges_1[:, 1] * edges_2[:, 0])
+
+
+def test_get_triangles():
+    mesh = get_structured_box(2, elem_type='quad')
+    triangles, block_indices, cell_indices = get_triangles(mesh.cells)
+    assert len(triangles) == 2 * len(mesh.cells[0].data)
+    assert np.all(np.bincount(cell_indices) == 2)
+    assert np.allclose(_get_areas(mesh.points, triangles).sum(), 1.)
+
+    mesh = _get_mixed_mesh()
+    triangles, block_indices, cell_indices = get_triangles(mesh.cells)
+    assert np.array_equal(block_indices, [1, 1, 2, 2])
+    assert np.array_equal(cell_indices, [0, 0, 0, 1])
+    assert np.all(_get_areas(mesh.points, triangles) > 0)
+
+    with pytest.raises(ValueError):
+        get_triangles(mesh.cells[:1])
+
+
+def test_get_triangles_higher_order():
+    points = np.array([[0., 0.], [1., 0.], [1., 1.], [0., 1.],
+                       [.5, 0.], [1., .5], [.5, 1.], [0., .5]])
+    cells = [meshio.CellBlock('quad8', np.arange(8)[None])]
+
+    triangles, _, _ = get_triangles(cells)
+    assert triangles.max() < 4
+    assert np.allclose(_get_areas(points, triangles).sum(), 1.)
+
+
+def test_get_triangle_values():
+    mesh = _get_mixed_mesh()
+    mesh_triangulation = get_mesh_triangulation(mesh)
+
+    cell_values = [np.array([10.]), np.array([20.]), np.array([30., 40.])]
+    expected = [20., 20., 30., 40.]
+    assert np.array_equal(mesh_triangulation.get_triangle_values(cell_values), expected)
+    assert np.array_equal(
+        mesh_triangulation.get_triangle_values(np.concatenate(cell_values)), expected)
+
+    trifinder = mesh_triangulation.trifinder
+    assert mesh_triangulation.block_indices[trifinder(.75, .1)] == 2
+
+
+def test_triangulation_cache():
+    mesh = get_structured_box(2, elem_type='triangle')
+    mesh_triangulation = get_mesh_triangulation(mesh)
+    assert get_mesh_triangulation(mesh) is mesh_triangulation
+
+    mesh.points = mesh.points * 2.
+    new_triangulation = get_mesh_triangulation(mesh)
+    assert new_triangulation is not mesh_triangulation
+    assert np.allclose(new_triangulation.triangulation.x.max(), 2.)
+
+    mesh.cells = [meshio.CellBlock('triangle', mesh.cells[0].data[:2])]
+    assert len(get_mesh_triangulation(mesh).triangulation.triangles) == 2
+
+
+def test_animate_shared_mesh():
+    # as read by DolfinSolReader (mesh shared by all frames)
+    mesh = get_structured_box(2, elem_type='quad')
+    x = mesh.points[:, 0]
+    mesh = meshio.Mesh(mesh.points, mesh.cells, point_sets={'u': [x, 2 * x, 3 * x]},
+                       info={'time': np.array([0., .1, .2])})
+
+    _, ax = plt.subplots()
+    animation = animate_time_series(mesh, 'u', ax=ax)
+    animation.to_jshtml()
+
+    collection, = ax.collections
+    assert collection.get_clim() == (0., 3.)
+    assert np.allclose(collection.get_array(), 3 * x)
+    assert ax.get_title() == 't = 0.2'
+    plt.close(ax.figure)
+
+
+def test_animate_meshes():
+    # as read by DolfinSolReader (one mesh per frame)
+    meshes = []
+    for frame, n in enumerate((2, 3)):
+        mesh = get_structured_box(n, elem_type='triangle')
+        values = np.full(len(mesh.cells[0].data), float(frame))
+        meshes.append(meshio.Mesh(mesh.points, mesh.cells, cell_sets={'c': values},
+                                  info={'time': float(frame)}))
+
+    _, ax = plt.subplots()
+    animation = animate_time_series(meshes, 'c', ax=ax)
+    animation.to_jshtml()
+
+    collection, = ax.collections
+    assert len(collection.get_array()) == len(meshes[-1].cells[0].data)
+    assert np.all(collection.get_array() == 1.)
+    plt.close(ax.figure)